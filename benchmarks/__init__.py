@@ -0,0 +1,7 @@
+"""
+Benchmarks Package
+Load generation and performance measurements for the quiz data layer
+
+Every benchmark runs against a scratch data directory (config.DATA_DIR /
+QUIZ_DATA_DIR), so the application's own data files are never touched.
+"""
@@ -0,0 +1,338 @@
+"""
+Data Layer Benchmarks
+Times every public data_manager and achievements function against synthetic
+data sets of increasing size
+
+For each scale a scratch data directory is filled with generated
+quiz_history.csv, users.csv, achievements.csv and user_settings.csv files
+(about 50 attempts per user), the materialized aggregates are rebuilt, and
+each function is timed once cold (caches dropped) and then warm. Results are
+printed as a table and can be written as JSON to compare scales, storage
+backends or commits.
+
+Usage:
+    python -m benchmarks.data_layer --scales 1k,100k,1M --json results/data_layer.json
+    python -m benchmarks.data_layer --scales 10M --backend sqlite
+"""
+
+import os
+import sys
+import shutil
+import argparse
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import config
+from benchmarks.harness import (use_data_dir, reset_caches, time_call, environment_info, write_json, format_ms,
+                                check_scratch_dir, clear_generated_files)
+
+
+SCALES = {'1k': 1_000, '10k': 10_000, '100k': 100_000, '1M': 1_000_000, '10M': 10_000_000}
+DEFAULT_SCALES = '1k,100k,1M'
+
+# Average attempts per user in generated data
+ATTEMPTS_PER_USER = 50
+
+# Rows generated and written per chunk, bounding memory at the 10M scale
+CHUNK_ROWS = 1_000_000
+
+CATEGORIES = ['Python', 'DSA', 'Computer Networks']
+DIFFICULTIES = ['Easy', 'Medium', 'Hard']
+MODES = ['Practice', 'Timed', 'Survival']
+HISTORY_DAYS = 365
+
+
+def parse_scales(text):
+    """
+    Parse a comma-separated scale list such as '1k,100k' or '250000'
+    
+    Returns:
+        List of (label, row count) tuples
+    """
+    scales = []
+    for label in text.split(','):
+        label = label.strip()
+        if label in SCALES:
+            scales.append((label, SCALES[label]))
+        else:
+            scales.append((label, int(label)))
+    return scales
+
+
+def username_for(number):
+    return f"user_{number:07d}"
+
+
+def generate_history_chunk(rng, start_id, rows, users, first_day):
+    """
+    Generate quiz history rows in the quiz_history.csv layout
+    
+    Args:
+        rng: numpy Generator
+        start_id: Attempt id of the first row
+        rows: Number of rows
+        users: Number of distinct users to spread the rows over
+        first_day: numpy datetime64 day the history starts on
+    
+    Returns:
+        DataFrame with HISTORY_COLUMNS
+    """
+    from utils import score_calculator
+    
+    ids = np.arange(start_id, start_id + rows)
+    difficulty = rng.integers(0, len(DIFFICULTIES), rows)
+    mode = rng.integers(0, len(MODES), rows)
+    total = rng.choice([5, 10, 15, 20], rows)
+    correct = rng.binomial(total, rng.uniform(0.3, 1.0, rows))
+    wrong = total - correct
+    
+    # Survival runs end at three wrong answers
+    survival = mode == MODES.index('Survival')
+    wrong = np.where(survival, np.minimum(wrong, 3), wrong)
+    
+    points = np.array([score_calculator.DIFFICULTY_POINTS[d] for d in DIFFICULTIES])[difficulty]
+    score = correct * points
+    
+    # Dates advance with the attempt id, like a real append-only log
+    day_offsets = ids * HISTORY_DAYS // max(1, ids[-1] + 1)
+    seconds = rng.integers(0, 24 * 3600, rows)
+    
+    return pd.DataFrame({
+        'user_id': ids,
+        'username': [username_for(u) for u in rng.integers(0, users, rows)],
+        'date': (first_day + day_offsets).astype(str),
+        'time': [f"{s // 3600:02d}:{s // 60 % 60:02d}:{s % 60:02d}" for s in seconds],
+        'category': np.array(CATEGORIES)[rng.integers(0, len(CATEGORIES), rows)],
+        'difficulty': np.array(DIFFICULTIES)[difficulty],
+        'total_questions': total,
+        'correct': correct,
+        'wrong': wrong,
+        'score': score,
+        'percentage': np.round(correct / total * 100, 2),
+        'time_taken': rng.integers(10, 600, rows),
+        'mode': np.array(MODES)[mode]
+    })
+
+
+def generate_dataset(data_dir, rows, seed=0):
+    """
+    Fill data_dir with synthetic CSV data files
+    Data from an earlier run in the same directory is removed first
+    
+    Args:
+        data_dir: Scratch directory to write to (created if missing)
+        rows: Number of quiz history rows
+        seed: Random seed
+    
+    Returns:
+        Dictionary with row counts per file and the number of users
+    """
+    from utils import achievements, data_manager, file_handler
+    
+    os.makedirs(data_dir, exist_ok=True)
+    clear_generated_files(data_dir)
+    rng = np.random.default_rng(seed)
+    users = max(10, rows // ATTEMPTS_PER_USER)
+    first_day = np.datetime64('today') - HISTORY_DAYS
+    
+    history_path = os.path.join(data_dir, 'quiz_history.csv')
+    for start in range(0, rows, CHUNK_ROWS):
+        chunk = generate_history_chunk(rng, start + 1, min(CHUNK_ROWS, rows - start), users, first_day)
+        chunk.to_csv(history_path, mode='w' if start == 0 else 'a', header=start == 0, index=False)
+    file_handler.write_counter(os.path.join(data_dir, 'quiz_history.seq'), rows)
+    
+    usernames = [username_for(u) for u in range(users)]
+    pd.DataFrame({
+        'username': usernames,
+        'password': 'password',
+        'created_date': str(first_day)
+    }).to_csv(os.path.join(data_dir, 'users.csv'), index=False)
+    
+    # A few unlocked achievements per user
+    achievement_ids = np.array(list(achievements.ACHIEVEMENTS))
+    per_user = rng.integers(0, 5, users)
+    owners = np.repeat(np.arange(users), per_user)
+    pd.DataFrame({
+        'username': [usernames[u] for u in owners],
+        'achievement_id': achievement_ids[rng.integers(0, len(achievement_ids), len(owners))],
+        'unlocked_date': str(first_day),
+        'unlocked_time': '12:00:00'
+    }).drop_duplicates(['username', 'achievement_id']).to_csv(
+        os.path.join(data_dir, 'achievements.csv'), index=False)
+    
+    pd.DataFrame({
+        'username': usernames,
+        'streak_count': rng.integers(0, 40, users),
+        'last_played_date': str(np.datetime64('today') - 1),
+        'daily_challenge_date': '',
+        'theme': 'light',
+        'sound_enabled': True
+    }).to_csv(os.path.join(data_dir, 'user_settings.csv'), index=False)
+    
+    return {'history_rows': rows, 'users': users, 'achievement_rows': int(len(owners))}
+
+
+def build_aggregates(backend):
+    """
+    Prepare derived data the way an upgraded installation would have it
+    
+    Returns:
+        Seconds taken per step
+    """
+    from utils import user_stats, leaderboard
+    
+    timings = {}
+    if backend == 'sqlite':
+        from utils import sqlite_store
+        start = time.perf_counter()
+        sqlite_store.migrate_from_csv()
+        timings['sqlite_migrate_s'] = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    user_stats.rebuild_user_stats()
+    timings['rebuild_user_stats_s'] = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    leaderboard.rebuild_leaderboard()
+    timings['rebuild_leaderboard_s'] = time.perf_counter() - start
+    return timings
+
+
+def get_cases(username, scratch_dir):
+    """
+    Benchmark cases as (name, function of call number, mutates data)
+    
+    Read-only cases come first; cases that write run afterwards so they do
+    not change the data the readers see.
+    """
+    from utils import data_manager, achievements
+    
+    today = pd.Timestamp.today()
+    start_date = (today - pd.Timedelta(days=90)).strftime('%Y-%m-%d')
+    end_date = today.strftime('%Y-%m-%d')
+    export_path = os.path.join(scratch_dir, 'export.csv')
+    history_holder = {}
+    
+    def save_history(call):
+        # Rewrites the whole file with the data it already holds
+        if 'df' not in history_holder:
+            history_holder['df'] = data_manager.load_quiz_history().copy()
+        data_manager.save_quiz_history(history_holder['df'])
+    
+    return [
+        ('data_manager.load_quiz_history', lambda call: data_manager.load_quiz_history(), False),
+        ('data_manager.get_last_attempt_id', lambda call: data_manager.get_last_attempt_id(), False),
+        ('data_manager.get_user_history', lambda call: data_manager.get_user_history(username), False),
+        ('data_manager.get_category_statistics', lambda call: data_manager.get_category_statistics(username), False),
+        ('data_manager.get_category_statistics(all)', lambda call: data_manager.get_category_statistics(), False),
+        ('data_manager.get_difficulty_statistics', lambda call: data_manager.get_difficulty_statistics(username), False),
+        ('data_manager.get_top_scores', lambda call: data_manager.get_top_scores(10), False),
+        ('data_manager.get_user_stats_summary', lambda call: data_manager.get_user_stats_summary(username), False),
+        ('data_manager.get_time_series_data', lambda call: data_manager.get_time_series_data(username), False),
+        ('data_manager.filter_by_date_range',
+         lambda call: data_manager.filter_by_date_range(username, start_date, end_date), False),
+        ('data_manager.get_recent_attempts', lambda call: data_manager.get_recent_attempts(username, 5), False),
+        ('data_manager.get_performance_by_mode', lambda call: data_manager.get_performance_by_mode(username), False),
+        ('data_manager.export_user_history',
+         lambda call: data_manager.export_user_history(username, export_path), False),
+        ('data_manager.load_users', lambda call: data_manager.load_users(), False),
+        ('data_manager.validate_user', lambda call: data_manager.validate_user(username, 'password'), False),
+        ('achievements.load_user_achievements', lambda call: achievements.load_user_achievements(username), False),
+        ('achievements.get_user_achievements_display',
+         lambda call: achievements.get_user_achievements_display(username), False),
+        ('achievements.get_user_settings', lambda call: achievements.get_user_settings(username), False),
+        ('achievements.can_play_daily_challenge', lambda call: achievements.can_play_daily_challenge(username), False),
+        ('achievements.check_and_unlock_achievements',
+         lambda call: achievements.check_and_unlock_achievements(username), True),
+        ('achievements.update_streak', lambda call: achievements.update_streak(username), True),
+        ('achievements.update_user_settings',
+         lambda call: achievements.update_user_settings(username, theme='light'), True),
+        ('achievements.complete_daily_challenge', lambda call: achievements.complete_daily_challenge(username), True),
+        ('achievements.unlock_achievement',
+         lambda call: achievements.unlock_achievement(username, 'first_quiz'), True),
+        ('data_manager.add_user', lambda call: data_manager.add_user(f"bench_user_{call}", 'password'), True),
+        ('data_manager.add_quiz_attempt',
+         lambda call: data_manager.add_quiz_attempt(username, 'Python', 'Easy', 10, 7, 3, 70, 70.0, 120, 'Practice'),
+         True),
+        ('data_manager.save_quiz_history', save_history, True)
+    ]
+
+
+def run_scale(label, rows, backend, base_dir, repeats, time_budget, seed=0, only=None):
+    """
+    Generate one data set and time every case against it
+    
+    Returns:
+        Result dictionary for this scale
+    """
+    data_dir = os.path.join(base_dir, label)
+    use_data_dir(data_dir, backend)
+    
+    start = time.perf_counter()
+    dataset = generate_dataset(data_dir, rows, seed)
+    generate_s = time.perf_counter() - start
+    setup = build_aggregates(backend)
+    
+    # A user with a typical number of attempts
+    username = username_for(0)
+    results = {}
+    for name, func, mutates in get_cases(username, base_dir):
+        if only and not any(part in name for part in only):
+            continue
+        results[name] = time_call(func, repeats=repeats, time_budget=time_budget)
+        results[name]['mutates'] = mutates
+        print(f"  {name:<48} cold {format_ms(results[name].get('cold_ms')):>9}  "
+              f"warm p50 {format_ms(results[name].get('warm', {}).get('p50_ms')):>9}"
+              f"{'  ' + results[name]['error'] if 'error' in results[name] else ''}")
+    
+    sizes = {name: os.path.getsize(os.path.join(data_dir, name))
+             for name in sorted(os.listdir(data_dir)) if os.path.isfile(os.path.join(data_dir, name))}
+    reset_caches()
+    return {'rows': rows, 'dataset': dataset, 'generate_s': generate_s, 'setup': setup,
+            'file_sizes': sizes, 'functions': results}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark data_manager and achievements at several data sizes")
+    parser.add_argument('--scales', default=DEFAULT_SCALES,
+                        help=f"comma-separated scales ({', '.join(SCALES)} or a row count)")
+    parser.add_argument('--backend', choices=['csv', 'sqlite'], default=config.STORAGE_BACKEND)
+    parser.add_argument('--repeats', type=int, default=5, help="warm calls per function")
+    parser.add_argument('--time-budget', type=float, default=2.0, help="seconds of warm calls per function")
+    parser.add_argument('--only', help="comma-separated substrings selecting functions to time")
+    parser.add_argument('--data-dir', help="directory for generated data (default: temp dir, removed afterwards)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help="write results to this JSON file")
+    args = parser.parse_args(argv)
+    
+    if args.data_dir:
+        try:
+            check_scratch_dir(args.data_dir)
+        except ValueError as e:
+            parser.error(str(e))
+    
+    base_dir = args.data_dir or tempfile.mkdtemp(prefix='quiz_bench_')
+    only = args.only.split(',') if args.only else None
+    report = {'benchmark': 'data_layer', 'environment': environment_info(), 'backend': args.backend, 'scales': {}}
+    report['environment']['storage_backend'] = args.backend
+    
+    try:
+        for label, rows in parse_scales(args.scales):
+            print(f"[{label}] {rows} history rows, backend {args.backend}")
+            report['scales'][label] = run_scale(label, rows, args.backend, base_dir,
+                                                args.repeats, args.time_budget, args.seed, only)
+    finally:
+        if args.data_dir is None:
+            shutil.rmtree(base_dir, ignore_errors=True)
+    
+    if args.json:
+        write_json(args.json, report)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
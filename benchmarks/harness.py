@@ -0,0 +1,215 @@
+"""
+Benchmark Harness
+Shared helpers for the benchmark scripts: pointing the data layer at a
+scratch directory, timing calls, summarizing latencies and writing results
+"""
+
+import os
+import sys
+import json
+import shutil
+import time
+import platform
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import config
+
+
+# The data directories the app itself reads: the bundled one and the one
+# configured when the benchmarks started (before use_data_dir redirects it)
+APP_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+LIVE_DATA_DIRS = {os.path.realpath(APP_DATA_DIR), os.path.realpath(config.get_data_dir())}
+
+# Files and directories the benchmarks generate or the data layer derives from them
+GENERATED_FILES = [
+    'quiz_history.csv', 'quiz_history.seq', 'users.csv', 'achievements.csv',
+    'user_settings.csv', 'leaderboard.json', config.SQLITE_FILENAME,
+    config.SQLITE_FILENAME + '-wal', config.SQLITE_FILENAME + '-shm', config.SQLITE_FILENAME + '-journal'
+]
+GENERATED_DIRS = ['user_stats', 'chart_cache']
+
+
+def check_scratch_dir(data_dir):
+    """
+    Refuse a data directory that is (or is inside) the app's live data directory
+    
+    Args:
+        data_dir: Directory a benchmark is about to write to
+    
+    Raises:
+        ValueError: If data_dir would overwrite the app's own data
+    """
+    path = os.path.realpath(data_dir)
+    for live_dir in LIVE_DATA_DIRS:
+        if path == live_dir or path.startswith(live_dir + os.sep):
+            raise ValueError(f"{data_dir} is (or is inside) the app's data directory; "
+                             f"benchmarks need a scratch directory they can overwrite")
+
+
+def clear_generated_files(data_dir):
+    """
+    Remove the data a previous benchmark run left in a scratch directory
+    Other files (such as the question bank) are kept
+    
+    Args:
+        data_dir: Scratch data directory
+    """
+    check_scratch_dir(data_dir)
+    for name in GENERATED_FILES:
+        path = os.path.join(data_dir, name)
+        if os.path.isfile(path):
+            os.remove(path)
+    for name in GENERATED_DIRS:
+        shutil.rmtree(os.path.join(data_dir, name), ignore_errors=True)
+
+
+def use_data_dir(data_dir, backend=None):
+    """
+    Point every get_*_path() helper (this process and its children) at data_dir
+    
+    Args:
+        data_dir: Data directory to use
+        backend: Storage backend ('csv' or 'sqlite'), None keeps the current one
+    """
+    data_dir = os.path.abspath(data_dir)
+    os.environ['QUIZ_DATA_DIR'] = data_dir
+    config.DATA_DIR = data_dir
+    if backend:
+        os.environ['QUIZ_STORAGE_BACKEND'] = backend
+        config.STORAGE_BACKEND = backend
+    reset_caches()
+
+
+def reset_caches():
+    """Drop the in-process caches so the next call reads from disk (a cold call)"""
+    if 'utils.data_manager' in sys.modules:
+        sys.modules['utils.data_manager'].get_history_repository().invalidate()
+    for name in ('utils.user_stats', 'utils.leaderboard'):
+        module = sys.modules.get(name)
+        if module is not None:
+            module._cache.invalidate()
+    if 'utils.user_stats' in sys.modules:
+        sys.modules['utils.user_stats']._record_cache.invalidate()
+    if 'utils.question_manager' in sys.modules:
+        sys.modules['utils.question_manager'].get_question_bank().invalidate()
+
+
+def percentile(sorted_values, pct):
+    """
+    Percentile of an already sorted list (linear interpolation)
+    
+    Args:
+        sorted_values: Ascending list of numbers
+        pct: Percentile between 0 and 100
+    
+    Returns:
+        Interpolated value, or 0.0 for an empty list
+    """
+    if not sorted_values:
+        return 0.0
+    rank = (len(sorted_values) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+def summarize_latencies(samples):
+    """
+    Summarize latency samples
+    
+    Args:
+        samples: List of latencies in milliseconds
+    
+    Returns:
+        Dictionary with count, mean, p50, p90, p99 and max (ms)
+    """
+    ordered = sorted(samples)
+    return {
+        'count': len(ordered),
+        'mean_ms': sum(ordered) / len(ordered) if ordered else 0.0,
+        'p50_ms': percentile(ordered, 50),
+        'p90_ms': percentile(ordered, 90),
+        'p99_ms': percentile(ordered, 99),
+        'max_ms': ordered[-1] if ordered else 0.0
+    }
+
+
+def time_call(func, repeats=5, time_budget=2.0, cold=True):
+    """
+    Time a function: one cold call after dropping caches, then warm repeats
+    
+    Warm repeats stop early once time_budget seconds have been spent, so slow
+    calls on large datasets are measured fewer times instead of stalling the run.
+    
+    Args:
+        func: Function taking the call number (0 for the cold call) as its only argument
+        repeats: Maximum number of warm calls
+        time_budget: Seconds after which no further warm calls are made
+        cold: Drop caches before the first call
+    
+    Returns:
+        Dictionary with cold_ms, warm latency summary and any error message
+    """
+    if cold:
+        reset_caches()
+    
+    try:
+        start = time.perf_counter()
+        func(0)
+        cold_ms = (time.perf_counter() - start) * 1000
+        
+        warm = []
+        spent = cold_ms / 1000
+        for call in range(1, repeats + 1):
+            if spent >= time_budget:
+                break
+            start = time.perf_counter()
+            func(call)
+            elapsed = time.perf_counter() - start
+            warm.append(elapsed * 1000)
+            spent += elapsed
+    except Exception as e:
+        return {'error': f"{type(e).__name__}: {e}"}
+    
+    return {'cold_ms': cold_ms, 'warm': summarize_latencies(warm)}
+
+
+def environment_info():
+    """Describe the machine and configuration a result was recorded on"""
+    import numpy
+    import pandas
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'numpy': numpy.__version__,
+        'pandas': pandas.__version__,
+        'storage_backend': config.STORAGE_BACKEND
+    }
+
+
+def write_json(filepath, data):
+    """
+    Write benchmark results as indented JSON
+    
+    Args:
+        filepath: Output path
+        data: JSON-serializable results
+    """
+    directory = os.path.dirname(os.path.abspath(filepath))
+    os.makedirs(directory, exist_ok=True)
+    with open(filepath, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+
+
+def format_ms(value):
+    """Format a millisecond value for a results table"""
+    if value is None:
+        return '-'
+    if value >= 1000:
+        return f"{value / 1000:.2f}s"
+    return f"{value:.2f}"
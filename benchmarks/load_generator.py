@@ -0,0 +1,376 @@
+"""
+Load Generator
+Simulates many users taking quizzes at once against the real data layer
+
+Each simulated user repeats the same path as the GUI:
+    achievements.update_streak -> question_manager.get_random_questions
+    -> answer every question (QuizSession) -> data_manager.add_quiz_attempt
+    -> achievements.check_and_unlock_achievements
+Users are spread over worker processes, so the inter-process file locks and
+the materialized aggregates are exercised the way concurrent app instances
+would exercise them. Answer times are drawn from a configurable distribution
+and fed to QuizSession through a simulated clock, so Timed bonuses and
+expiries follow the distribution without the run actually waiting.
+
+The run works on a scratch data directory seeded with the question bank and
+reports throughput, latency percentiles per operation and data file growth.
+
+Usage:
+    python -m benchmarks.load_generator --users 2000 --processes 8
+    python -m benchmarks.load_generator --mode-mix Timed=1 --answer-time lognormal:6,0.5
+"""
+
+import os
+import sys
+import time
+import math
+import random
+import shutil
+import argparse
+import tempfile
+import multiprocessing
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import config
+from benchmarks.harness import use_data_dir, summarize_latencies, write_json, check_scratch_dir, clear_generated_files
+
+
+DEFAULT_MODE_MIX = 'Practice=0.5,Timed=0.3,Survival=0.2'
+DEFAULT_DIFFICULTY_MIX = 'Easy=0.4,Medium=0.4,Hard=0.2'
+DEFAULT_ANSWER_TIME = 'lognormal:8,0.6'
+
+# Operations timed for every simulated quiz, in the order they run
+OPERATIONS = ['update_streak', 'get_questions', 'add_quiz_attempt', 'check_achievements', 'quiz_total']
+
+# Data files whose growth is reported
+TRACKED_FILES = ['quiz_history.csv', 'achievements.csv', 'user_settings.csv',
+                 'user_stats', 'leaderboard.json', config.SQLITE_FILENAME]
+
+
+def parse_mix(text):
+    """
+    Parse a weighted choice list such as 'Practice=0.5,Timed=0.5'
+    
+    Args:
+        text: Comma-separated name=weight pairs
+    
+    Returns:
+        (names, weights) lists
+    """
+    names, weights = [], []
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        names.append(name.strip())
+        weights.append(float(weight) if weight else 1.0)
+    if not names or sum(weights) <= 0:
+        raise ValueError(f"Invalid mix: {text}")
+    return names, weights
+
+
+def parse_answer_time(text):
+    """
+    Parse an answer-time distribution spec
+    
+    Supported forms (seconds):
+        fixed:S            always S
+        uniform:LOW,HIGH   uniform between LOW and HIGH
+        lognormal:MEDIAN,SIGMA
+        normal:MEAN,SD     truncated at 0.2 s
+    
+    Args:
+        text: Distribution spec
+    
+    Returns:
+        (kind, parameters) tuple
+    """
+    kind, _, params = text.partition(':')
+    values = [float(v) for v in params.split(',') if v]
+    expected = {'fixed': 1, 'uniform': 2, 'lognormal': 2, 'normal': 2}
+    if kind not in expected or len(values) != expected[kind]:
+        raise ValueError(f"Invalid answer time distribution: {text}")
+    return kind, values
+
+
+def sample_answer_time(rng, distribution):
+    """
+    Draw one answer time in seconds
+    
+    Args:
+        rng: random.Random instance
+        distribution: (kind, parameters) from parse_answer_time
+    
+    Returns:
+        Seconds the simulated user takes to answer
+    """
+    kind, values = distribution
+    if kind == 'fixed':
+        return values[0]
+    if kind == 'uniform':
+        return rng.uniform(values[0], values[1])
+    if kind == 'lognormal':
+        return rng.lognormvariate(math.log(values[0]), values[1])
+    return max(0.2, rng.gauss(values[0], values[1]))
+
+
+def get_file_sizes(data_dir):
+    """Size in bytes of each tracked data file or directory (0 if missing)"""
+    sizes = {}
+    for name in TRACKED_FILES:
+        path = os.path.join(data_dir, name)
+        if os.path.isdir(path):
+            sizes[name] = sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+        else:
+            sizes[name] = os.path.getsize(path) if os.path.exists(path) else 0
+    return sizes
+
+
+def prepare_data_dir(data_dir, source_dir):
+    """
+    Create a scratch data directory holding only a copy of the question bank
+    Data from an earlier run in the same directory is removed
+    
+    Args:
+        data_dir: Directory to prepare (created if missing)
+        source_dir: Data directory to copy questions.json from
+    
+    Raises:
+        ValueError: If data_dir is the app's live data directory
+    """
+    check_scratch_dir(data_dir)
+    os.makedirs(data_dir, exist_ok=True)
+    clear_generated_files(data_dir)
+    shutil.copyfile(os.path.join(source_dir, 'questions.json'), os.path.join(data_dir, 'questions.json'))
+
+
+def run_user(task):
+    """
+    Worker entry point: one simulated user takes several quizzes
+    
+    Args:
+        task: (user_number, options dict)
+    
+    Returns:
+        Dictionary with per-operation latencies (ms), quiz and error counts
+    """
+    user_number, options = task
+    
+    # Imported here so the data directory and backend are already configured
+    from utils import achievements, question_manager
+    from utils.quiz_session import QuizSession
+    
+    rng = random.Random(options['seed'] * 1000003 + user_number)
+    username = f"load_user_{user_number:06d}"
+    categories = question_manager.get_categories()
+    modes, mode_weights = options['mode_mix']
+    difficulties, difficulty_weights = options['difficulty_mix']
+    
+    latencies = {name: [] for name in OPERATIONS}
+    quizzes = 0
+    errors = 0
+    
+    for _ in range(options['quizzes_per_user']):
+        mode = rng.choices(modes, mode_weights)[0]
+        difficulty = rng.choices(difficulties, difficulty_weights)[0]
+        category = rng.choice(categories)
+        quiz_start = time.perf_counter()
+        
+        try:
+            start = time.perf_counter()
+            achievements.update_streak(username)
+            latencies['update_streak'].append((time.perf_counter() - start) * 1000)
+            
+            # Simulated clock: answer times advance it instead of sleeping
+            clock = [0.0]
+            start = time.perf_counter()
+            session = QuizSession.from_question_bank(category, difficulty, mode, options['questions'],
+                                                     clock=lambda: clock[0], rng=rng)
+            latencies['get_questions'].append((time.perf_counter() - start) * 1000)
+            if session is None:
+                continue
+            
+            while True:
+                question = session.start_question()
+                if rng.random() < options['hint_rate']:
+                    session.use_hint()
+                clock[0] += sample_answer_time(rng, options['answer_time'])
+                
+                if session.is_timed and clock[0] >= session.deadline:
+                    outcome = session.expire()
+                else:
+                    if rng.random() < options['accuracy']:
+                        selected = question['correct']
+                    else:
+                        selected = rng.choice([i for i in range(len(question['options']))
+                                               if i != question['correct']])
+                    outcome = session.answer(selected)
+                
+                if outcome['finished'] or not session.advance():
+                    break
+            
+            start = time.perf_counter()
+            session.save(username)
+            latencies['add_quiz_attempt'].append((time.perf_counter() - start) * 1000)
+            
+            start = time.perf_counter()
+            achievements.check_and_unlock_achievements(username)
+            latencies['check_achievements'].append((time.perf_counter() - start) * 1000)
+            
+            latencies['quiz_total'].append((time.perf_counter() - quiz_start) * 1000)
+            quizzes += 1
+        except Exception as e:
+            print(f"{username}: quiz failed: {e}")
+            errors += 1
+    
+    return {'latencies': latencies, 'quizzes': quizzes, 'errors': errors}
+
+
+def _init_worker(data_dir, backend):
+    """Point a worker process at the run's data directory and backend"""
+    use_data_dir(data_dir, backend)
+
+
+def run_load(users, processes, quizzes_per_user=1, questions=10, mode_mix=DEFAULT_MODE_MIX,
+             difficulty_mix=DEFAULT_DIFFICULTY_MIX, answer_time=DEFAULT_ANSWER_TIME,
+             accuracy=0.7, hint_rate=0.1, backend='csv', data_dir=None, seed=0):
+    """
+    Run a load test
+    
+    Args:
+        users: Number of simulated users
+        processes: Worker processes running users in parallel
+        quizzes_per_user: Quizzes each user takes
+        questions: Questions per quiz
+        mode_mix: Weighted mode choice, e.g. 'Practice=0.5,Timed=0.5'
+        difficulty_mix: Weighted difficulty choice
+        answer_time: Answer-time distribution spec (see parse_answer_time)
+        accuracy: Probability that a simulated answer is correct
+        hint_rate: Probability of using a hint on a question
+        backend: Storage backend, 'csv' or 'sqlite'
+        data_dir: Scratch data directory (a new temp directory if None)
+        seed: Random seed for reproducible runs
+    
+    Returns:
+        Report dictionary (configuration, throughput, latencies, file growth)
+    """
+    source_dir = config.get_data_dir()
+    if data_dir is None:
+        data_dir = tempfile.mkdtemp(prefix='quiz_load_')
+    data_dir = os.path.abspath(data_dir)
+    prepare_data_dir(data_dir, source_dir)
+    
+    options = {
+        'quizzes_per_user': quizzes_per_user,
+        'questions': questions,
+        'mode_mix': parse_mix(mode_mix),
+        'difficulty_mix': parse_mix(difficulty_mix),
+        'answer_time': parse_answer_time(answer_time),
+        'accuracy': accuracy,
+        'hint_rate': hint_rate,
+        'seed': seed
+    }
+    
+    sizes_before = get_file_sizes(data_dir)
+    latencies = {name: [] for name in OPERATIONS}
+    quizzes = 0
+    errors = 0
+    
+    start = time.perf_counter()
+    with multiprocessing.Pool(processes, initializer=_init_worker, initargs=(data_dir, backend)) as pool:
+        tasks = ((user_number, options) for user_number in range(users))
+        for result in pool.imap_unordered(run_user, tasks, chunksize=max(1, users // (processes * 8))):
+            for name, samples in result['latencies'].items():
+                latencies[name].extend(samples)
+            quizzes += result['quizzes']
+            errors += result['errors']
+    elapsed = time.perf_counter() - start
+    
+    sizes_after = get_file_sizes(data_dir)
+    return {
+        'config': {
+            'users': users,
+            'processes': processes,
+            'quizzes_per_user': quizzes_per_user,
+            'questions': questions,
+            'mode_mix': mode_mix,
+            'difficulty_mix': difficulty_mix,
+            'answer_time': answer_time,
+            'accuracy': accuracy,
+            'hint_rate': hint_rate,
+            'backend': backend,
+            'seed': seed,
+            'data_dir': data_dir
+        },
+        'elapsed_s': elapsed,
+        'quizzes': quizzes,
+        'errors': errors,
+        'quizzes_per_s': quizzes / elapsed if elapsed > 0 else 0.0,
+        'latency': {name: summarize_latencies(samples) for name, samples in latencies.items()},
+        'file_growth': {
+            name: {'before': sizes_before[name], 'after': sizes_after[name],
+                   'bytes_per_quiz': (sizes_after[name] - sizes_before[name]) / max(1, quizzes)}
+            for name in TRACKED_FILES if sizes_after[name] or sizes_before[name]
+        }
+    }
+
+
+def print_report(report):
+    """Print a load test report as a readable table"""
+    cfg = report['config']
+    print(f"Users: {cfg['users']}  Processes: {cfg['processes']}  Backend: {cfg['backend']}  "
+          f"Modes: {cfg['mode_mix']}  Answer time: {cfg['answer_time']}")
+    print(f"Quizzes: {report['quizzes']}  Errors: {report['errors']}  "
+          f"Elapsed: {report['elapsed_s']:.2f}s  Throughput: {report['quizzes_per_s']:.1f} quizzes/s")
+    print()
+    print(f"{'operation':<20}{'count':>8}{'mean':>10}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}  (ms)")
+    for name, stats in report['latency'].items():
+        print(f"{name:<20}{stats['count']:>8}{stats['mean_ms']:>10.2f}{stats['p50_ms']:>10.2f}"
+              f"{stats['p90_ms']:>10.2f}{stats['p99_ms']:>10.2f}{stats['max_ms']:>10.2f}")
+    print()
+    print(f"{'file':<22}{'before':>12}{'after':>12}{'bytes/quiz':>12}")
+    for name, growth in report['file_growth'].items():
+        print(f"{name:<22}{growth['before']:>12}{growth['after']:>12}{growth['bytes_per_quiz']:>12.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate concurrent quiz takers against the data layer")
+    parser.add_argument('--users', type=int, default=1000, help="simulated users")
+    parser.add_argument('--processes', type=int, default=os.cpu_count() or 4, help="worker processes")
+    parser.add_argument('--quizzes-per-user', type=int, default=1)
+    parser.add_argument('--questions', type=int, default=10, help="questions per quiz")
+    parser.add_argument('--mode-mix', default=DEFAULT_MODE_MIX, help="weighted modes, e.g. Practice=1,Timed=2")
+    parser.add_argument('--difficulty-mix', default=DEFAULT_DIFFICULTY_MIX)
+    parser.add_argument('--answer-time', default=DEFAULT_ANSWER_TIME,
+                        help="fixed:S, uniform:LOW,HIGH, lognormal:MEDIAN,SIGMA or normal:MEAN,SD (seconds)")
+    parser.add_argument('--accuracy', type=float, default=0.7, help="probability of a correct answer")
+    parser.add_argument('--hint-rate', type=float, default=0.1, help="probability of using a hint per question")
+    parser.add_argument('--backend', choices=['csv', 'sqlite'], default=config.STORAGE_BACKEND)
+    parser.add_argument('--data-dir', help="scratch data directory (default: new temp directory)")
+    parser.add_argument('--keep', action='store_true', help="keep the temp data directory")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help="also write the report to this JSON file")
+    args = parser.parse_args(argv)
+    if args.data_dir:
+        try:
+            check_scratch_dir(args.data_dir)
+        except ValueError as e:
+            parser.error(str(e))
+    
+    report = run_load(args.users, args.processes, args.quizzes_per_user, args.questions,
+                      args.mode_mix, args.difficulty_mix, args.answer_time, args.accuracy,
+                      args.hint_rate, args.backend, args.data_dir, args.seed)
+    print_report(report)
+    
+    if args.json:
+        write_json(args.json, report)
+    
+    if args.data_dir is None and not args.keep:
+        shutil.rmtree(report['config']['data_dir'], ignore_errors=True)
+    else:
+        print(f"\nData directory: {report['config']['data_dir']}")
+    
+    return 1 if report['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
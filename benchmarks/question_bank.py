@@ -0,0 +1,194 @@
+"""
+Question Bank Benchmarks
+Measures question_manager load time, memory footprint and per-call latency
+on generated banks of increasing size
+
+For each size a bank is generated with benchmarks.question_generator into a
+scratch data directory. The bank is loaded cold (timed), loaded again under
+tracemalloc (peak and retained memory), and then every question_manager
+function is timed warm, many calls each.
+
+With --format jsonl the generated bank is converted to the JSON Lines store
+(utils.question_store) first, so both formats can be compared at each size.
+
+Usage:
+    python -m benchmarks.question_bank --sizes 10k,100k --json bench/question_bank.json
+    python -m benchmarks.question_bank --sizes 1M --format jsonl
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import tracemalloc
+import gc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import config
+from benchmarks.harness import (use_data_dir, reset_caches, time_call, environment_info, write_json, format_ms,
+                                check_scratch_dir)
+from benchmarks.question_generator import generate_questions, write_question_bank, DEFAULT_CATEGORIES
+
+
+SIZES = {'10k': 10_000, '100k': 100_000, '1M': 1_000_000}
+DEFAULT_SIZES = '10k,100k'
+
+# Questions per selection, as in a normal quiz
+SELECTION_COUNT = 10
+
+
+def parse_sizes(text):
+    """Parse a comma-separated size list such as '10k,100k' or '50000'"""
+    return [(label.strip(), SIZES.get(label.strip()) or int(label)) for label in text.split(',')]
+
+
+def measure_load():
+    """
+    Time a cold load of the question bank
+    
+    Returns:
+        Seconds taken to parse and index the file
+    """
+    from utils import question_manager
+    
+    reset_caches()
+    start = time.perf_counter()
+    question_manager.get_question_bank().refresh()
+    return time.perf_counter() - start
+
+
+def measure_memory(category):
+    """
+    Measure memory allocated by a cold load of the question bank and by one selection
+    
+    Returns:
+        Dictionary with load peak and retained bytes (retained = still held by
+        the bank) and the peak bytes of a get_random_questions call
+    """
+    from utils import question_manager
+    
+    # Drop the previous bank first so it is not counted as freed during the load
+    question_manager._question_bank = None
+    gc.collect()
+    
+    tracemalloc.start()
+    try:
+        question_manager.get_question_bank().refresh()
+        retained, peak = tracemalloc.get_traced_memory()
+        
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        question_manager.get_random_questions(category, 'Medium', SELECTION_COUNT)
+        selection_peak = tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+    return {'peak_bytes': peak, 'retained_bytes': retained, 'selection_peak_bytes': selection_peak}
+
+
+def get_cases(category):
+    """Benchmark cases as (name, function of call number)"""
+    from utils import question_manager
+    
+    sample = question_manager.load_all_questions()[0]
+    return [
+        ('load_all_questions', lambda call: question_manager.load_all_questions()),
+        ('filter_questions(category)', lambda call: question_manager.filter_questions(category)),
+        ('filter_questions(category, difficulty)',
+         lambda call: question_manager.filter_questions(category, 'Medium')),
+        ('get_random_questions', lambda call: question_manager.get_random_questions(category, 'Medium', SELECTION_COUNT)),
+        ('get_random_questions(any)', lambda call: question_manager.get_random_questions(None, None, SELECTION_COUNT)),
+        ('get_mixed_difficulty_questions',
+         lambda call: question_manager.get_mixed_difficulty_questions(category, SELECTION_COUNT)),
+        ('get_categories', lambda call: question_manager.get_categories()),
+        ('get_difficulties', lambda call: question_manager.get_difficulties()),
+        ('count_questions', lambda call: question_manager.count_questions(category, 'Medium')),
+        ('validate_question', lambda call: question_manager.validate_question(sample)),
+        ('get_question_stats', lambda call: question_manager.get_question_stats())
+    ]
+
+
+def run_size(label, count, base_dir, repeats, time_budget, seed=0, bank_format='json'):
+    """
+    Generate one bank and benchmark it
+    
+    Returns:
+        Result dictionary for this size
+    """
+    data_dir = os.path.join(base_dir, label)
+    use_data_dir(data_dir)
+    config.QUESTION_STORE = bank_format
+    
+    start = time.perf_counter()
+    bank_path = os.path.join(data_dir, 'questions.json')
+    write_question_bank(bank_path, generate_questions(count, seed=seed))
+    if bank_format == 'jsonl':
+        from utils import question_store
+        question_store.convert_json_to_jsonl(bank_path, question_store.get_jsonl_path())
+        os.remove(bank_path)
+        bank_path = question_store.get_jsonl_path()
+    generate_s = time.perf_counter() - start
+    
+    result = {
+        'questions': count,
+        'format': bank_format,
+        'generate_s': generate_s,
+        'file_bytes': os.path.getsize(bank_path),
+        'load_s': measure_load(),
+        'memory': measure_memory(DEFAULT_CATEGORIES[0]),
+        'functions': {}
+    }
+    memory = result['memory']
+    print(f"  load {result['load_s']:.3f}s  peak {memory['peak_bytes'] / 1e6:.1f} MB  "
+          f"retained {memory['retained_bytes'] / 1e6:.1f} MB  "
+          f"selection peak {memory['selection_peak_bytes'] / 1e3:.1f} kB")
+    
+    # Warm the bank once; the cases measure selection, not loading
+    measure_load()
+    for name, func in get_cases(DEFAULT_CATEGORIES[0]):
+        timing = time_call(func, repeats=repeats, time_budget=time_budget, cold=False)
+        result['functions'][name] = timing
+        warm = timing.get('warm', {})
+        print(f"  {name:<42} p50 {format_ms(warm.get('p50_ms')):>9}  p99 {format_ms(warm.get('p99_ms')):>9}"
+              f"{'  ' + timing['error'] if 'error' in timing else ''}")
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark question_manager on generated question banks")
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help=f"comma-separated sizes ({', '.join(SIZES)} or a count)")
+    parser.add_argument('--format', choices=['json', 'jsonl'], default='json', help="question bank format")
+    parser.add_argument('--repeats', type=int, default=200, help="warm calls per function")
+    parser.add_argument('--time-budget', type=float, default=2.0, help="seconds of warm calls per function")
+    parser.add_argument('--data-dir', help="directory for generated banks (default: temp dir, removed afterwards)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help="write results to this JSON file")
+    args = parser.parse_args(argv)
+    
+    if args.data_dir:
+        try:
+            check_scratch_dir(args.data_dir)
+        except ValueError as e:
+            parser.error(str(e))
+    
+    base_dir = args.data_dir or tempfile.mkdtemp(prefix='quiz_qbench_')
+    report = {'benchmark': 'question_bank', 'environment': environment_info(), 'format': args.format, 'sizes': {}}
+    
+    try:
+        for label, count in parse_sizes(args.sizes):
+            print(f"[{label}] {count} questions ({args.format})")
+            report['sizes'][label] = run_size(label, count, base_dir, args.repeats, args.time_budget,
+                                              args.seed, args.format)
+    finally:
+        if args.data_dir is None:
+            shutil.rmtree(base_dir, ignore_errors=True)
+    
+    if args.json:
+        write_json(args.json, report)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""
+Question Generator
+Generates synthetic question banks in the questions.json format
+
+Every generated question passes question_manager.validate_question. Question
+and explanation lengths vary like the hand-written bank, so load time and
+memory scale realistically.
+
+Usage:
+    python -m benchmarks.question_generator 100000 /tmp/questions.json
+    python -m benchmarks.question_generator 10000 out.json --categories Python,DSA,SQL,Networks
+"""
+
+import os
+import sys
+import json
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import question_manager
+
+
+DEFAULT_CATEGORIES = ['Python', 'DSA', 'Computer Networks']
+DEFAULT_DIFFICULTIES = ['Easy', 'Medium', 'Hard']
+
+WORDS = ['list', 'tuple', 'stack', 'queue', 'packet', 'router', 'hash', 'tree', 'graph', 'loop',
+         'function', 'class', 'socket', 'protocol', 'index', 'pointer', 'heap', 'array', 'string',
+         'thread', 'process', 'cache', 'latency', 'buffer', 'module', 'iterator', 'decorator']
+
+
+def _sentence(rng, min_words, max_words):
+    words = [rng.choice(WORDS) for _ in range(rng.randint(min_words, max_words))]
+    return ' '.join(words).capitalize()
+
+
+def generate_question(rng, number, category, difficulty):
+    """
+    Generate one question dictionary
+    
+    Args:
+        rng: random.Random instance
+        number: Sequence number (keeps question texts unique)
+        category: Category name
+        difficulty: Difficulty level
+    
+    Returns:
+        Question dictionary in the questions.json layout
+    """
+    return {
+        'category': category,
+        'difficulty': difficulty,
+        'question': f"Q{number}: {_sentence(rng, 6, 16)}?",
+        'options': [_sentence(rng, 1, 4) for _ in range(4)],
+        'correct': rng.randrange(4),
+        'explanation': _sentence(rng, 10, 30) + '.'
+    }
+
+
+def generate_questions(count, categories=None, difficulties=None, weights=None, seed=0):
+    """
+    Generate a list of valid questions
+    
+    Args:
+        count: Number of questions
+        categories: Category names (DEFAULT_CATEGORIES if None)
+        difficulties: Difficulty levels (DEFAULT_DIFFICULTIES if None)
+        weights: Optional relative weights for the difficulties
+        seed: Random seed
+    
+    Returns:
+        List of question dictionaries
+    
+    Raises:
+        ValueError: If a generated question fails validate_question
+    """
+    rng = random.Random(seed)
+    categories = categories or DEFAULT_CATEGORIES
+    difficulties = difficulties or DEFAULT_DIFFICULTIES
+    
+    questions = []
+    for number in range(count):
+        question = generate_question(rng, number, rng.choice(categories),
+                                     rng.choices(difficulties, weights)[0])
+        if not question_manager.validate_question(question):
+            raise ValueError(f"Generated an invalid question: {question}")
+        questions.append(question)
+    return questions
+
+
+def write_question_bank(filepath, questions):
+    """
+    Write questions as a JSON array (the questions.json format)
+    
+    Args:
+        filepath: Output path
+        questions: List of question dictionaries
+    """
+    directory = os.path.dirname(os.path.abspath(filepath))
+    os.makedirs(directory, exist_ok=True)
+    with open(filepath, 'w', encoding='utf-8') as f:
+        json.dump(questions, f, ensure_ascii=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic question bank")
+    parser.add_argument('count', type=int, help="number of questions")
+    parser.add_argument('output', help="output questions.json path")
+    parser.add_argument('--categories', default=','.join(DEFAULT_CATEGORIES))
+    parser.add_argument('--difficulties', default=','.join(DEFAULT_DIFFICULTIES))
+    parser.add_argument('--weights', help="relative difficulty weights, e.g. 4,4,2")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    
+    weights = [float(w) for w in args.weights.split(',')] if args.weights else None
+    questions = generate_questions(args.count, args.categories.split(','), args.difficulties.split(','),
+                                   weights, args.seed)
+    write_question_bank(args.output, questions)
+    print(f"Wrote {len(questions)} questions to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
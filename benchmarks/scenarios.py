@@ -0,0 +1,330 @@
+"""
+Scenario Benchmarks
+Times complete user flows step by step and compares them with a stored baseline
+
+A scenario replays one visit to the app without a display. Each step calls
+the same utils.screen_data functions its screen uses in main.py, so the
+timings follow the app's code path (widget construction is not included).
+Every run starts with cold in-process caches, like a freshly started app.
+    
+    login      data_manager.validate_user (as the login screen)
+    dashboard  screen version + screen_data.load_dashboard
+    quiz_start screen_data.start_quiz
+    quiz       answering every question through the QuizSession
+    results    screen_data.finish_quiz
+    analytics  screen version + load_analytics, then the missing charts rendered
+               by the background worker (waited for)
+    history    screen version + screen_data.load_history
+
+Runs happen against a scratch data directory seeded with synthetic history.
+With --update-baseline the results are stored; later runs compare each
+step's median with the baseline and exit with status 1 if any step slowed
+down by more than its threshold.
+
+Usage:
+    python -m benchmarks.scenarios --update-baseline
+    python -m benchmarks.scenarios --threshold 0.25 --step-threshold analytics=0.5
+"""
+
+import os
+import sys
+import json
+import time
+import queue
+import random
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import config, screen_data
+from benchmarks.harness import (use_data_dir, reset_caches, summarize_latencies, environment_info, write_json, format_ms,
+                                check_scratch_dir)
+from benchmarks.data_layer import generate_dataset, build_aggregates, username_for
+
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines', 'scenarios.json')
+
+# Scenario name -> quiz played in the middle of the flow
+SCENARIOS = {
+    'timed_20': {'mode': 'Timed', 'questions': 20, 'category': 'Python', 'difficulty': 'Easy'},
+    'practice_10': {'mode': 'Practice', 'questions': 10, 'category': 'DSA', 'difficulty': 'Medium'},
+    'survival_20': {'mode': 'Survival', 'questions': 20, 'category': 'Computer Networks', 'difficulty': 'Hard'}
+}
+DEFAULT_SCENARIOS = 'timed_20'
+
+STEPS = ['login', 'dashboard', 'quiz_start', 'quiz', 'results', 'analytics', 'history']
+
+# Slowdown (fraction of the baseline median) tolerated before a step counts as regressed
+DEFAULT_THRESHOLD = 0.2
+
+# Slowdowns smaller than this are ignored, so sub-millisecond steps do not flap
+DEFAULT_MIN_DELTA_MS = 2.0
+
+
+class ScenarioRun:
+    """One pass through a scenario, timing each step"""
+    
+    def __init__(self, username, password, scenario, rng):
+        self.username = username
+        self.password = password
+        self.scenario = scenario
+        self.rng = rng
+        self.session = None
+        self.timings = {}
+    
+    def step_login(self):
+        from utils import data_manager
+        if not data_manager.validate_user(self.username, self.password):
+            raise RuntimeError(f"Login failed for {self.username}")
+    
+    def step_dashboard(self):
+        screen_data.get_screen_version(self.username, include_settings=True)
+        screen_data.load_dashboard(self.username)
+    
+    def step_quiz_start(self):
+        self.clock = [0.0]
+        self.session = screen_data.start_quiz(
+            self.username, self.scenario['category'], self.scenario['difficulty'], self.scenario['mode'],
+            self.scenario['questions'], clock=lambda: self.clock[0], rng=self.rng)
+        if self.session is None:
+            raise RuntimeError(f"No questions for scenario {self.scenario}")
+    
+    def step_quiz(self):
+        session = self.session
+        while True:
+            question = session.start_question()
+            self.clock[0] += self.rng.uniform(2, 12)
+            if self.rng.random() < 0.75:
+                selected = question['correct']
+            else:
+                selected = (question['correct'] + 1) % len(question['options'])
+            outcome = session.answer(selected)
+            if outcome['finished'] or not session.advance():
+                break
+    
+    def step_results(self):
+        screen_data.finish_quiz(self.username, self.session)
+    
+    def step_analytics(self):
+        from utils import chart_renderer
+        from modules.gui_analytics import CHART_TITLES
+        
+        screen_data.get_screen_version(self.username)
+        data = screen_data.load_analytics(self.username)
+        
+        # The new attempt changed the version, so the charts are rendered again
+        cached, missing = screen_data.load_cached_charts(self.username, data['version'], CHART_TITLES)
+        if missing:
+            results = queue.Queue()
+            chart_renderer.start_render_worker(self.username, data['version'], data['history'].copy(), missing,
+                                               results, dict(data['stats'])).join()
+            for _ in missing:
+                chart_id, png, error = results.get_nowait()
+                if error is not None:
+                    raise error
+    
+    def step_history(self):
+        from modules.gui_history import COLUMN_SOURCES
+        
+        screen_data.get_screen_version(self.username)
+        screen_data.load_history(self.username, COLUMN_SOURCES.values())
+    
+    def run(self):
+        """
+        Run every step in order
+        
+        Returns:
+            Dictionary of step name -> milliseconds
+        """
+        for step in STEPS:
+            start = time.perf_counter()
+            getattr(self, f"step_{step}")()
+            self.timings[step] = (time.perf_counter() - start) * 1000
+        return self.timings
+
+
+def prepare_data_dir(data_dir, history_rows, seed=0):
+    """
+    Seed a scratch data directory with the question bank and synthetic history
+    
+    Returns:
+        (username, password) of a user that has history
+    
+    Raises:
+        ValueError: If data_dir is the app's live data directory
+    """
+    check_scratch_dir(data_dir)
+    source_dir = config.get_data_dir()
+    os.makedirs(data_dir, exist_ok=True)
+    shutil.copyfile(os.path.join(source_dir, 'questions.json'), os.path.join(data_dir, 'questions.json'))
+    
+    use_data_dir(data_dir)
+    generate_dataset(data_dir, history_rows, seed)
+    build_aggregates(config.STORAGE_BACKEND)
+    return username_for(0), 'password'
+
+
+def run_scenarios(names, runs, history_rows, data_dir, seed=0, warmup=1):
+    """
+    Run each scenario several times
+    
+    Args:
+        names: Scenario names (keys of SCENARIOS)
+        runs: Measured runs per scenario
+        history_rows: Synthetic history rows to seed the data directory with
+        data_dir: Scratch data directory
+        seed: Random seed
+        warmup: Unmeasured runs first (imports, first file reads)
+    
+    Returns:
+        Dictionary of scenario -> step -> latency summary
+    """
+    username, password = prepare_data_dir(data_dir, history_rows, seed)
+    rng = random.Random(seed)
+    
+    results = {}
+    for name in names:
+        samples = {step: [] for step in STEPS}
+        for run in range(warmup + runs):
+            reset_caches()
+            timings = ScenarioRun(username, password, SCENARIOS[name], rng).run()
+            if run >= warmup:
+                for step, ms in timings.items():
+                    samples[step].append(ms)
+        results[name] = {step: summarize_latencies(values) for step, values in samples.items()}
+        results[name]['total'] = summarize_latencies([sum(run_steps) for run_steps in zip(*samples.values())])
+    return results
+
+
+def parse_step_thresholds(items):
+    """Parse 'step=fraction' overrides into a dictionary"""
+    thresholds = {}
+    for item in items or []:
+        step, _, value = item.partition('=')
+        thresholds[step.strip()] = float(value)
+    return thresholds
+
+
+def compare_with_baseline(results, baseline, threshold=DEFAULT_THRESHOLD, step_thresholds=None,
+                          min_delta_ms=DEFAULT_MIN_DELTA_MS):
+    """
+    Compare step medians with a baseline
+    
+    Args:
+        results: Output of run_scenarios
+        baseline: Previously stored output of run_scenarios
+        threshold: Tolerated slowdown as a fraction of the baseline median
+        step_thresholds: Per-step overrides of threshold
+        min_delta_ms: Slowdowns below this many milliseconds never count
+    
+    Returns:
+        List of comparison rows (scenario, step, baseline, current, change, limit, regressed)
+    """
+    step_thresholds = step_thresholds or {}
+    rows = []
+    for scenario, steps in results.items():
+        for step, summary in steps.items():
+            previous = baseline.get(scenario, {}).get(step)
+            if previous is None:
+                continue
+            base_ms = previous['p50_ms']
+            current_ms = summary['p50_ms']
+            change = (current_ms - base_ms) / base_ms if base_ms > 0 else 0.0
+            limit = step_thresholds.get(step, threshold)
+            rows.append({
+                'scenario': scenario,
+                'step': step,
+                'baseline_ms': base_ms,
+                'current_ms': current_ms,
+                'change': change,
+                'limit': limit,
+                'regressed': change > limit and current_ms - base_ms > min_delta_ms
+            })
+    return rows
+
+
+def print_results(results):
+    """Print step medians per scenario"""
+    for scenario, steps in results.items():
+        print(f"[{scenario}]")
+        for step, summary in steps.items():
+            print(f"  {step:<12} p50 {format_ms(summary['p50_ms']):>9}  p90 {format_ms(summary['p90_ms']):>9}  "
+                  f"max {format_ms(summary['max_ms']):>9}")
+
+
+def print_comparison(rows):
+    """Print the baseline comparison, marking regressed steps"""
+    print(f"\n{'scenario':<14}{'step':<12}{'baseline':>10}{'current':>10}{'change':>9}{'limit':>8}")
+    for row in rows:
+        flag = '  REGRESSED' if row['regressed'] else ''
+        print(f"{row['scenario']:<14}{row['step']:<12}{format_ms(row['baseline_ms']):>10}"
+              f"{format_ms(row['current_ms']):>10}{row['change']:>+8.0%}{row['limit']:>8.0%}{flag}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time headless user flows and compare them with a baseline")
+    parser.add_argument('--scenarios', default=DEFAULT_SCENARIOS, help=f"comma-separated ({', '.join(SCENARIOS)})")
+    parser.add_argument('--runs', type=int, default=5, help="measured runs per scenario")
+    parser.add_argument('--history-rows', type=int, default=10000, help="synthetic history rows to start from")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument('--update-baseline', action='store_true', help="store this run as the baseline")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="tolerated slowdown as a fraction, e.g. 0.2 for 20%%")
+    parser.add_argument('--step-threshold', action='append', metavar='STEP=FRACTION',
+                        help="per-step threshold override (repeatable)")
+    parser.add_argument('--min-delta-ms', type=float, default=DEFAULT_MIN_DELTA_MS)
+    parser.add_argument('--data-dir', help="scratch data directory (default: temp dir, removed afterwards)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help="also write this run's results to this JSON file")
+    args = parser.parse_args(argv)
+    
+    names = [name.strip() for name in args.scenarios.split(',')]
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+    
+    if args.data_dir:
+        try:
+            check_scratch_dir(args.data_dir)
+        except ValueError as e:
+            parser.error(str(e))
+    
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix='quiz_scenarios_')
+    try:
+        results = run_scenarios(names, args.runs, args.history_rows, data_dir, args.seed)
+    finally:
+        if args.data_dir is None:
+            shutil.rmtree(data_dir, ignore_errors=True)
+    
+    print_results(results)
+    report = {'benchmark': 'scenarios', 'environment': environment_info(),
+              'history_rows': args.history_rows, 'runs': args.runs, 'results': results}
+    if args.json:
+        write_json(args.json, report)
+    
+    if args.update_baseline:
+        write_json(args.baseline, report)
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+    
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run with --update-baseline to create one")
+        return 0
+    
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    rows = compare_with_baseline(results, baseline.get('results', {}), args.threshold,
+                                 parse_step_thresholds(args.step_threshold), args.min_delta_ms)
+    print_comparison(rows)
+    
+    regressed = [row for row in rows if row['regressed']]
+    for row in regressed:
+        print(f"Regression: {row['scenario']}/{row['step']} is {row['change']:+.0%} slower "
+              f"({format_ms(row['baseline_ms'])} -> {format_ms(row['current_ms'])} ms, limit {row['limit']:.0%})")
+    return 1 if regressed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,21 +1,47 @@
 """
 Quiz Application Main Entry Point
 Coordinates all modules and manages application flow
+
+Only lightweight modules are imported at startup so the login screen paints
+without loading pandas, NumPy or matplotlib. Screens import the heavy
+modules (data_manager, achievements, score_calculator, ...) where they use
+them, and a background thread pre-warms them right after first paint.
 """
 
+import time
+
+# Measured from interpreter start of this module to first paint of the login screen
+_PROCESS_START = time.perf_counter()
+
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import sys
 import os
-import time
+import math
+import threading
+import importlib
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from modules.gui_login import LoginScreen
-from modules.gui_dashboard import DashboardScreen
-from utils import file_handler, data_manager, question_manager, score_calculator
-from utils import achievements, sound_effects, confetti
+from modules.screen_manager import ScreenManager
+from utils import file_handler, question_manager, sound_effects, config
+from utils.scheduler import TickScheduler
+from utils import screen_data
+
+# How often the countdown label is refreshed (it only changes once per second)
+TIMER_DISPLAY_MS = 100
+
+# Heavy modules loaded in the background once the login screen is up
+PREWARM_MODULES = [
+    'utils.data_manager',
+    'utils.achievements',
+    'utils.score_calculator',
+    'modules.gui_dashboard',
+    'modules.gui_history',
+    'modules.gui_analytics',
+]
 
 
 class QuizApplication:
@@ -24,17 +50,64 @@ class QuizApplication:
         self.root.title("Quiz Application")
         self.current_user = None
         self.current_screen = None
+        self.startup_ms = None
+        self.screens = ScreenManager(self.root)
+        
+        # Single after() loop shared by quiz timers and animations
+        self.scheduler = TickScheduler(self.root)
+        self.session = None
+        self.expiry_id = None
+        self.timer_display_id = None
+        self.advance_id = None
         
         # Initialize data files
         file_handler.initialize_data_files()
         
         # Start with login screen
         self.show_login()
+        self.root.after_idle(self.on_first_paint)
+    
+    def on_first_paint(self):
+        """Record startup time, then pre-warm heavy modules off the UI thread"""
+        self.startup_ms = (time.perf_counter() - _PROCESS_START) * 1000
+        
+        heavy_loaded = [name for name in ('pandas', 'numpy', 'matplotlib') if name in sys.modules]
+        if config.REPORT_STARTUP or self.startup_ms > config.STARTUP_TARGET_MS:
+            print(f"Startup: login screen ready in {self.startup_ms:.0f} ms "
+                  f"(target {config.STARTUP_TARGET_MS} ms)"
+                  + (f", heavy modules loaded early: {', '.join(heavy_loaded)}" if heavy_loaded else ""))
+        
+        threading.Thread(target=self.prewarm_modules, daemon=True).start()
+    
+    def prewarm_modules(self):
+        """Import heavy modules in the background so the first screen after login is fast"""
+        for name in PREWARM_MODULES:
+            try:
+                importlib.import_module(name)
+            except Exception as e:
+                # The screen that needs it will import again and surface the error
+                print(f"Background import of {name} failed: {e}")
     
     def clear_screen(self):
-        """Clear all widgets from root"""
+        """Clear all widgets from root (cached screens are hidden, not destroyed)"""
+        # Leaving the quiz view stops its countdown, expiry and auto-advance
+        self.cancel_question_timer()
+        self.screens.hide_current()
         for widget in self.root.winfo_children():
-            widget.destroy()
+            if not self.screens.is_cached_frame(widget):
+                widget.destroy()
+    
+    def get_screen_version(self, include_settings=False):
+        """
+        Get the data version cached screens for the current user depend on
+        
+        Args:
+            include_settings: Also depend on user settings (e.g. the streak shown on the dashboard)
+        
+        Returns:
+            Tuple that changes whenever the underlying data changes
+        """
+        return screen_data.get_screen_version(self.current_user, include_settings)
     
     # ---------- Shared UI components ----------
     def add_top_nav(self, parent):
@@ -64,6 +137,8 @@ class QuizApplication:
     
     def show_dashboard(self):
         """Show main dashboard"""
+        from modules.gui_dashboard import DashboardScreen
+        
         self.clear_screen()
         callbacks = {
             'start_quiz': self.show_quiz_setup,
@@ -73,7 +148,9 @@ class QuizApplication:
             'profile': self.show_profile,
             'logout': self.logout
         }
-        self.current_screen = DashboardScreen(self.root, self.current_user, callbacks)
+        self.current_screen = self.screens.show(
+            ('dashboard', self.current_user), self.get_screen_version(include_settings=True),
+            lambda parent: DashboardScreen(self.root, self.current_user, callbacks, parent))
     
     def show_quiz_setup(self):
         """Show quiz setup screen with modern UI"""
@@ -121,7 +198,21 @@ class QuizApplication:
         difficulty_dropdown = ttk.Combobox(content, textvariable=difficulty_var, values=difficulties,
                                           state='readonly', font=('Segoe UI', 11), width=40)
         difficulty_dropdown.current(0)
-        difficulty_dropdown.pack(pady=(0, 20))
+        difficulty_dropdown.pack(pady=(0, 5))
+        
+        # Live count of available questions for the current selection
+        available_label = tk.Label(content, text="", font=('Segoe UI', 9),
+                                   bg='white', fg='#718096', anchor='w')
+        available_label.pack(fill=tk.X, pady=(0, 15))
+        
+        def update_available_count(event=None):
+            available = question_manager.count_questions(category_var.get(), difficulty_var.get())
+            available_label.config(text=f"{available} questions available",
+                                   fg='#718096' if available else '#ef4444')
+        
+        category_dropdown.bind('<<ComboboxSelected>>', update_available_count)
+        difficulty_dropdown.bind('<<ComboboxSelected>>', update_available_count)
+        update_available_count()
         
         # Mode with info button
         mode_header_frame = tk.Frame(content, bg='white')
@@ -222,356 +313,355 @@ class QuizApplication:
     
     def start_quiz(self, category, difficulty, mode, count):
         """Start the quiz"""
-        # Get questions
-        questions = question_manager.get_random_questions(category, difficulty, count)
+        # Pick questions and update the streak; the session reads the same clock as the scheduler
+        session = screen_data.start_quiz(self.current_user, category, difficulty, mode, count,
+                                         clock=self.scheduler.now)
         
-        if not questions:
+        if session is None:
             messagebox.showerror("Error", "No questions available for this selection")
             return
         
         # Show quiz screen
-        self.show_quiz_screen(questions, category, difficulty, mode)
+        self.show_quiz_screen(session)
     
-    def show_quiz_screen(self, questions, category, difficulty, mode):
-        """Display quiz interface"""
-        self.clear_screen()
-        
-        # Update streak when starting quiz
-        streak = achievements.update_streak(self.current_user)
-        
-        self.quiz_data = {
-            'questions': questions,
-            'current_index': 0,
-            'correct': 0,
-            'wrong': 0,
-            'answers': [],
-            'category': category,
-            'difficulty': difficulty,
-            'mode': mode,
-            'question_start_time': None,
-            'total_time': 0,
-            'time_bonuses': [],
-            'consecutive_correct': 0,
-            'timer_seconds': 15,
-            'timer_id': None,
-            'hints_remaining': 3,  # 3 hints per quiz
-            'hints_used': [],  # Track which questions used hints
-            'eliminated_options': []  # Track eliminated options for current question
-        }
-        
+    def show_quiz_screen(self, session):
+        """Display quiz interface for a QuizSession"""
+        # The session holds all quiz state; the GUI only renders it and owns the timers
+        self.cancel_question_timer()
+        self.session = session
+        
+        # Widgets are created once here and updated in place for every question
+        self.build_quiz_view()
         self.show_question()
     
-    def show_question(self):
-        """Display current question with modern UI"""
+    def build_quiz_view(self):
+        """Build the quiz view once per session; show_question only updates it"""
         self.clear_screen()
         
         # Main container with gradient-like effect
         main_container = tk.Frame(self.root, bg='#f5f7fa')
         main_container.pack(fill=tk.BOTH, expand=True)
+        self.quiz_container = main_container
         
         # Quick navigation bar
         self.add_top_nav(main_container)
         
         # Quiz card (centered modern card design)
-        quiz_frame = tk.Frame(main_container, bg='white', relief=tk.FLAT, bd=0, highlightthickness=2, highlightbackground='#e0e6ed')
-        quiz_frame.place(relx=0.5, rely=0.5, anchor='center', width=800, height=600)
-        
-        data = self.quiz_data
-        question = data['questions'][data['current_index']]
-        
-        # Reset timer for this question
-        data['timer_seconds'] = 15
-        data['question_start_time'] = time.time()
+        self.quiz_card = tk.Frame(main_container, bg='white', relief=tk.FLAT, bd=0, highlightthickness=2, highlightbackground='#e0e6ed')
         
         # Top bar with gradient background
-        top_bar = tk.Frame(quiz_frame, bg='#667eea', height=100)
+        top_bar = tk.Frame(self.quiz_card, bg='#667eea', height=100)
         top_bar.pack(fill=tk.X, side=tk.TOP)
         top_bar.pack_propagate(False)
         
         # Question counter and mode
-        mode_display = f" • {data['mode']} Mode" if data['mode'] != 'Practice' else ""
-        header = tk.Label(top_bar, text=f"Question {data['current_index'] + 1} of {len(data['questions'])}{mode_display}",
-                         font=('Segoe UI', 14, 'bold'), bg='#667eea', fg='white')
-        header.pack(pady=8)
+        self.quiz_header_label = tk.Label(top_bar, text="", font=('Segoe UI', 14, 'bold'), bg='#667eea', fg='white')
+        self.quiz_header_label.pack(pady=8)
         
         # Score display
-        score_text = f"✓ {data['correct']}  ✗ {data['wrong']}"
-        if data['mode'] == 'Survival':
-            lives = 3 - data['wrong']
-            score_text += f"  •  Lives: {'❤️' * lives}"
-        elif data['mode'] == 'Timed':
-            score_text += f"  •  Bonus: {sum(data['time_bonuses'])}"
-        
-        score_label = tk.Label(top_bar, text=score_text, font=('Segoe UI', 11), bg='#667eea', fg='#ffffff')
-        score_label.pack()
+        self.quiz_score_label = tk.Label(top_bar, text="", font=('Segoe UI', 11), bg='#667eea', fg='#ffffff')
+        self.quiz_score_label.pack()
         
         # Timer display (show only in Timed mode)
         self.timer_label = tk.Label(top_bar, text="", font=('Segoe UI', 16, 'bold'), bg='#667eea', fg='#ffd700')
         self.timer_label.pack(pady=3)
         
-        # Start countdown timer only for Timed mode
-        if data['mode'] == 'Timed':
-            self.timer_label.config(text=f"⏱ {data['timer_seconds']}")
-            self.update_question_timer()
-        else:
-            self.timer_label.config(text="")
-        
         # Content area
-        content_frame = tk.Frame(quiz_frame, bg='white')
+        content_frame = tk.Frame(self.quiz_card, bg='white')
         content_frame.pack(fill=tk.BOTH, expand=True, padx=40, pady=30)
         
         # Question text with modern styling
         q_frame = tk.Frame(content_frame, bg='#f8f9fa', relief=tk.FLAT, bd=0, highlightthickness=1, highlightbackground='#dee2e6')
         q_frame.pack(fill=tk.X, pady=(0, 25))
-        q_label = tk.Label(q_frame, text=question['question'], font=('Segoe UI', 13), bg='#f8f9fa', 
-                          wraplength=680, justify=tk.LEFT, fg='#2d3748')
-        q_label.pack(padx=25, pady=20)
+        self.question_label = tk.Label(q_frame, text="", font=('Segoe UI', 13), bg='#f8f9fa', 
+                                       wraplength=680, justify=tk.LEFT, fg='#2d3748')
+        self.question_label.pack(padx=25, pady=20)
         
         # Options with modern radio buttons and visual feedback
         self.selected_option = tk.IntVar(value=-1)
         options_frame = tk.Frame(content_frame, bg='white')
         options_frame.pack(fill=tk.BOTH, expand=True)
         
-        # Store option containers for highlighting
+        # Store option containers and buttons for highlighting
         self.option_containers = []
+        self.option_buttons = []
         
-        def on_option_select():
-            """Highlight selected option container"""
-            selected = self.selected_option.get()
-            for idx, container in enumerate(self.option_containers):
-                if idx == selected:
-                    # Highlight selected
-                    container.config(bg='#e0e7ff', highlightbackground='#667eea', highlightthickness=2)
-                    for child in container.winfo_children():
-                        child.config(bg='#e0e7ff')
-                else:
-                    # Reset others
-                    container.config(bg='#ffffff', highlightbackground='#e2e8f0', highlightthickness=1)
-                    for child in container.winfo_children():
-                        child.config(bg='#ffffff')
-        
-        for i, option in enumerate(question['options']):
+        for i in range(4):
             option_container = tk.Frame(options_frame, bg='#ffffff', relief=tk.FLAT, bd=0, 
                                        highlightthickness=1, highlightbackground='#e2e8f0')
             option_container.pack(fill=tk.X, pady=6)
             self.option_containers.append(option_container)
             
-            rb = tk.Radiobutton(option_container, text=f"{chr(65+i)}. {option}", variable=self.selected_option,
+            rb = tk.Radiobutton(option_container, text="", variable=self.selected_option,
                                value=i, font=('Segoe UI', 11, 'bold'), bg='#ffffff', anchor='w', 
                                activebackground='#e0e7ff', selectcolor='#667eea', fg='#2d3748',
-                               command=on_option_select, cursor='hand2')
+                               command=self.on_option_select, cursor='hand2')
             rb.pack(fill=tk.X, padx=15, pady=12)
+            self.option_buttons.append(rb)
         
         # Hint and Submit buttons container
         button_container = tk.Frame(content_frame, bg='white')
         button_container.pack(pady=15)
         
         # Hint button (50/50 lifeline)
-        data = self.quiz_data
-        if data['hints_remaining'] > 0:
-            hint_btn = tk.Button(button_container, text=f"💡 Hint ({data['hints_remaining']} left)", 
-                                font=('Segoe UI', 10, 'bold'),
-                                bg='#f59e0b', fg='white', relief=tk.FLAT, cursor='hand2',
-                                activebackground='#d97706', command=self.use_hint)
-            hint_btn.pack(side=tk.LEFT, padx=5, ipady=8, ipadx=15)
+        self.hint_button = tk.Button(button_container, text="", font=('Segoe UI', 10, 'bold'),
+                                     bg='#f59e0b', fg='white', relief=tk.FLAT, cursor='hand2',
+                                     activebackground='#d97706', command=self.use_hint)
+        self.hint_button.pack(side=tk.LEFT, padx=5, ipady=8, ipadx=15)
         
         # Submit button with modern styling
         submit_btn = tk.Button(button_container, text="Submit Answer →", font=('Segoe UI', 12, 'bold'), 
                               bg='#667eea', fg='white', relief=tk.FLAT, cursor='hand2',
                               activebackground='#5568d3', command=self.submit_answer)
         submit_btn.pack(side=tk.LEFT, padx=5, ipady=8, ipadx=20)
+        
+        self.build_feedback_card(main_container)
+        self.build_brief_feedback_overlay(main_container)
     
-    def _update_hint_button_recursive(self, widget):
-        """Recursively find and update hint button"""
-        try:
-            if isinstance(widget, tk.Button) and '💡 Hint' in widget['text']:
-                data = self.quiz_data
-                if data['hints_remaining'] > 0:
-                    widget.config(text=f"💡 Hint ({data['hints_remaining']} left)")
-                else:
-                    widget.config(state='disabled', bg='#d1d5db')
-                return
-            for child in widget.winfo_children():
-                self._update_hint_button_recursive(child)
-        except:
-            pass
+    def build_feedback_card(self, parent):
+        """Build the Practice mode feedback card (hidden until an answer is submitted)"""
+        self.feedback_card = tk.Frame(parent, bg='white', relief=tk.FLAT, bd=0,
+                                      highlightthickness=1, highlightbackground='#e2e8f0')
+        
+        # Result header
+        self.feedback_result_label = tk.Label(self.feedback_card, text="", font=('Segoe UI', 36, 'bold'),
+                                              fg='#10b981', bg='white')
+        self.feedback_result_label.pack(pady=(40, 20))
+        
+        # Correct answer
+        self.feedback_correct_label = tk.Label(self.feedback_card, text="",
+                                               font=('Segoe UI', 14), bg='white', fg='#2d3748')
+        self.feedback_correct_label.pack(pady=10)
+        
+        # Explanation
+        exp_frame = tk.Frame(self.feedback_card, bg='#f8f9fa', relief=tk.FLAT, bd=0,
+                            highlightthickness=1, highlightbackground='#dee2e6')
+        exp_frame.pack(fill=tk.BOTH, expand=True, padx=40, pady=20)
+        
+        self.feedback_explanation_label = tk.Label(exp_frame, text="",
+                                                   font=('Segoe UI', 11), bg='#f8f9fa', fg='#4a5568',
+                                                   wraplength=600, justify=tk.LEFT)
+        self.feedback_explanation_label.pack(padx=25, pady=20)
+        
+        # Buttons
+        btn_container = tk.Frame(self.feedback_card, bg='white')
+        btn_container.pack(fill=tk.X, padx=40, pady=(0, 30))
+        
+        next_btn = tk.Button(btn_container, text="Next Question →", font=('Segoe UI', 12, 'bold'),
+                            bg='#667eea', fg='white', relief=tk.FLAT, bd=0, cursor='hand2',
+                            activebackground='#5568d3', command=self.next_question)
+        next_btn.pack(fill=tk.X, pady=(0, 8), ipady=12)
+        
+        back_btn = tk.Button(btn_container, text="← Back to Dashboard", font=('Segoe UI', 10),
+                            bg='#f7fafc', fg='#667eea', relief=tk.FLAT, bd=0, cursor='hand2',
+                            activebackground='#edf2f7', command=self.show_dashboard)
+        back_btn.pack(fill=tk.X, ipady=10)
     
-    def use_hint(self):
-        """Use 50/50 hint - eliminate 2 wrong answers"""
-        data = self.quiz_data
+    def build_brief_feedback_overlay(self, parent):
+        """Build the full-screen overlay used by Timed/Survival feedback and time-outs"""
+        self.brief_feedback_frame = tk.Frame(parent, bg='#f5f7fa')
+        
+        self.brief_result_label = tk.Label(self.brief_feedback_frame, text="", font=('Segoe UI', 32, 'bold'), 
+                                           fg='#27ae60', bg='#f5f7fa')
+        self.brief_result_label.pack(pady=60)
+        
+        # Packed only when needed, in this order, after the result label
+        self.brief_correct_label = tk.Label(self.brief_feedback_frame, text="",
+                                            font=('Segoe UI', 16), bg='#f5f7fa', fg='#2d3748')
+        self.brief_bonus_label = tk.Label(self.brief_feedback_frame, text="",
+                                          font=('Segoe UI', 14, 'bold'), bg='#f5f7fa', fg='#f39c12')
+    
+    def quiz_view_exists(self):
+        """Check whether the quiz view is still on screen (navigation destroys it)"""
+        return getattr(self, 'quiz_card', None) is not None and self.quiz_card.winfo_exists()
+    
+    def show_question(self):
+        """Display current question by updating the quiz view in place"""
+        if not self.quiz_view_exists():
+            self.build_quiz_view()
         
-        if data['hints_remaining'] <= 0:
-            messagebox.showwarning("No Hints", "You've used all your hints!")
-            return
+        session = self.session
         
-        question = data['questions'][data['current_index']]
-        correct_answer = question['correct']
+        # Hide any feedback from the previous question
+        self.feedback_card.place_forget()
+        self.brief_feedback_frame.place_forget()
+        self.quiz_card.place(relx=0.5, rely=0.5, anchor='center', width=800, height=600)
+        
+        # Reset timer for this question
+        self.cancel_question_timer()
+        question = session.start_question()
         
-        # Get wrong answer indices
-        wrong_indices = [i for i in range(4) if i != correct_answer]
+        # Question counter and mode
+        mode_display = f" • {session.mode} Mode" if session.mode != 'Practice' else ""
+        self.quiz_header_label.config(text=f"Question {session.current_index + 1} of {session.total_questions}{mode_display}")
         
-        # Randomly eliminate 2 wrong answers
-        import random
-        to_eliminate = random.sample(wrong_indices, min(2, len(wrong_indices)))
+        # Score display
+        score_text = f"✓ {session.correct}  ✗ {session.wrong}"
+        if session.mode == 'Survival':
+            score_text += f"  •  Lives: {'❤️' * session.lives_remaining}"
+        elif session.is_timed:
+            score_text += f"  •  Bonus: {sum(session.time_bonuses)}"
+        self.quiz_score_label.config(text=score_text)
+        
+        self.question_label.config(text=question['question'])
+        
+        # Reset options; hide unused slots if a question has fewer than four
+        self.selected_option.set(-1)
+        for i, (container, rb) in enumerate(zip(self.option_containers, self.option_buttons)):
+            if i < len(question['options']):
+                container.config(bg='#ffffff', highlightbackground='#e2e8f0', highlightthickness=1)
+                rb.config(text=f"{chr(65+i)}. {question['options'][i]}", bg='#ffffff', fg='#2d3748', state='normal')
+                container.pack(fill=tk.X, pady=6)
+            else:
+                container.pack_forget()
         
-        # Store eliminated options
-        data['eliminated_options'] = to_eliminate
-        data['hints_remaining'] -= 1
+        self.update_hint_button()
+        
+        # Start countdown timer only for Timed mode
+        if session.is_timed:
+            # Bound to this session, so a callback that outlives it does nothing
+            self.expiry_id = self.scheduler.call_at(session.deadline, lambda: self.time_expired(session))
+            self.timer_display_id = self.scheduler.call_every(TIMER_DISPLAY_MS,
+                                                              lambda: self.update_question_timer(session))
+        else:
+            self.timer_label.config(text="")
+    
+    def on_option_select(self):
+        """Highlight selected option container"""
+        selected = self.selected_option.get()
+        for idx, (container, rb) in enumerate(zip(self.option_containers, self.option_buttons)):
+            if idx in self.session.eliminated_options:
+                continue
+            if idx == selected:
+                # Highlight selected
+                container.config(bg='#e0e7ff', highlightbackground='#667eea', highlightthickness=2)
+                rb.config(bg='#e0e7ff')
+            else:
+                # Reset others
+                container.config(bg='#ffffff', highlightbackground='#e2e8f0', highlightthickness=1)
+                rb.config(bg='#ffffff')
+    
+    def update_hint_button(self):
+        """Update the hint button for the remaining hint count"""
+        remaining = self.session.hints_remaining
+        if remaining > 0:
+            self.hint_button.config(text=f"💡 Hint ({remaining} left)", state='normal', bg='#f59e0b')
+        elif self.session.eliminated_options:
+            # Last hint was used on this question: keep the button, greyed out
+            self.hint_button.config(text="💡 Hint (0 left)", state='disabled', bg='#d1d5db')
+        else:
+            # No hints left for later questions
+            self.hint_button.pack_forget()
+    
+    def use_hint(self):
+        """Use 50/50 hint - eliminate 2 wrong answers"""
+        if self.session.hints_remaining <= 0:
+            messagebox.showwarning("No Hints", "You've used all your hints!")
+            return
+        
+        # The session picks 2 wrong answers to eliminate
+        to_eliminate = self.session.use_hint()
+        if not to_eliminate:
+            return
         
         # Play sound
         sound_effects.sound_manager.play_achievement()
         
         # Disable eliminated option buttons
         for idx in to_eliminate:
-            container = self.option_containers[idx]
             # Grey out the container
-            container.config(bg='#e5e7eb')
-            for child in container.winfo_children():
-                child.config(bg='#e5e7eb', fg='#9ca3af', state='disabled')
+            self.option_containers[idx].config(bg='#e5e7eb', highlightbackground='#e2e8f0', highlightthickness=1)
+            self.option_buttons[idx].config(bg='#e5e7eb', fg='#9ca3af', state='disabled')
+            if self.selected_option.get() == idx:
+                self.selected_option.set(-1)
         
         # Update hint button text instead of refreshing entire question
-        for widget in self.root.winfo_children():
-            self._update_hint_button_recursive(widget)
+        self.update_hint_button()
     
-    def update_timer(self):
-        """Update timer display for Timed mode"""
-        if not hasattr(self, 'timer_label') or not self.timer_label.winfo_exists():
-            return
-        
-        data = self.quiz_data
-        if data['question_start_time']:
-            elapsed = int(time.time() - data['question_start_time'])
-            self.timer_label.config(text=f"Time: {elapsed}s")
-            # Schedule next update
-            self.root.after(100, self.update_timer)
+    def cancel_question_timer(self):
+        """Stop the current question's countdown, expiry and pending auto-advance"""
+        self.scheduler.cancel(self.expiry_id)
+        self.scheduler.cancel(self.timer_display_id)
+        self.scheduler.cancel(self.advance_id)
+        self.expiry_id = None
+        self.timer_display_id = None
+        self.advance_id = None
     
-    def update_question_timer(self):
-        """Update 15-second countdown timer for each question"""
-        if not hasattr(self, 'timer_label') or not self.timer_label.winfo_exists():
-            return
-        
-        # Ensure timer is only active in Timed mode
-        if self.quiz_data.get('mode') != 'Timed':
-            return
-        
-        data = self.quiz_data
-        
-        if data['timer_seconds'] > 0:
-            # Update display
-            self.timer_label.config(text=f"⏱ {data['timer_seconds']}")
-            
-            # Change color based on remaining time
-            if data['timer_seconds'] <= 5:
-                self.timer_label.config(fg='#ff4444')  # Red for last 5 seconds
-            elif data['timer_seconds'] <= 10:
-                self.timer_label.config(fg='#ff9800')  # Orange for 6-10 seconds
-            else:
-                self.timer_label.config(fg='#ffd700')  # Gold for 11-15 seconds
-            
-            # Decrement and schedule next update
-            data['timer_seconds'] -= 1
-            data['timer_id'] = self.root.after(1000, self.update_question_timer)
+    def update_question_timer(self, session):
+        """Show the seconds left before the question's deadline"""
+        if session is not self.session or not self.timer_label.winfo_exists():
+            return False
+        
+        remaining = math.ceil(session.time_remaining())
+        
+        # Change color based on remaining time
+        if remaining == 0:
+            color = '#ff0000'
+        elif remaining <= 5:
+            color = '#ff4444'  # Red for last 5 seconds
+        elif remaining <= 10:
+            color = '#ff9800'  # Orange for 6-10 seconds
         else:
-            # Time's up! Auto-submit as wrong answer
-            self.timer_label.config(text="⏱ 0", fg='#ff0000')
-            self.time_expired()
+            color = '#ffd700'  # Gold for 11-15 seconds
+        
+        text = f"⏱ {remaining}"
+        if self.timer_label.cget('text') != text:
+            self.timer_label.config(text=text, fg=color)
     
-    def time_expired(self):
+    def time_expired(self, session):
         """Handle timer expiration - mark as unanswered and move to next question"""
-        # Cancel any pending timer
-        if self.quiz_data.get('timer_id'):
-            self.root.after_cancel(self.quiz_data['timer_id'])
-        
-        data = self.quiz_data
-        question = data['questions'][data['current_index']]
-        
-        # Calculate time taken (full 15 seconds)
-        time_taken = 15.0
-        data['total_time'] += time_taken
+        if session is not self.session or not session.question_open or not self.quiz_view_exists():
+            return
+        self.cancel_question_timer()
+        self.timer_label.config(text="⏱ 0", fg='#ff0000')
         
-        # Mark as wrong (unanswered)
-        data['wrong'] += 1
-        data['consecutive_correct'] = 0
+        # Counts as wrong, with the full time limit taken
+        outcome = self.session.expire()
         
         # Check Survival mode game over
-        if data['mode'] == 'Survival' and data['wrong'] >= 3:
+        if outcome['game_over']:
             self.show_results()
             return
         
-        # Store answer as unanswered
-        data['answers'].append({
-            'question': question,
-            'selected': -1,  # -1 indicates no answer (time expired)
-            'correct': False,
-            'time_taken': time_taken
-        })
-        
         # Show brief feedback that time expired
-        self.show_time_expired_feedback(question)
+        self.show_time_expired_feedback(outcome['question'])
     
     def submit_answer(self):
         """Process submitted answer"""
-        # Cancel timer
-        if self.quiz_data.get('timer_id'):
-            self.root.after_cancel(self.quiz_data['timer_id'])
+        session = self.session
+        if not session.question_open:
+            return
         
         selected = self.selected_option.get()
         
         if selected == -1:
+            # The countdown keeps running behind the dialog
             messagebox.showwarning("Warning", "Please select an answer")
-            # Restart timer after warning
-            self.update_question_timer()
             return
         
-        data = self.quiz_data
-        question = data['questions'][data['current_index']]
-        correct_ans = question['correct']
-        
-        # Calculate time taken
-        time_taken = 0
-        if data['question_start_time']:
-            time_taken = time.time() - data['question_start_time']
-            data['total_time'] += time_taken
-        
-        # Check if correct
-        is_correct = (selected == correct_ans)
+        # The session times the answer on the scheduler's monotonic clock and
+        # applies the scoring rules (time bonus, streak, Survival lives)
+        self.cancel_question_timer()
+        outcome = session.answer(selected)
+        is_correct = outcome['correct']
+        question = outcome['question']
         
         if is_correct:
-            data['correct'] += 1
-            data['consecutive_correct'] += 1
-            
             # Play correct sound
             sound_effects.sound_manager.play_correct()
-            
-            # Calculate time bonus for Timed mode
-            if data['mode'] == 'Timed':
-                bonus = score_calculator.calculate_time_bonus(time_taken)
-                data['time_bonuses'].append(bonus)
-                if bonus > 0:
-                    sound_effects.sound_manager.play_streak()  # Bonus sound
+            if outcome['time_bonus'] > 0:
+                sound_effects.sound_manager.play_streak()  # Bonus sound
         else:
-            data['wrong'] += 1
-            data['consecutive_correct'] = 0
-            
             # Play wrong sound
             sound_effects.sound_manager.play_wrong()
-            
-            # Check Survival mode game over
-            if data['mode'] == 'Survival' and data['wrong'] >= 3:
-                # Game over - show results immediately
-                self.show_results()
-                return
-        
-        # Store answer
-        data['answers'].append({
-            'question': question,
-            'selected': selected,
-            'correct': is_correct,
-            'time_taken': time_taken
-        })
+        
+        # Survival mode game over - show results immediately
+        if outcome['game_over']:
+            self.show_results()
+            return
         
         # Show feedback (or skip for Timed/Survival to keep pace)
-        if data['mode'] == 'Practice':
+        if session.mode == 'Practice':
             self.show_feedback(is_correct, question)
         else:
             # For Timed/Survival, show brief feedback then move on
@@ -579,86 +669,61 @@ class QuizApplication:
     
     def show_feedback(self, is_correct, question):
         """Show answer feedback for Practice mode"""
-        self.clear_screen()
-        
-        main_container = tk.Frame(self.root, bg='#f5f7fa')
-        main_container.pack(fill=tk.BOTH, expand=True)
-        
-        # Quick navigation bar
-        self.add_top_nav(main_container)
-        
-        feedback_card = tk.Frame(main_container, bg='white', relief=tk.FLAT, bd=0,
-                                highlightthickness=1, highlightbackground='#e2e8f0')
-        feedback_card.place(relx=0.5, rely=0.5, anchor='center', width=700, height=500)
-        
         # Result header
         if is_correct:
-            result_text = "✓ Correct!"
-            color = '#10b981'
+            self.feedback_result_label.config(text="✓ Correct!", fg='#10b981')
         else:
-            result_text = "✗ Incorrect"
-            color = '#ef4444'
-        
-        result_label = tk.Label(feedback_card, text=result_text, font=('Segoe UI', 36, 'bold'),
-                               fg=color, bg='white')
-        result_label.pack(pady=(40, 20))
-        
-        # Correct answer
-        correct_label = tk.Label(feedback_card, text=f"Correct Answer: {question['options'][question['correct']]}",
-                                font=('Segoe UI', 14), bg='white', fg='#2d3748')
-        correct_label.pack(pady=10)
-        
-        # Explanation
-        exp_frame = tk.Frame(feedback_card, bg='#f8f9fa', relief=tk.FLAT, bd=0,
-                            highlightthickness=1, highlightbackground='#dee2e6')
-        exp_frame.pack(fill=tk.BOTH, expand=True, padx=40, pady=20)
-        
-        exp_label = tk.Label(exp_frame, text=f"Explanation:\n{question['explanation']}",
-                            font=('Segoe UI', 11), bg='#f8f9fa', fg='#4a5568',
-                            wraplength=600, justify=tk.LEFT)
-        exp_label.pack(padx=25, pady=20)
+            self.feedback_result_label.config(text="✗ Incorrect", fg='#ef4444')
         
-        # Buttons
-        btn_container = tk.Frame(feedback_card, bg='white')
-        btn_container.pack(fill=tk.X, padx=40, pady=(0, 30))
-        
-        next_btn = tk.Button(btn_container, text="Next Question →", font=('Segoe UI', 12, 'bold'),
-                            bg='#667eea', fg='white', relief=tk.FLAT, bd=0, cursor='hand2',
-                            activebackground='#5568d3', command=self.next_question)
-        next_btn.pack(fill=tk.X, pady=(0, 8), ipady=12)
+        self.feedback_correct_label.config(text=f"Correct Answer: {question['options'][question['correct']]}")
+        self.feedback_explanation_label.config(text=f"Explanation:\n{question['explanation']}")
         
-        back_btn = tk.Button(btn_container, text="← Back to Dashboard", font=('Segoe UI', 10),
-                            bg='#f7fafc', fg='#667eea', relief=tk.FLAT, bd=0, cursor='hand2',
-                            activebackground='#edf2f7', command=self.show_dashboard)
-        back_btn.pack(fill=tk.X, ipady=10)
+        self.quiz_card.place_forget()
+        self.feedback_card.place(relx=0.5, rely=0.5, anchor='center', width=700, height=500)
+    
+    def show_brief_overlay(self, result_text, font_size, color, correct_text=None, bonus=None):
+        """
+        Show the brief feedback overlay, then advance after 1.5 seconds
+        
+        Args:
+            result_text: Headline text
+            font_size: Headline font size
+            color: Headline colour
+            correct_text: Correct answer line, or None to hide it
+            bonus: (text, colour) for the bonus line, or None to hide it
+        """
+        self.brief_result_label.config(text=result_text, fg=color, font=('Segoe UI', font_size, 'bold'))
+        
+        self.brief_correct_label.pack_forget()
+        self.brief_bonus_label.pack_forget()
+        if correct_text:
+            self.brief_correct_label.config(text=correct_text)
+            self.brief_correct_label.pack(pady=20)
+        if bonus:
+            self.brief_bonus_label.config(text=bonus[0], fg=bonus[1])
+            self.brief_bonus_label.pack(pady=10)
+        
+        self.quiz_card.place_forget()
+        self.brief_feedback_frame.place(relx=0, rely=0, relwidth=1, relheight=1)
+        self.brief_feedback_frame.lift()
+        
+        # Auto-advance after 1.5 seconds (bound to this session, like the question timers)
+        session = self.session
+        self.advance_id = self.scheduler.call_later(1.5, lambda: self.auto_advance(session))
+    
+    def auto_advance(self, session):
+        """Advance from brief feedback unless the user has left the quiz"""
+        self.advance_id = None
+        if session is self.session and self.quiz_view_exists():
+            self.next_question()
     
     def show_time_expired_feedback(self, question):
         """Show feedback when time expires"""
-        self.clear_screen()
-        
-        feedback_frame = tk.Frame(self.root, bg='#f5f7fa')
-        feedback_frame.pack(fill=tk.BOTH, expand=True, padx=40, pady=40)
-        
-        # Time expired message
-        result_label = tk.Label(feedback_frame, text="⏱ Time's Up!", font=('Segoe UI', 36, 'bold'), 
-                               fg='#e74c3c', bg='#f5f7fa')
-        result_label.pack(pady=60)
-        
-        # Show correct answer
-        correct_label = tk.Label(feedback_frame, text=f"Correct Answer: {question['options'][question['correct']]}",
-                                font=('Segoe UI', 16), bg='#f5f7fa', fg='#2d3748')
-        correct_label.pack(pady=20)
-        
-        # Auto-advance after 1.5 seconds
-        self.root.after(1500, self.next_question)
+        self.show_brief_overlay("⏱ Time's Up!", 36, '#e74c3c',
+                                correct_text=f"Correct Answer: {question['options'][question['correct']]}")
     
     def show_brief_feedback(self, is_correct, question):
         """Show brief feedback for Timed/Survival modes"""
-        self.clear_screen()
-        
-        feedback_frame = tk.Frame(self.root, bg='#f5f7fa')
-        feedback_frame.pack(fill=tk.BOTH, expand=True, padx=40, pady=40)
-        
         # Result
         if is_correct:
             result_text = "✓ Correct!"
@@ -667,77 +732,44 @@ class QuizApplication:
             result_text = "✗ Incorrect"
             color = '#e74c3c'
         
-        result_label = tk.Label(feedback_frame, text=result_text, font=('Segoe UI', 32, 'bold'), 
-                               fg=color, bg='#f5f7fa')
-        result_label.pack(pady=60)
-        
         # Show correct answer if wrong
+        correct_text = None
         if not is_correct:
-            correct_label = tk.Label(feedback_frame, text=f"Correct Answer: {question['options'][question['correct']]}",
-                                    font=('Segoe UI', 16), bg='#f5f7fa', fg='#2d3748')
-            correct_label.pack(pady=20)
+            correct_text = f"Correct Answer: {question['options'][question['correct']]}"
         
         # Mode-specific messages
-        data = self.quiz_data
-        if data['mode'] == 'Survival' and data['consecutive_correct'] >= 5:
-            bonus_label = tk.Label(feedback_frame, text="🔥 5+ Streak! 1.5x Multiplier Active!",
-                                  font=('Segoe UI', 14, 'bold'), bg='#f5f7fa', fg='#f39c12')
-            bonus_label.pack(pady=10)
-        elif data['mode'] == 'Timed' and len(data['time_bonuses']) > 0 and data['time_bonuses'][-1] > 0:
-            bonus_label = tk.Label(feedback_frame, text=f"⚡ Time Bonus: +{data['time_bonuses'][-1]} points!",
-                                  font=('Segoe UI', 14, 'bold'), bg='#f5f7fa', fg='#3498db')
-            bonus_label.pack(pady=10)
-        
-        # Auto-advance after 1.5 seconds
-        self.root.after(1500, self.next_question)
+        session = self.session
+        bonus = None
+        if session.streak_bonus_active:
+            bonus = ("🔥 5+ Streak! 1.5x Multiplier Active!", '#f39c12')
+        elif session.is_timed and session.last_time_bonus > 0:
+            bonus = (f"⚡ Time Bonus: +{session.last_time_bonus} points!", '#3498db')
+        
+        self.show_brief_overlay(result_text, 32, color, correct_text, bonus)
     
     def next_question(self):
         """Move to next question or show results"""
-        data = self.quiz_data
-        data['current_index'] += 1
-        
-        if data['current_index'] < len(data['questions']):
+        if self.session.advance():
             self.show_question()
         else:
             self.show_results()
     
     def show_results(self):
         """Display quiz results"""
-        self.clear_screen()
-        
-        data = self.quiz_data
-        total = len(data['questions'])
-        correct = data['correct']
-        wrong = data['wrong']
-        
-        # Calculate score using NumPy based on mode
-        percentage = score_calculator.calculate_percentage(correct, total)
-        
-        if data['mode'] == 'Timed':
-            # Add time bonuses
-            base_score = score_calculator.calculate_base_score(correct, data['difficulty'])
-            time_bonus = sum(data['time_bonuses'])
-            score = base_score + time_bonus
-        elif data['mode'] == 'Survival':
-            # Apply combo multiplier if applicable
-            score = score_calculator.calculate_base_score(correct, data['difficulty'])
-            if correct >= 5:
-                score = int(score * 1.5)
-        else:
-            # Practice mode - base scoring
-            score = score_calculator.calculate_base_score(correct, data['difficulty'])
-        
-        grade_info = score_calculator.get_grade_info(percentage)
-        
-        # Save to database
-        time_taken = int(data['total_time'])
-        data_manager.add_quiz_attempt(
-            self.current_user, data['category'], data['difficulty'], total,
-            correct, wrong, score, percentage, time_taken, data['mode']
-        )
+        from utils import confetti
         
-        # Check for new achievements
-        new_achievements = achievements.check_and_unlock_achievements(self.current_user)
+        self.clear_screen()
+        self.cancel_question_timer()
+        
+        # Score the session, save it to the database and check for new achievements
+        session = self.session
+        results, new_achievements = screen_data.finish_quiz(self.current_user, session)
+        total = results['total']
+        correct = results['correct']
+        wrong = results['wrong']
+        score = results['score']
+        percentage = results['percentage']
+        grade_info = results['grade_info']
         
         # Play sound effects
         if percentage == 100:
@@ -750,7 +782,7 @@ class QuizApplication:
         
         # Show confetti for perfect score
         if percentage == 100:
-            confetti.show_confetti(main_container, duration=3000)
+            confetti.show_confetti(main_container, duration=3000, scheduler=self.scheduler)
         
         # Results card - directly in main container, centered
         results_card = tk.Frame(main_container, bg='white', relief=tk.FLAT, bd=0,
@@ -805,12 +837,12 @@ class QuizApplication:
             label_text.pack(pady=(0, 8))
         
         # Mode-specific bonus info
-        if data['mode'] == 'Timed' and sum(data['time_bonuses']) > 0:
+        if session.is_timed and results['time_bonus'] > 0:
             bonus_label = tk.Label(results_card,
-                                  text=f"⚡ Time Bonus: +{sum(data['time_bonuses'])} points | Total Time: {int(data['total_time'])}s",
+                                  text=f"⚡ Time Bonus: +{results['time_bonus']} points | Total Time: {results['time_taken']}s",
                                   font=('Segoe UI', 10), bg='white', fg='#667eea')
             bonus_label.pack(pady=8)
-        elif data['mode'] == 'Survival' and correct >= 5:
+        elif session.mode == 'Survival' and correct >= 5:
             bonus_label = tk.Label(results_card, text="🔥 1.5x Multiplier Applied!",
                                   font=('Segoe UI', 10, 'bold'), bg='white', fg='#f59e0b')
             bonus_label.pack(pady=8)
@@ -855,7 +887,9 @@ class QuizApplication:
         try:
             from modules import gui_analytics
             self.clear_screen()
-            gui_analytics.AnalyticsScreen(self.root, self.current_user, self.show_dashboard)
+            self.current_screen = self.screens.show(
+                ('analytics', self.current_user), self.get_screen_version(),
+                lambda parent: gui_analytics.AnalyticsScreen(self.root, self.current_user, self.show_dashboard, parent))
         except ImportError:
             # Fallback if matplotlib module not available
             messagebox.showinfo("Analytics", "Analytics feature requires additional setup")
@@ -866,7 +900,9 @@ class QuizApplication:
         try:
             from modules import gui_history
             self.clear_screen()
-            gui_history.HistoryScreen(self.root, self.current_user, self.show_dashboard)
+            self.current_screen = self.screens.show(
+                ('history', self.current_user), self.get_screen_version(),
+                lambda parent: gui_history.HistoryScreen(self.root, self.current_user, self.show_dashboard, parent))
         except ImportError:
             messagebox.showinfo("History", f"Quiz history for {self.current_user}")
             self.show_dashboard()
@@ -894,10 +930,9 @@ class QuizApplication:
         content = tk.Frame(main_container, bg='#f5f7fa')
         content.pack(fill=tk.BOTH, expand=True, padx=40, pady=30)
         
-        # Get top scores
-        top_scores = data_manager.get_top_scores(10)
-        # Reset index for proper ranking
-        top_scores = top_scores.reset_index(drop=True)
+        # Get top scores straight from the persisted leaderboard (O(K))
+        from utils import leaderboard
+        top_scores = leaderboard.get_top_entries(10)
         
         # Create modern table card
         table_card = tk.Frame(content, bg='white', relief=tk.FLAT, bd=0,
@@ -949,8 +984,7 @@ class QuizApplication:
         tree.column('Date', width=120, anchor='center')
         
         # Add data rows
-        for idx, row in top_scores.iterrows():
-            row_num = idx + 1
+        for row_num, row in enumerate(top_scores, start=1):
             
             # Medal for top 3 or regular rank
             rank_text = {1: '🥇', 2: '🥈', 3: '🥉'}.get(row_num, str(row_num))
@@ -982,6 +1016,8 @@ class QuizApplication:
     
     def show_profile(self):
         """Show user profile with modern UI"""
+        from utils import data_manager, achievements
+        
         self.clear_screen()
         
         main_container = tk.Frame(self.root, bg='#f5f7fa')
@@ -1133,6 +1169,7 @@ class QuizApplication:
         """Logout user"""
         if messagebox.askyesno("Logout", "Are you sure you want to logout?"):
             self.current_user = None
+            self.screens.invalidate()
             self.show_login()
     
     def run(self):
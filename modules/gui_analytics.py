@@ -1,21 +1,38 @@
 """
 Analytics GUI Module
 Displays performance analytics with matplotlib graphs
+Charts are rendered to PNG in a background thread (utils.chart_renderer) and
+cached on disk, so the screen shows placeholders instead of freezing
 """
 
 import tkinter as tk
 from tkinter import ttk
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
-from utils import data_manager, score_calculator
+import base64
+import queue
+from utils import chart_renderer, screen_data
+
+
+# Chart id -> title shown above it
+CHART_TITLES = {
+    'trend': "Performance Trend Over Time",
+    'category': "Average Performance by Category",
+    'difficulty': "Accuracy by Difficulty Level",
+    'pie': "Overall Correct vs Incorrect Distribution"
+}
 
 
 class AnalyticsScreen:
-    def __init__(self, root, username, back_callback):
+    def __init__(self, root, username, back_callback, parent=None):
         self.root = root
+        # Frame to build into (the screen manager passes a cached frame)
+        self.parent = parent if parent is not None else root
         self.username = username
         self.back_callback = back_callback
+        
+        # Chart id -> placeholder/image label, and the PhotoImages they display
+        self.chart_labels = {}
+        self.chart_images = {}
+        self.chart_results = queue.Queue()
         self.root.title(f"Analytics - {username}")
         
         # Set window size
@@ -25,8 +42,9 @@ class AnalyticsScreen:
     
     def create_widgets(self):
         # Main frame with modern bg
-        main_frame = tk.Frame(self.root, bg='#f5f7fa')
+        main_frame = tk.Frame(self.parent, bg='#f5f7fa')
         main_frame.pack(fill=tk.BOTH, expand=True)
+        self.main_frame = main_frame
         
         # Quick nav bar
         try:
@@ -95,9 +113,9 @@ class AnalyticsScreen:
         content_container.configure(width=900)
         
         # Get user data
-        user_history = data_manager.get_user_history(self.username)
+        analytics_data = screen_data.load_analytics(self.username)
         
-        if user_history.empty:
+        if analytics_data['history'].empty:
             no_data_label = tk.Label(
                 content_container,
                 text="No quiz history available yet.\nTake some quizzes to see analytics!",
@@ -108,13 +126,12 @@ class AnalyticsScreen:
             no_data_label.pack(pady=100)
         else:
             # Statistics panel
-            self.create_stats_panel(content_container, user_history)
+            self.create_stats_panel(content_container, analytics_data)
             
             # Graphs
-            self.create_performance_trend_graph(content_container, user_history)
-            self.create_category_performance_graph(content_container, user_history)
-            self.create_difficulty_accuracy_graph(content_container, user_history)
-            self.create_correct_incorrect_pie(content_container, user_history)
+            for chart_id, title in CHART_TITLES.items():
+                self.create_chart_frame(content_container, chart_id, title)
+            self.load_charts(analytics_data)
         
         # Modern back button
         btn_container = tk.Frame(main_frame, bg='#f5f7fa')
@@ -134,7 +151,7 @@ class AnalyticsScreen:
         )
         back_btn.pack(fill=tk.X, ipady=12)
     
-    def create_stats_panel(self, parent, df):
+    def create_stats_panel(self, parent, analytics_data):
         """Create statistics summary panel"""
         stats_frame = tk.Frame(parent, bg='white', relief=tk.RAISED, bd=2)
         stats_frame.pack(fill=tk.X, padx=20, pady=10)
@@ -147,16 +164,15 @@ class AnalyticsScreen:
         )
         title.pack(pady=10)
         
-        # Calculate statistics using NumPy through score_calculator
-        percentages = df['percentage'].tolist()
-        stats = score_calculator.calculate_statistics(percentages)
-        improvement = score_calculator.calculate_improvement_rate(percentages)
+        # Statistics computed with NumPy through score_calculator
+        stats = analytics_data['statistics']
+        improvement = analytics_data['improvement']
         
         stats_grid = tk.Frame(stats_frame, bg='white')
         stats_grid.pack(pady=10, padx=20, fill=tk.BOTH, expand=True)
         
         stat_items = [
-            ("Total Attempts", len(df)),
+            ("Total Attempts", len(analytics_data['history'])),
             ("Mean Score", f"{stats['mean']:.2f}%"),
             ("Median Score", f"{stats['median']:.2f}%"),
             ("Std Deviation", f"{stats['std_dev']:.2f}"),
@@ -184,151 +200,67 @@ class AnalyticsScreen:
         for i in range(4):
             stats_grid.grid_columnconfigure(i, weight=1, uniform='stat', minsize=150)
     
-    def create_performance_trend_graph(self, parent, df):
-        """Create line graph showing score trends over time"""
+    def create_chart_frame(self, parent, chart_id, title):
+        """Create a titled chart frame with a placeholder until the image is ready"""
         graph_frame = tk.Frame(parent, bg='white', relief=tk.RAISED, bd=2)
         graph_frame.pack(fill=tk.BOTH, padx=20, pady=10)
         
-        title = tk.Label(
+        title_label = tk.Label(
             graph_frame,
-            text="Performance Trend Over Time",
+            text=title,
             font=('Arial', 14, 'bold'),
             bg='white'
         )
-        title.pack(pady=10)
-        
-        # Create matplotlib figure
-        fig = Figure(figsize=(8, 4), dpi=100)
-        ax = fig.add_subplot(111)
-        
-        # Sort by date
-        df_sorted = df.sort_values(['date', 'time'])
-        attempts = list(range(1, len(df_sorted) + 1))
-        percentages = df_sorted['percentage'].tolist()
-        
-        # Plot data
-        ax.plot(attempts, percentages, marker='o', color='#3498db', linewidth=2, markersize=6)
-        ax.set_xlabel('Attempt Number', fontsize=10)
-        ax.set_ylabel('Score Percentage (%)', fontsize=10)
-        ax.set_title('Score Progression', fontsize=12)
-        ax.grid(True, alpha=0.3)
-        ax.set_ylim(0, 105)
-        
-        # Add trend line
-        if len(attempts) > 1:
-            import numpy as np
-            z = np.polyfit(attempts, percentages, 1)
-            p = np.poly1d(z)
-            ax.plot(attempts, p(attempts), "--", color='#e74c3c', alpha=0.7, label='Trend')
-            ax.legend()
-        
-        # Embed in tkinter
-        canvas = FigureCanvasTkAgg(fig, master=graph_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack()
+        title_label.pack(pady=10)
+        
+        # Placeholder sized like the finished chart so the layout does not jump
+        figsize = chart_renderer.CHARTS[chart_id][0]
+        placeholder = tk.Frame(graph_frame, bg='white',
+                               width=figsize[0] * chart_renderer.CHART_DPI,
+                               height=figsize[1] * chart_renderer.CHART_DPI)
+        placeholder.pack()
+        placeholder.pack_propagate(False)
+        
+        image_label = tk.Label(placeholder, text="⏳ Rendering chart...", font=('Segoe UI', 11),
+                               bg='white', fg='#718096')
+        image_label.pack(fill=tk.BOTH, expand=True)
+        self.chart_labels[chart_id] = image_label
     
-    def create_category_performance_graph(self, parent, df):
-        """Create bar chart showing average performance by category"""
-        graph_frame = tk.Frame(parent, bg='white', relief=tk.RAISED, bd=2)
-        graph_frame.pack(fill=tk.BOTH, padx=20, pady=10)
-        
-        title = tk.Label(
-            graph_frame,
-            text="Average Performance by Category",
-            font=('Arial', 14, 'bold'),
-            bg='white'
-        )
-        title.pack(pady=10)
-        
-        # Create figure
-        fig = Figure(figsize=(8, 4), dpi=100)
-        ax = fig.add_subplot(111)
-        
-        # Get category averages using pandas groupby
-        category_avg = df.groupby('category')['percentage'].mean()
-        
-        # Plot bar chart
-        colors = ['#3498db', '#e74c3c', '#f39c12']
-        ax.bar(category_avg.index, category_avg.values, color=colors[:len(category_avg)])
-        ax.set_xlabel('Category', fontsize=10)
-        ax.set_ylabel('Average Score (%)', fontsize=10)
-        ax.set_title('Category-wise Performance', fontsize=12)
-        ax.set_ylim(0, 105)
-        ax.grid(axis='y', alpha=0.3)
-        
-        # Rotate labels if needed
-        plt.setp(ax.xaxis.get_majorticklabels(), rotation=15, ha='right')
-        
-        canvas = FigureCanvasTkAgg(fig, master=graph_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack()
+    def load_charts(self, analytics_data):
+        """Show cached chart images and render the missing ones in the background"""
+        version = analytics_data['version']
+        cached, missing = screen_data.load_cached_charts(self.username, version, CHART_TITLES)
+        for chart_id, png in cached.items():
+            self.show_chart(chart_id, png)
+        
+        if missing:
+            chart_renderer.start_render_worker(self.username, version, analytics_data['history'].copy(), missing,
+                                               self.chart_results, dict(analytics_data['stats']))
+            self.pending_charts = len(missing)
+            self.root.after(50, self.poll_chart_results)
     
-    def create_difficulty_accuracy_graph(self, parent, df):
-        """Create bar chart showing accuracy by difficulty level"""
-        graph_frame = tk.Frame(parent, bg='white', relief=tk.RAISED, bd=2)
-        graph_frame.pack(fill=tk.BOTH, padx=20, pady=10)
-        
-        title = tk.Label(
-            graph_frame,
-            text="Accuracy by Difficulty Level",
-            font=('Arial', 14, 'bold'),
-            bg='white'
-        )
-        title.pack(pady=10)
-        
-        fig = Figure(figsize=(8, 4), dpi=100)
-        ax = fig.add_subplot(111)
-        
-        # Calculate accuracy for each difficulty using pandas
-        difficulty_avg = df.groupby('difficulty')['percentage'].mean()
-        
-        # Ensure order
-        ordered_difficulties = ['Easy', 'Medium', 'Hard']
-        values = [difficulty_avg.get(d, 0) for d in ordered_difficulties]
-        
-        colors = ['#27ae60', '#f39c12', '#e74c3c']
-        ax.bar(ordered_difficulties, values, color=colors)
-        ax.set_xlabel('Difficulty Level', fontsize=10)
-        ax.set_ylabel('Average Accuracy (%)', fontsize=10)
-        ax.set_title('Performance by Difficulty', fontsize=12)
-        ax.set_ylim(0, 105)
-        ax.grid(axis='y', alpha=0.3)
-        
-        canvas = FigureCanvasTkAgg(fig, master=graph_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack()
+    def poll_chart_results(self):
+        """Hand finished images from the render worker to the UI"""
+        if not self.main_frame.winfo_exists():
+            return
+        
+        while True:
+            try:
+                chart_id, png, error = self.chart_results.get_nowait()
+            except queue.Empty:
+                break
+            self.pending_charts -= 1
+            if error is not None:
+                print(f"Error rendering chart {chart_id}: {error}")
+                self.chart_labels[chart_id].config(text="Chart unavailable")
+            else:
+                self.show_chart(chart_id, png)
+        
+        if self.pending_charts > 0:
+            self.root.after(50, self.poll_chart_results)
     
-    def create_correct_incorrect_pie(self, parent, df):
-        """Create pie chart showing correct vs incorrect distribution"""
-        graph_frame = tk.Frame(parent, bg='white', relief=tk.RAISED, bd=2)
-        graph_frame.pack(fill=tk.BOTH, padx=20, pady=10)
-        
-        title = tk.Label(
-            graph_frame,
-            text="Overall Correct vs Incorrect Distribution",
-            font=('Arial', 14, 'bold'),
-            bg='white'
-        )
-        title.pack(pady=10)
-        
-        fig = Figure(figsize=(6, 4), dpi=100)
-        ax = fig.add_subplot(111)
-        
-        # Calculate totals using pandas sum
-        total_correct = df['correct'].sum()
-        total_wrong = df['wrong'].sum()
-        
-        # Create pie chart
-        labels = ['Correct', 'Incorrect']
-        sizes = [total_correct, total_wrong]
-        colors = ['#27ae60', '#e74c3c']
-        explode = (0.05, 0)
-        
-        ax.pie(sizes, explode=explode, labels=labels, colors=colors, autopct='%1.1f%%',
-               shadow=True, startangle=90)
-        ax.axis('equal')
-        ax.set_title(f'Total Questions: {total_correct + total_wrong}', fontsize=12)
-        
-        canvas = FigureCanvasTkAgg(fig, master=graph_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack()
+    def show_chart(self, chart_id, png):
+        """Replace a chart placeholder with its rendered image"""
+        image = tk.PhotoImage(master=self.root, data=base64.b64encode(png))
+        self.chart_images[chart_id] = image  # keep a reference so Tk does not drop it
+        self.chart_labels[chart_id].config(image=image, text='')
@@ -5,12 +5,14 @@ Main dashboard with navigation and quick stats
 
 import tkinter as tk
 from tkinter import messagebox
-from utils import data_manager
+from utils import screen_data
 
 
 class DashboardScreen:
-    def __init__(self, root, username, callbacks):
+    def __init__(self, root, username, callbacks, parent=None):
         self.root = root
+        # Frame to build into (the screen manager passes a cached frame)
+        self.parent = parent if parent is not None else root
         self.username = username
         self.callbacks = callbacks
         self.root.title(f"Quiz App - Dashboard ({username})")
@@ -28,7 +30,7 @@ class DashboardScreen:
     
     def create_widgets(self):
         # Main background
-        main_frame = tk.Frame(self.root, bg='#f5f7fa')
+        main_frame = tk.Frame(self.parent, bg='#f5f7fa')
         main_frame.pack(fill=tk.BOTH, expand=True)
         
         # Modern header with gradient effect
@@ -59,12 +61,9 @@ class DashboardScreen:
         content_frame.pack(fill=tk.BOTH, expand=True, padx=40, pady=30)
         
         # Quick stats cards
-        stats = data_manager.get_user_stats_summary(self.username)
-        
-        # Get streak from achievements module
-        from utils import achievements as ach
-        user_settings = ach.get_user_settings(self.username)
-        streak_count = user_settings.get('streak_count', 0)
+        dashboard_data = screen_data.load_dashboard(self.username)
+        stats = dashboard_data['stats']
+        streak_count = dashboard_data['streak']
         
         stats_container = tk.Frame(content_frame, bg='#f5f7fa')
         stats_container.pack(fill=tk.X, pady=(0, 30))
@@ -5,12 +5,29 @@ Displays quiz history using Treeview widget
 
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-from utils import data_manager
+from utils import screen_data
+
+
+# Treeview columns and the history DataFrame columns they display
+COLUMN_SOURCES = {
+    'Date': 'date',
+    'Time': 'time',
+    'Category': 'category',
+    'Difficulty': 'difficulty',
+    'Mode': 'mode',
+    'Questions': 'total_questions',
+    'Correct': 'correct',
+    'Wrong': 'wrong',
+    'Score': 'score',
+    'Percentage': 'percentage'
+}
 
 
 class HistoryScreen:
-    def __init__(self, root, username, back_callback):
+    def __init__(self, root, username, back_callback, parent=None):
         self.root = root
+        # Frame to build into (the screen manager passes a cached frame)
+        self.parent = parent if parent is not None else root
         self.username = username
         self.back_callback = back_callback
         self.root.title(f"Quiz History - {username}")
@@ -21,11 +38,16 @@ class HistoryScreen:
         # Track sort order for each column
         self.sort_reverse = {}
         
+        # Virtualized table state: display order (row positions), first visible row, rows that fit
+        self.order = []
+        self.offset = 0
+        self.visible_rows = 1
+        
         self.create_widgets()
     
     def create_widgets(self):
         # Main frame with modern bg
-        main_frame = tk.Frame(self.root, bg='#f5f7fa')
+        main_frame = tk.Frame(self.parent, bg='#f5f7fa')
         main_frame.pack(fill=tk.BOTH, expand=True)
         
         # Quick nav bar
@@ -58,8 +80,8 @@ class HistoryScreen:
         )
         subtitle.pack()
         
-        # Get user history using pandas
-        self.history_df = data_manager.get_user_history(self.username)
+        # Get user history (newest first) and the table's column values
+        self.history_df, self.row_data = screen_data.load_history(self.username, COLUMN_SOURCES.values())
         
         if self.history_df.empty:
             no_data_label = tk.Label(
@@ -71,30 +93,26 @@ class HistoryScreen:
             )
             no_data_label.pack(pady=100)
         else:
-            # Sort by date descending
-            self.history_df = self.history_df.sort_values(['date', 'time'], ascending=False)
+            self.order = list(range(len(self.history_df)))
             
             # Create treeview frame
             tree_frame = tk.Frame(main_frame, bg='white')
             tree_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
             
-            # Add scrollbars
-            tree_scroll_y = ttk.Scrollbar(tree_frame, orient='vertical')
+            # Add scrollbars (the vertical one scrolls the row window, not the Treeview)
+            self.tree_scroll_y = ttk.Scrollbar(tree_frame, orient='vertical', command=self.on_scroll)
             tree_scroll_x = ttk.Scrollbar(tree_frame, orient='horizontal')
             
             # Create Treeview widget
-            columns = ('Date', 'Time', 'Category', 'Difficulty', 'Mode', 
-                      'Questions', 'Correct', 'Wrong', 'Score', 'Percentage')
+            columns = tuple(COLUMN_SOURCES)
             
             self.tree = ttk.Treeview(
                 tree_frame,
                 columns=columns,
                 show='headings',
-                yscrollcommand=tree_scroll_y.set,
                 xscrollcommand=tree_scroll_x.set
             )
             
-            tree_scroll_y.config(command=self.tree.yview)
             tree_scroll_x.config(command=self.tree.xview)
             
             # Define column headings and widths
@@ -115,26 +133,17 @@ class HistoryScreen:
                 self.tree.heading(col, text=col, command=lambda c=col: self.sort_by_column(c))
                 self.tree.column(col, width=column_widths[col], anchor='center')
             
-            # Insert data from pandas DataFrame
-            for idx, row in self.history_df.iterrows():
-                values = (
-                    row['date'],
-                    row['time'],
-                    row['category'],
-                    row['difficulty'],
-                    row['mode'],
-                    row['total_questions'],
-                    row['correct'],
-                    row['wrong'],
-                    row['score'],
-                    f"{row['percentage']:.1f}%"
-                )
-                self.tree.insert('', tk.END, values=values)
+            # Only the rows that fit are inserted; they are refilled as the window scrolls
+            self.tree.bind('<Configure>', self.on_tree_configure)
+            self.tree.bind('<MouseWheel>', self.on_mouse_wheel)
+            self.tree.bind('<Button-4>', self.on_mouse_wheel)
+            self.tree.bind('<Button-5>', self.on_mouse_wheel)
             
             # Pack treeview and scrollbars
             self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-            tree_scroll_y.pack(side=tk.RIGHT, fill=tk.Y)
+            self.tree_scroll_y.pack(side=tk.RIGHT, fill=tk.Y)
             tree_scroll_x.pack(side=tk.BOTTOM, fill=tk.X)
+            self.render_rows()
             
             # Statistics summary
             self.create_summary_panel(main_frame)
@@ -206,28 +215,88 @@ class HistoryScreen:
         )
         summary_label.pack(pady=5)
     
+    def row_values(self, position):
+        """Format one history row (by position in history_df) for the Treeview"""
+        values = [column[position] for column in self.row_data]
+        values[-1] = f"{values[-1]:.1f}%"
+        return values
+    
+    def count_visible_rows(self):
+        """Number of rows that fit in the Treeview at its current height"""
+        header_height, row_height = 25, 20
+        items = self.tree.get_children('')
+        if items:
+            bbox = self.tree.bbox(items[0])
+            if bbox:
+                header_height, row_height = bbox[1], bbox[3]
+        return max(1, (self.tree.winfo_height() - header_height) // max(1, row_height))
+    
+    def render_rows(self):
+        """Fill the Treeview with the visible window of rows, reusing its items"""
+        total = len(self.order)
+        self.offset = max(0, min(self.offset, total - self.visible_rows))
+        positions = self.order[self.offset:self.offset + self.visible_rows]
+        
+        items = list(self.tree.get_children(''))
+        while len(items) < len(positions):
+            items.append(self.tree.insert('', tk.END, values=()))
+        for item in items[len(positions):]:
+            self.tree.delete(item)
+        
+        for item, position in zip(items, positions):
+            self.tree.item(item, values=self.row_values(position))
+        
+        if total:
+            self.tree_scroll_y.set(self.offset / total, (self.offset + len(positions)) / total)
+    
+    def scroll_to(self, offset):
+        """Move the visible window to start at the given row"""
+        offset = max(0, min(offset, len(self.order) - self.visible_rows))
+        if offset != self.offset:
+            self.offset = offset
+            # Selection belongs to a reused item, not to a history row
+            self.tree.selection_remove(self.tree.selection())
+            self.render_rows()
+    
+    def on_tree_configure(self, event=None):
+        """Resize the row window when the Treeview is resized"""
+        rows = self.count_visible_rows()
+        if rows != self.visible_rows:
+            self.visible_rows = rows
+            self.render_rows()
+    
+    def on_scroll(self, action, amount, unit=None):
+        """Handle vertical scrollbar commands ('moveto' and 'scroll')"""
+        if action == 'moveto':
+            self.scroll_to(int(float(amount) * len(self.order)))
+        elif action == 'scroll':
+            step = self.visible_rows if unit == 'pages' else 1
+            self.scroll_to(self.offset + int(amount) * step)
+    
+    def on_mouse_wheel(self, event):
+        """Scroll three rows per wheel notch (Windows/macOS delta, X11 buttons 4/5)"""
+        if event.num == 4 or event.delta > 0:
+            self.scroll_to(self.offset - 3)
+        elif event.num == 5 or event.delta < 0:
+            self.scroll_to(self.offset + 3)
+        return 'break'
+    
     def sort_by_column(self, col):
-        """Sort treeview by column with toggle between ascending/descending"""
+        """Sort rows by column with toggle between ascending/descending"""
         # Toggle sort order for this column
         if col not in self.sort_reverse:
             self.sort_reverse[col] = False
         else:
             self.sort_reverse[col] = not self.sort_reverse[col]
         
-        # Get all items
-        items = [(self.tree.set(item, col), item) for item in self.tree.get_children('')]
-        
-        # Sort items with proper type handling
-        try:
-            # Try to sort numerically if possible
-            items.sort(key=lambda x: float(x[0].rstrip('%')), reverse=self.sort_reverse[col])
-        except (ValueError, AttributeError):
-            # Fall back to string sorting
-            items.sort(key=lambda x: x[0], reverse=self.sort_reverse[col])
+        # Stable sort of the current order on the DataFrame column, then re-render the window
+        current = self.history_df[COLUMN_SOURCES[col]].take(self.order)
+        ordered = current.sort_values(ascending=not self.sort_reverse[col], kind='mergesort')
+        self.order = ordered.index.tolist()
         
-        # Rearrange items in sorted order
-        for index, (val, item) in enumerate(items):
-            self.tree.move(item, '', index)
+        self.offset = 0
+        self.tree.selection_remove(self.tree.selection())
+        self.render_rows()
     
     def export_history(self):
         """Export history to CSV file"""
@@ -5,7 +5,6 @@ Provides user authentication interface
 
 import tkinter as tk
 from tkinter import messagebox
-from utils import data_manager
 
 
 class LoginScreen:
@@ -156,6 +155,9 @@ class LoginScreen:
             messagebox.showerror("Error", "Please enter both username and password")
             return
         
+        # data_manager pulls in pandas, so load it on first use, not at startup
+        from utils import data_manager
+        
         # Validate credentials
         if data_manager.validate_user(username, password):
             messagebox.showinfo("Success", f"Welcome back, {username}!")
@@ -181,6 +183,8 @@ class LoginScreen:
             messagebox.showerror("Error", "Password must be at least 4 characters")
             return
         
+        from utils import data_manager
+        
         # Try to add user
         if data_manager.add_user(username, password):
             messagebox.showinfo("Success", f"Account created successfully!\nWelcome, {username}!")
@@ -0,0 +1,84 @@
+"""
+Screen Manager Module
+Keeps built screens alive between navigations and shows/hides their frames
+
+Each cached screen is stored with the data version it was built from. Showing
+a screen again with the same version just re-packs its frame and restores the
+window title and geometry; a different version (e.g. a new quiz attempt was
+recorded) destroys the stale frame and builds the screen again.
+"""
+
+import tkinter as tk
+
+
+class ScreenManager:
+    def __init__(self, root):
+        self.root = root
+        self.screens = {}
+        self.current_key = None
+    
+    def show(self, key, version, factory):
+        """
+        Show a cached screen, building it first if missing or out of date
+        
+        Args:
+            key: Cache key, e.g. ('dashboard', username)
+            version: Data version the screen depends on (any comparable value)
+            factory: Callable taking a parent frame and building the screen in it
+        
+        Returns:
+            The screen object returned by factory
+        """
+        self.hide_current()
+        
+        entry = self.screens.get(key)
+        if entry is not None and entry['version'] == version and entry['frame'].winfo_exists():
+            entry['frame'].pack(fill=tk.BOTH, expand=True)
+            self.root.title(entry['title'])
+            self.root.geometry(entry['geometry'])
+            self.current_key = key
+            return entry['screen']
+        
+        self.invalidate(key)
+        
+        frame = tk.Frame(self.root, bg='#f5f7fa')
+        frame.pack(fill=tk.BOTH, expand=True)
+        screen = factory(frame)
+        
+        # Screens set their own title and size while building; remember them for re-showing
+        self.root.update_idletasks()
+        self.screens[key] = {
+            'frame': frame,
+            'screen': screen,
+            'version': version,
+            'title': self.root.title(),
+            'geometry': self.root.geometry()
+        }
+        self.current_key = key
+        return screen
+    
+    def hide_current(self):
+        """Hide the screen currently on display (it stays cached)"""
+        entry = self.screens.get(self.current_key)
+        if entry is not None and entry['frame'].winfo_exists():
+            entry['frame'].pack_forget()
+        self.current_key = None
+    
+    def is_cached_frame(self, widget):
+        """Check whether a widget is one of the cached screen frames"""
+        return any(entry['frame'] is widget for entry in self.screens.values())
+    
+    def invalidate(self, key=None):
+        """
+        Destroy cached screens so they are rebuilt on next show
+        
+        Args:
+            key: Cache key to drop, or None to drop every screen
+        """
+        keys = list(self.screens) if key is None else [key]
+        for k in keys:
+            entry = self.screens.pop(k, None)
+            if entry is not None and entry['frame'].winfo_exists():
+                entry['frame'].destroy()
+            if k == self.current_key:
+                self.current_key = None
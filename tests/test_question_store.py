@@ -0,0 +1,104 @@
+"""
+Tests for the JSON Lines question store and its byte-offset index
+"""
+
+import os
+import sys
+import json
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import config, question_manager
+from utils.question_manager import StaleSnapshotError
+from utils.question_store import JsonlQuestionBank, QuestionIndex, get_index_path
+
+
+def make_question(number, category='Python', difficulty='Easy'):
+    return {
+        'category': category,
+        'difficulty': difficulty,
+        'question': f"Question {number}?",
+        'options': ['A', 'B', 'C', 'D'],
+        'correct': number % 4,
+        'explanation': f"Explanation {number}."
+    }
+
+
+def write_lines(filepath, lines):
+    with open(filepath, 'w', encoding='utf-8', newline='\n') as f:
+        for line in lines:
+            f.write(line + '\n')
+
+
+def test_skips_corrupt_and_non_object_lines(tmp_path):
+    questions = [make_question(1), make_question(2, 'DSA', 'Hard'), make_question(3)]
+    jsonl_path = str(tmp_path / 'questions.jsonl')
+    write_lines(jsonl_path, [
+        json.dumps(questions[0]),
+        '{"category": "Python", "question": ',  # corrupt
+        '[]',  # valid JSON, not a question object
+        json.dumps(questions[1]),
+        '',
+        '"just a string"',
+        json.dumps(questions[2])
+    ])
+    
+    bank = JsonlQuestionBank(jsonl_path)
+    assert bank.get_questions() == questions
+    assert bank.categories == ['DSA', 'Python']
+    assert bank.select(bank.positions('Python')) == [questions[0], questions[2]]
+    assert bank.select(bank.positions('DSA', 'Hard')) == [questions[1]]
+    
+    # Each record is read on its own, without the skipped lines around it
+    for position, question in enumerate(questions):
+        assert bank.select([position]) == [question]
+
+
+def test_saved_index_matches_rebuilt_index(tmp_path):
+    questions = [make_question(n, ['Python', 'DSA'][n % 2]) for n in range(5)]
+    jsonl_path = str(tmp_path / 'questions.jsonl')
+    write_lines(jsonl_path, [json.dumps(questions[0]), 'not json'] + [json.dumps(q) for q in questions[1:]])
+    
+    JsonlQuestionBank(jsonl_path).refresh()
+    loaded = QuestionIndex.load(get_index_path(jsonl_path))
+    built = QuestionIndex.build(jsonl_path)
+    assert loaded is not None
+    assert list(loaded.offsets) == list(built.offsets)
+    assert list(loaded.ends) == list(built.ends)
+    assert JsonlQuestionBank(jsonl_path).get_questions() == questions
+
+
+def test_snapshot_keeps_positions_and_records_together(tmp_path):
+    jsonl_path = str(tmp_path / 'questions.jsonl')
+    write_lines(jsonl_path, [json.dumps(make_question(n, ['Python', 'DSA'][n % 2])) for n in range(4)])
+    
+    bank = JsonlQuestionBank(jsonl_path)
+    snapshot = bank.snapshot()
+    positions = snapshot.positions('DSA')
+    
+    # Replace the file (longer lines, different order) before the records are read
+    replacement = str(tmp_path / 'replacement.jsonl')
+    write_lines(replacement, [json.dumps(make_question(n + 100, 'DSA')) for n in range(4)])
+    os.replace(replacement, jsonl_path)
+    
+    with pytest.raises(StaleSnapshotError):
+        snapshot.select(positions)
+    
+    fresh = bank.snapshot()
+    assert fresh is not snapshot
+    assert fresh.select(fresh.positions('DSA')) == [make_question(n + 100, 'DSA') for n in range(4)]
+
+
+def test_question_store_setting_selects_jsonl(tmp_path, monkeypatch):
+    questions = [make_question(1), make_question(2)]
+    with open(tmp_path / 'questions.json', 'w', encoding='utf-8') as f:
+        json.dump(questions[:1], f)
+    write_lines(str(tmp_path / 'questions.jsonl'), [json.dumps(q) for q in questions])
+    monkeypatch.setattr(config, 'DATA_DIR', str(tmp_path))
+    
+    monkeypatch.setattr(config, 'QUESTION_STORE', 'json')
+    assert question_manager.filter_questions('Python') == questions[:1]
+    
+    monkeypatch.setattr(config, 'QUESTION_STORE', 'jsonl')
+    assert question_manager.filter_questions('Python') == questions
@@ -2,49 +2,72 @@
 Achievement System Module
 Tracks user achievements and milestones
 Uses pandas to manage achievement data in CSV format
+(or the indexed SQLite backend when config.STORAGE_BACKEND is 'sqlite')
 """
 
 import pandas as pd
 import os
 from datetime import datetime
-from utils import data_manager
+from utils import data_manager, config, user_stats, file_handler
+
+
+ACHIEVEMENT_COLUMNS = ['username', 'achievement_id', 'unlocked_date', 'unlocked_time']
+
+# Bumped on every settings write so cached screens know to rebuild
+_settings_version = 0
 
 
 def get_achievements_path():
     """Get path to achievements CSV file"""
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    data_dir = os.path.join(os.path.dirname(current_dir), 'data')
+    data_dir = config.get_data_dir()
     return os.path.join(data_dir, 'achievements.csv')
 
 
 def get_user_settings_path():
     """Get path to user settings CSV file"""
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    data_dir = os.path.join(os.path.dirname(current_dir), 'data')
+    data_dir = config.get_data_dir()
     return os.path.join(data_dir, 'user_settings.csv')
 
 
 def initialize_achievements():
     """Create achievements CSV if it doesn't exist"""
+    if config.use_sqlite():
+        return
+    
     filepath = get_achievements_path()
     
     if not os.path.exists(filepath):
         # Create with headers
-        df = pd.DataFrame(columns=['username', 'achievement_id', 'unlocked_date', 'unlocked_time'])
-        df.to_csv(filepath, index=False)
+        _create_csv(filepath, ACHIEVEMENT_COLUMNS)
 
 
 def initialize_user_settings():
     """Create user settings CSV if it doesn't exist"""
+    if config.use_sqlite():
+        return
+    
     filepath = get_user_settings_path()
     
     if not os.path.exists(filepath):
         # Create with headers
-        df = pd.DataFrame(columns=[
+        _create_csv(filepath, [
             'username', 'streak_count', 'last_played_date', 
             'daily_challenge_date', 'theme', 'sound_enabled'
         ])
-        df.to_csv(filepath, index=False)
+
+
+def _create_csv(filepath, columns):
+    """
+    Create a header-only CSV unless another process already has
+    Written under the file lock and renamed into place, so concurrent
+    readers never see an empty file
+    """
+    with file_handler.file_lock(filepath):
+        if os.path.exists(filepath):
+            return
+        tmp_path = filepath + '.tmp'
+        pd.DataFrame(columns=columns).to_csv(tmp_path, index=False)
+        os.replace(tmp_path, filepath)
 
 
 # Define all achievements
@@ -139,6 +162,10 @@ def load_user_achievements(username):
     Returns:
         List of achievement IDs user has unlocked
     """
+    if config.use_sqlite():
+        from utils import sqlite_store
+        return sqlite_store.load_achievement_ids(username)
+    
     initialize_achievements()
     filepath = get_achievements_path()
     
@@ -161,27 +188,49 @@ def unlock_achievement(username, achievement_id):
     Returns:
         True if newly unlocked, False if already unlocked
     """
-    initialize_achievements()
-    filepath = get_achievements_path()
-    
     # Check if already unlocked
     unlocked = load_user_achievements(username)
     if achievement_id in unlocked:
         return False
     
-    # Add new achievement
-    df = pd.read_csv(filepath)
-    new_achievement = {
+    return commit_unlocks(username, [achievement_id]) > 0
+
+
+def commit_unlocks(username, achievement_ids):
+    """
+    Record several newly unlocked achievements in a single write
+    
+    Args:
+        username: Username
+        achievement_ids: Achievement IDs to record (caller checked they are new)
+        
+    Returns:
+        Number of achievements recorded
+    """
+    if not achievement_ids:
+        return 0
+    
+    now = datetime.now()
+    rows = [{
         'username': username,
         'achievement_id': achievement_id,
-        'unlocked_date': datetime.now().strftime('%Y-%m-%d'),
-        'unlocked_time': datetime.now().strftime('%H:%M:%S')
-    }
+        'unlocked_date': now.strftime('%Y-%m-%d'),
+        'unlocked_time': now.strftime('%H:%M:%S')
+    } for achievement_id in achievement_ids]
+    
+    if config.use_sqlite():
+        from utils import sqlite_store
+        return sqlite_store.insert_achievements(rows)
     
-    df = pd.concat([df, pd.DataFrame([new_achievement])], ignore_index=True)
-    df.to_csv(filepath, index=False)
+    initialize_achievements()
+    filepath = get_achievements_path()
     
-    return True
+    # Append instead of rewriting the whole file
+    with file_handler.file_lock(filepath):
+        if not file_handler.append_csv_rows(filepath, rows, ACHIEVEMENT_COLUMNS):
+            return 0
+    
+    return len(rows)
 
 
 def check_and_unlock_achievements(username):
@@ -197,26 +246,25 @@ def check_and_unlock_achievements(username):
     # Get user statistics
     stats = data_manager.get_user_stats_summary(username)
     
-    # Get user history for mode-specific counts
-    history = data_manager.get_user_history(username)
-    if not history.empty:
-        stats['timed_quizzes'] = len(history[history['mode'] == 'Timed'])
-        stats['survival_quizzes'] = len(history[history['mode'] == 'Survival'])
-        stats['hard_quizzes'] = len(history[history['difficulty'] == 'Hard'])
+    # Mode and difficulty counts come from the materialized aggregates
+    record = user_stats.get_user_stats(username)
+    if record['total_quizzes'] > 0:
+        stats['timed_quizzes'] = record['by_mode'].get('Timed', 0)
+        stats['survival_quizzes'] = record['by_mode'].get('Survival', 0)
+        stats['hard_quizzes'] = record['by_difficulty'].get('Hard', 0)
     
     # Get streak count from user settings
     user_settings = get_user_settings(username)
     stats['streak_count'] = user_settings.get('streak_count', 0)
     
-    # Check each achievement
-    newly_unlocked = []
+    # Load the unlocked set once, evaluate every condition, then commit in one write
+    unlocked = set(load_user_achievements(username))
+    newly_unlocked = [
+        achievement_info for achievement_id, achievement_info in ACHIEVEMENTS.items()
+        if achievement_id not in unlocked and achievement_info['condition'](stats)
+    ]
     
-    for achievement_id, achievement_info in ACHIEVEMENTS.items():
-        # Check if condition is met
-        if achievement_info['condition'](stats):
-            # Try to unlock
-            if unlock_achievement(username, achievement_id):
-                newly_unlocked.append(achievement_info)
+    commit_unlocks(username, [info['id'] for info in newly_unlocked])
     
     return newly_unlocked
 
@@ -267,6 +315,20 @@ def get_user_settings(username):
     Returns:
         Dict with user settings
     """
+    if config.use_sqlite():
+        from utils import sqlite_store
+        settings = sqlite_store.load_settings(username)
+        if settings is not None:
+            return settings
+        return {
+            'username': username,
+            'streak_count': 0,
+            'last_played_date': None,
+            'daily_challenge_date': None,
+            'theme': 'light',
+            'sound_enabled': True
+        }
+    
     initialize_user_settings()
     filepath = get_user_settings_path()
     
@@ -305,32 +367,60 @@ def update_user_settings(username, **kwargs):
         username: Username
         **kwargs: Settings to update
     """
-    initialize_user_settings()
-    filepath = get_user_settings_path()
+    global _settings_version
+    _settings_version += 1
     
-    df = pd.read_csv(filepath)
+    if config.use_sqlite():
+        from utils import sqlite_store
+        settings = get_user_settings(username)
+        settings.update(kwargs)
+        sqlite_store.save_settings(settings)
+        return
     
-    # Check if user exists
-    user_exists = not df[df['username'] == username].empty
+    initialize_user_settings()
+    filepath = get_user_settings_path()
     
-    if user_exists:
-        # Update existing
-        for key, value in kwargs.items():
-            df.loc[df['username'] == username, key] = value
-    else:
-        # Create new
-        new_settings = {
-            'username': username,
-            'streak_count': 0,
-            'last_played_date': None,
-            'daily_challenge_date': None,
-            'theme': 'light',
-            'sound_enabled': True
-        }
-        new_settings.update(kwargs)
-        df = pd.concat([df, pd.DataFrame([new_settings])], ignore_index=True)
+    # Read-modify-write under the file lock so concurrent processes do not
+    # lose each other's updates; the rename means readers never see a partial file
+    with file_handler.file_lock(filepath):
+        df = pd.read_csv(filepath)
+        
+        # Check if user exists
+        user_exists = not df[df['username'] == username].empty
+        
+        if user_exists:
+            # Update existing
+            for key, value in kwargs.items():
+                # An all-empty column (e.g. daily_challenge_date) is read as float
+                if key in df.columns and df[key].dtype != object and isinstance(value, str):
+                    df[key] = df[key].astype(object)
+                df.loc[df['username'] == username, key] = value
+        else:
+            # Create new
+            new_settings = {
+                'username': username,
+                'streak_count': 0,
+                'last_played_date': None,
+                'daily_challenge_date': None,
+                'theme': 'light',
+                'sound_enabled': True
+            }
+            new_settings.update(kwargs)
+            df = pd.concat([df, pd.DataFrame([new_settings])], ignore_index=True)
+        
+        tmp_path = filepath + '.tmp'
+        df.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, filepath)
+
+
+def get_settings_version():
+    """
+    Get the in-process settings version (changes whenever settings are updated)
     
-    df.to_csv(filepath, index=False)
+    Returns:
+        Integer version counter
+    """
+    return _settings_version
 
 
 def update_streak(username):
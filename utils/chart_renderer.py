@@ -0,0 +1,255 @@
+"""
+Chart Renderer Module
+Draws the analytics charts with matplotlib's Agg backend (no Tk involved)
+so they can be rendered off the UI thread and cached on disk as PNG files
+
+Cached images live in data/chart_cache and are keyed by user, chart and the
+user's history version (the id of their last recorded attempt), so a chart is
+only re-rendered after the user records a new attempt.
+"""
+
+import os
+import io
+import hashlib
+import threading
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from utils import score_calculator, user_stats, config
+
+
+# Bump when the drawing code changes so stale cached images are not reused
+RENDER_VERSION = 'r2'
+
+CHART_DPI = 100
+
+# Draw markers on the trend chart only while points are this sparse
+MAX_MARKER_POINTS = 60
+
+
+def get_chart_cache_dir():
+    """Get path to the chart image cache directory"""
+    data_dir = config.get_data_dir()
+    return os.path.join(data_dir, 'chart_cache')
+
+
+def draw_performance_trend(fig, df, stats=None):
+    """
+    Line graph of score percentage per attempt with a linear trend line
+    Long histories are downsampled (LTTB) to at most one point per pixel of
+    plot width, and the trend comes from running regression sums
+    """
+    ax = fig.add_subplot(111)
+    
+    # Sort by date
+    df_sorted = df.sort_values(['date', 'time'])
+    percentages = df_sorted['percentage'].to_numpy(dtype=float)
+    attempts = range(1, len(percentages) + 1)
+    
+    # Bound the drawn points by the width of the plot area in pixels
+    plot_width = int(fig.get_figwidth() * fig.dpi * ax.get_position().width)
+    x, y = score_calculator.downsample_lttb(attempts, percentages, plot_width)
+    
+    # Plot data
+    marker = 'o' if len(x) <= MAX_MARKER_POINTS else None
+    ax.plot(x, y, marker=marker, color='#3498db', linewidth=2 if marker else 1, markersize=6)
+    ax.set_xlabel('Attempt Number', fontsize=10)
+    ax.set_ylabel('Score Percentage (%)', fontsize=10)
+    ax.set_title('Score Progression', fontsize=12)
+    ax.grid(True, alpha=0.3)
+    ax.set_ylim(0, 105)
+    
+    # Add trend line. The stored sums are in attempt-id order, so they are only
+    # reused when they cover exactly this history and it is plotted in that order
+    in_attempt_order = 'user_id' in df_sorted and df_sorted['user_id'].is_monotonic_increasing
+    if stats is not None and stats['total_quizzes'] == len(percentages) and in_attempt_order:
+        sums = user_stats.get_trend_sums(stats)
+    else:
+        sums = score_calculator.regression_sums(percentages)
+    fit = score_calculator.linear_trend_from_sums(**sums)
+    if fit is not None:
+        slope, intercept = fit
+        ends = [1, len(percentages)]
+        ax.plot(ends, [slope * e + intercept for e in ends], "--", color='#e74c3c', alpha=0.7, label='Trend')
+        ax.legend()
+
+
+def draw_category_performance(fig, df, stats=None):
+    """Bar chart of average percentage by category"""
+    ax = fig.add_subplot(111)
+    
+    # Get category averages using pandas groupby
+    category_avg = df.groupby('category')['percentage'].mean()
+    
+    # Plot bar chart
+    colors = ['#3498db', '#e74c3c', '#f39c12']
+    ax.bar(category_avg.index, category_avg.values, color=colors[:len(category_avg)])
+    ax.set_xlabel('Category', fontsize=10)
+    ax.set_ylabel('Average Score (%)', fontsize=10)
+    ax.set_title('Category-wise Performance', fontsize=12)
+    ax.set_ylim(0, 105)
+    ax.grid(axis='y', alpha=0.3)
+    
+    # Rotate labels if needed
+    for label in ax.xaxis.get_majorticklabels():
+        label.set_rotation(15)
+        label.set_horizontalalignment('right')
+
+
+def draw_difficulty_accuracy(fig, df, stats=None):
+    """Bar chart of average percentage by difficulty level"""
+    ax = fig.add_subplot(111)
+    
+    # Calculate accuracy for each difficulty using pandas
+    difficulty_avg = df.groupby('difficulty')['percentage'].mean()
+    
+    # Ensure order
+    ordered_difficulties = ['Easy', 'Medium', 'Hard']
+    values = [difficulty_avg.get(d, 0) for d in ordered_difficulties]
+    
+    colors = ['#27ae60', '#f39c12', '#e74c3c']
+    ax.bar(ordered_difficulties, values, color=colors)
+    ax.set_xlabel('Difficulty Level', fontsize=10)
+    ax.set_ylabel('Average Accuracy (%)', fontsize=10)
+    ax.set_title('Performance by Difficulty', fontsize=12)
+    ax.set_ylim(0, 105)
+    ax.grid(axis='y', alpha=0.3)
+
+
+def draw_correct_incorrect_pie(fig, df, stats=None):
+    """Pie chart of total correct vs incorrect answers"""
+    ax = fig.add_subplot(111)
+    
+    # Calculate totals using pandas sum
+    total_correct = df['correct'].sum()
+    total_wrong = df['wrong'].sum()
+    
+    # Create pie chart
+    labels = ['Correct', 'Incorrect']
+    sizes = [total_correct, total_wrong]
+    colors = ['#27ae60', '#e74c3c']
+    explode = (0.05, 0)
+    
+    ax.pie(sizes, explode=explode, labels=labels, colors=colors, autopct='%1.1f%%',
+           shadow=True, startangle=90)
+    ax.axis('equal')
+    ax.set_title(f'Total Questions: {total_correct + total_wrong}', fontsize=12)
+
+
+# Chart id -> (figure size in inches, drawing function)
+CHARTS = {
+    'trend': ((8, 4), draw_performance_trend),
+    'category': ((8, 4), draw_category_performance),
+    'difficulty': ((8, 4), draw_difficulty_accuracy),
+    'pie': ((6, 4), draw_correct_incorrect_pie)
+}
+
+
+def render_chart_png(chart_id, df, stats=None):
+    """
+    Render one chart to PNG bytes using the Agg backend
+    
+    Args:
+        chart_id: Key in CHARTS
+        df: DataFrame with the user's quiz history
+        stats: Optional user_stats record for the same history
+    
+    Returns:
+        PNG image as bytes
+    """
+    figsize, draw = CHARTS[chart_id]
+    fig = Figure(figsize=figsize, dpi=CHART_DPI)
+    FigureCanvasAgg(fig)
+    draw(fig, df, stats)
+    
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=CHART_DPI)
+    return buffer.getvalue()
+
+
+def _cache_prefix(username, chart_id):
+    """File name prefix shared by every cached version of a user's chart"""
+    user_key = hashlib.sha1(username.encode('utf-8')).hexdigest()[:16]
+    return f"{user_key}_{chart_id}_{RENDER_VERSION}_"
+
+
+def get_cache_path(username, chart_id, version):
+    """Get path of the cached PNG for a user's chart at a history version"""
+    return os.path.join(get_chart_cache_dir(), f"{_cache_prefix(username, chart_id)}{version}.png")
+
+
+def load_cached_chart(username, chart_id, version):
+    """
+    Read a cached chart image
+    
+    Args:
+        username: Username
+        chart_id: Key in CHARTS
+        version: User's history version
+    
+    Returns:
+        PNG bytes, or None if not cached
+    """
+    try:
+        with open(get_cache_path(username, chart_id, version), 'rb') as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def save_cached_chart(username, chart_id, version, png):
+    """
+    Store a rendered chart and remove older versions of it
+    
+    Args:
+        username: Username
+        chart_id: Key in CHARTS
+        version: User's history version
+        png: PNG bytes
+    """
+    cache_dir = get_chart_cache_dir()
+    filepath = get_cache_path(username, chart_id, version)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{filepath}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(png)
+        os.replace(tmp_path, filepath)
+        
+        prefix = _cache_prefix(username, chart_id)
+        for name in os.listdir(cache_dir):
+            path = os.path.join(cache_dir, name)
+            if name.startswith(prefix) and name.endswith('.png') and path != filepath:
+                os.remove(path)
+    except OSError as e:
+        # The chart is still shown; it will just be rendered again next time
+        print(f"Error caching chart {chart_id}: {e}")
+
+
+def start_render_worker(username, version, df, chart_ids, results, stats=None):
+    """
+    Render charts in a background thread, caching each one on disk
+    
+    Args:
+        username: Username
+        version: User's history version (cache key)
+        df: DataFrame with the user's quiz history (not modified)
+        chart_ids: Chart ids to render, in order
+        results: queue.Queue receiving (chart_id, png_bytes, error) tuples
+        stats: Optional user_stats record for the same history
+    
+    Returns:
+        The started daemon thread
+    """
+    def work():
+        for chart_id in chart_ids:
+            try:
+                png = render_chart_png(chart_id, df, stats)
+            except Exception as e:
+                results.put((chart_id, None, e))
+                continue
+            save_cached_chart(username, chart_id, version, png)
+            results.put((chart_id, png, None))
+    
+    thread = threading.Thread(target=work, daemon=True)
+    thread.start()
+    return thread
@@ -1,88 +1,77 @@
 """
 Confetti Animation Module
 Creates celebratory confetti animation using Tkinter Canvas
+
+Particle state (position, velocity, rotation, age) is kept in NumPy arrays
+and stepped in one vectorized update per frame. Canvas items come from a pool
+that is created once and reused (hidden, not deleted, when a particle dies),
+and each frame's coordinate changes are sent to Tk as a single script.
+
+Each frame is timed with a FrameBudget: when a frame's work goes over budget
+the oldest particles are culled, late ticks lower the frame rate, and the
+next celebration spawns fewer particles on a machine that could not keep up.
 """
 
 import tkinter as tk
-import random
-import math
+import numpy as np
+from utils.frame_budget import FrameBudget
 
 
-class ConfettiParticle:
-    """Single confetti particle"""
-    
-    def __init__(self, canvas, x, y):
-        self.canvas = canvas
-        self.x = x
-        self.y = y
-        self.vx = random.uniform(-3, 3)
-        self.vy = random.uniform(-8, -4)
-        self.gravity = 0.3
-        self.rotation = random.uniform(0, 360)
-        self.rotation_speed = random.uniform(-15, 15)
-        self.size = random.randint(6, 12)
-        
-        # Random color
-        colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#FFA07A', '#98D8C8', 
-                  '#F7DC6F', '#BB8FCE', '#85C1E2', '#F8B739', '#52B788']
-        self.color = random.choice(colors)
-        
-        # Create confetti shape (oval or rectangle)
-        shape_type = random.choice(['oval', 'rect'])
-        if shape_type == 'oval':
-            self.shape = canvas.create_oval(
-                x, y, x + self.size, y + self.size,
-                fill=self.color, outline=''
-            )
-        else:
-            self.shape = canvas.create_rectangle(
-                x, y, x + self.size, y + self.size // 2,
-                fill=self.color, outline=''
-            )
-    
-    def update(self):
-        """Update particle position and rotation"""
-        # Update velocity
-        self.vy += self.gravity
-        
-        # Update position
-        self.x += self.vx
-        self.y += self.vy
-        
-        # Update rotation
-        self.rotation += self.rotation_speed
-        
-        # Move on canvas
-        self.canvas.coords(
-            self.shape,
-            self.x, self.y,
-            self.x + self.size, self.y + self.size
-        )
-        
-        # Check if off screen
-        canvas_height = self.canvas.winfo_height()
-        return self.y < canvas_height + 20
-    
-    def destroy(self):
-        """Remove particle from canvas"""
-        self.canvas.delete(self.shape)
+CONFETTI_COLORS = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#FFA07A', '#98D8C8',
+                   '#F7DC6F', '#BB8FCE', '#85C1E2', '#F8B739', '#52B788']
+
+GRAVITY = 0.3
+FRAME_MS = 30
+PARTICLES_PER_SPAWN = 30
+MIN_PARTICLES_PER_SPAWN = 5
+
+# Per-frame work budget, small enough that quiz timers sharing the Tk loop stay on time
+WORK_BUDGET_MS = 8
+
+# Longest frame step simulated at once, so a stalled frame does not teleport particles
+MAX_STEP_MS = FRAME_MS * 4
+
+# Fraction of PARTICLES_PER_SPAWN to use, learned from previous celebrations
+_spawn_scale = 1.0
 
 
 class ConfettiAnimation:
     """Manages confetti animation"""
     
-    def __init__(self, parent_frame, duration=3000):
+    def __init__(self, parent_frame, duration=3000, scheduler=None):
         """
         Initialize confetti animation
         
         Args:
             parent_frame: Parent tkinter frame
-            duration: Animation duration in milliseconds
+            duration: Animation duration in milliseconds (maximum particle lifetime)
+            scheduler: Optional TickScheduler to run frames on (otherwise canvas.after)
         """
         self.parent = parent_frame
         self.duration = duration
-        self.particles = []
+        self.scheduler = scheduler
         self.animation_id = None
+        self.rng = np.random.default_rng()
+        
+        # Frame timing and adaptive load shedding
+        self.budget = FrameBudget(FRAME_MS, WORK_BUDGET_MS)
+        self.spawned = 0
+        self.culled = 0
+        
+        # Pool of canvas items; is_rect[i] tells which shape item i is
+        self.items = []
+        self.is_rect = np.zeros(0, dtype=bool)
+        
+        # Particle state, one entry per pool item
+        self.x = np.zeros(0)
+        self.y = np.zeros(0)
+        self.vx = np.zeros(0)
+        self.vy = np.zeros(0)
+        self.rotation = np.zeros(0)
+        self.rotation_speed = np.zeros(0)
+        self.size = np.zeros(0)
+        self.age = np.zeros(0)
+        self.alive = np.zeros(0, dtype=bool)
         
         # Create transparent canvas overlay
         self.canvas = tk.Canvas(
@@ -91,13 +80,139 @@ class ConfettiAnimation:
             highlightthickness=0
         )
         self.canvas.place(x=0, y=0, relwidth=1, relheight=1)
+    
+    @property
+    def particle_count(self):
+        """Number of particles still on screen"""
+        return int(self.alive.sum())
+    
+    @property
+    def fps(self):
+        """Measured frames per second (smoothed)"""
+        return self.budget.fps
+    
+    @property
+    def dropped_frames(self):
+        """Frames that were due but not drawn because ticks arrived late"""
+        return self.budget.dropped_frames
+    
+    def _grow_pool(self, count):
+        """Make sure the pool has at least count canvas items and state slots"""
+        missing = count - len(self.items)
+        if missing <= 0:
+            return
+        
+        is_rect = self.rng.random(missing) < 0.5
+        for rect in is_rect:
+            create = self.canvas.create_rectangle if rect else self.canvas.create_oval
+            self.items.append(create(0, 0, 0, 0, outline='', state='hidden'))
+        
+        self.is_rect = np.concatenate([self.is_rect, is_rect])
+        for name in ('x', 'y', 'vx', 'vy', 'rotation', 'rotation_speed', 'size', 'age'):
+            setattr(self, name, np.concatenate([getattr(self, name), np.zeros(missing)]))
+        self.alive = np.concatenate([self.alive, np.zeros(missing, dtype=bool)])
+    
+    def spawn(self, spawn_points, per_point=PARTICLES_PER_SPAWN):
+        """
+        Launch a burst of particles, reusing free pool items first
+        
+        Args:
+            spawn_points: List of (x, y) canvas positions
+            per_point: Particles launched from each point
+        """
+        count = len(spawn_points) * per_point
+        free = np.flatnonzero(~self.alive)
+        if len(free) < count:
+            start = len(self.items)
+            self._grow_pool(start + count - len(free))
+            free = np.concatenate([free, np.arange(start, len(self.items))])
+        idx = free[:count]
+        
+        points = np.repeat(np.asarray(spawn_points, dtype=float), per_point, axis=0)
+        self.x[idx] = points[:, 0] + self.rng.integers(-50, 51, count)
+        self.y[idx] = points[:, 1]
+        self.vx[idx] = self.rng.uniform(-3, 3, count)
+        self.vy[idx] = self.rng.uniform(-8, -4, count)
+        self.rotation[idx] = self.rng.uniform(0, 360, count)
+        self.rotation_speed[idx] = self.rng.uniform(-15, 15, count)
+        self.size[idx] = self.rng.integers(6, 13, count)
+        self.age[idx] = 0
+        self.alive[idx] = True
+        self.spawned += count
+        
+        # Random color per particle, then show the items (one Tk call per burst)
+        colors = self.rng.choice(CONFETTI_COLORS, count)
+        path = str(self.canvas)
+        self.canvas.tk.eval('\n'.join(
+            f"{path} itemconfigure {self.items[i]} -fill {color} -state normal"
+            for i, color in zip(idx, colors)
+        ))
+    
+    def step(self, frame_ms=FRAME_MS):
+        """
+        Advance every live particle by one frame (vectorized)
         
-        self.start_time = None
+        Args:
+            frame_ms: Time since the previous frame; motion is scaled to it so
+                particles move at the same speed whatever the frame rate
+        
+        Returns:
+            Indices of particles that died during this step
+        """
+        alive = self.alive
+        k = frame_ms / FRAME_MS
+        self.vy[alive] += GRAVITY * k
+        self.x[alive] += self.vx[alive] * k
+        self.y[alive] += self.vy[alive] * k
+        self.rotation[alive] += self.rotation_speed[alive] * k
+        self.age[alive] += frame_ms
+        
+        canvas_height = self.canvas.winfo_height()
+        still_alive = alive & (self.y < canvas_height + 20) & (self.age <= self.duration)
+        died = np.flatnonzero(alive & ~still_alive)
+        self.alive = still_alive
+        return died
+    
+    def draw(self, died=()):
+        """Send this frame's canvas changes to Tk as one script"""
+        live = np.flatnonzero(self.alive)
+        
+        # Rectangles are half as tall as wide; rotation shows as a flutter in height
+        height = self.size[live] * np.where(self.is_rect[live], 0.5, 1.0)
+        height = height * (0.4 + 0.6 * np.abs(np.cos(np.radians(self.rotation[live]))))
+        x0 = self.x[live]
+        y0 = self.y[live]
+        x1 = x0 + self.size[live]
+        y1 = y0 + height
+        
+        path = str(self.canvas)
+        lines = [f"{path} coords {self.items[i]} {a:.1f} {b:.1f} {c:.1f} {d:.1f}"
+                 for i, a, b, c, d in zip(live, x0, y0, x1, y1)]
+        lines.extend(f"{path} itemconfigure {self.items[i]} -state hidden" for i in died)
+        if lines:
+            self.canvas.tk.eval('\n'.join(lines))
+    
+    def shed_particles(self, keep_fraction):
+        """
+        Cull the oldest live particles to bring frame work back under budget
+        
+        Args:
+            keep_fraction: Fraction of live particles to keep
+        """
+        live = np.flatnonzero(self.alive)
+        cull = len(live) - int(len(live) * keep_fraction)
+        if cull <= 0:
+            return
+        
+        oldest = live[np.argsort(self.age[live])[::-1][:cull]]
+        self.alive[oldest] = False
+        self.culled += cull
+        
+        path = str(self.canvas)
+        self.canvas.tk.eval('\n'.join(f"{path} itemconfigure {self.items[i]} -state hidden" for i in oldest))
     
     def start(self):
         """Start confetti animation"""
-        self.start_time = self.canvas.after(0)
-        
         # Create initial burst of particles
         width = self.canvas.winfo_width()
         height = self.canvas.winfo_height()
@@ -108,61 +223,81 @@ class ConfettiAnimation:
             (width * 0.5, height * 0.2),
             (width * 0.8, height * 0.2),
         ]
-        
-        for spawn_x, spawn_y in spawn_points:
-            for _ in range(30):
-                particle = ConfettiParticle(
-                    self.canvas,
-                    spawn_x + random.randint(-50, 50),
-                    spawn_y
-                )
-                self.particles.append(particle)
+        per_point = max(MIN_PARTICLES_PER_SPAWN, int(PARTICLES_PER_SPAWN * _spawn_scale))
+        self.spawn(spawn_points, per_point)
         
         # Start animation loop
-        self.animate()
+        if self.scheduler is not None:
+            self.animation_id = self.scheduler.call_every(FRAME_MS, self.frame)
+        else:
+            self.animate()
     
     def animate(self):
-        """Animation loop"""
-        # Update all particles
-        active_particles = []
+        """Animation loop driven by canvas.after"""
+        interval_ms = self.frame()
+        if interval_ms is not False:
+            self.animation_id = self.canvas.after(interval_ms, self.animate)
+    
+    def frame(self):
+        """
+        Draw one frame
         
-        for particle in self.particles:
-            if particle.update():
-                active_particles.append(particle)
-            else:
-                particle.destroy()
+        Returns:
+            Milliseconds until the next frame, or False when the animation is over
+        """
+        if not self.canvas.winfo_exists():
+            return False
         
-        self.particles = active_particles
+        elapsed_ms = self.budget.begin_frame()
+        died = self.step(min(elapsed_ms, MAX_STEP_MS))
+        self.draw(died)
         
-        # Continue animation if particles exist and duration not exceeded
-        if self.particles:
-            self.animation_id = self.canvas.after(30, self.animate)
-        else:
-            self.stop()
+        # Over budget: drop particles in proportion to the overrun
+        load = self.budget.end_frame()
+        if load > 1:
+            self.shed_particles(1 / load)
+        
+        # Continue animation while particles are on screen, at the budget's frame rate
+        if self.alive.any():
+            return self.budget.interval_ms
+        
+        self.animation_id = None
+        self.stop()
+        return False
     
     def stop(self):
         """Stop animation and cleanup"""
-        if self.animation_id:
-            self.canvas.after_cancel(self.animation_id)
+        global _spawn_scale
         
-        # Remove all particles
-        for particle in self.particles:
-            particle.destroy()
+        # Remember how many particles this machine sustained for the next celebration
+        if self.culled:
+            _spawn_scale = max(0.2, _spawn_scale * (1 - self.culled / max(1, self.spawned)))
+        else:
+            _spawn_scale = min(1.0, _spawn_scale * 1.25)
+        
+        if self.animation_id:
+            if self.scheduler is not None:
+                self.scheduler.cancel(self.animation_id)
+            else:
+                self.canvas.after_cancel(self.animation_id)
+            self.animation_id = None
         
-        self.particles = []
+        self.alive[:] = False
         
-        # Destroy canvas after a brief delay
-        self.canvas.after(500, self.canvas.destroy)
+        # Destroy canvas (and with it the item pool) after a brief delay
+        if self.canvas.winfo_exists():
+            self.canvas.after(500, self.canvas.destroy)
 
 
-def show_confetti(parent_frame, duration=3000):
+def show_confetti(parent_frame, duration=3000, scheduler=None):
     """
     Show confetti animation on a frame
     
     Args:
         parent_frame: Parent tkinter frame
         duration: Animation duration in milliseconds
+        scheduler: Optional TickScheduler to share the application's after() loop
     """
-    animation = ConfettiAnimation(parent_frame, duration)
+    animation = ConfettiAnimation(parent_frame, duration, scheduler)
     animation.start()
     return animation
@@ -0,0 +1,67 @@
+"""
+Configuration Module
+Central application settings
+Each value can be overridden with an environment variable
+"""
+
+import os
+
+
+# Directory holding every data file (questions, history, users, caches);
+# empty means the app's own data/ folder. Load tests point this at a scratch copy.
+DATA_DIR = os.environ.get('QUIZ_DATA_DIR', '').strip()
+
+# Storage backend for history, users, achievements and settings: 'csv' or 'sqlite'
+STORAGE_BACKEND = os.environ.get('QUIZ_STORAGE_BACKEND', 'csv').strip().lower()
+
+# Question bank file: 'json' (questions.json) or 'jsonl' (questions.jsonl
+# with its byte-offset index, see utils.question_store)
+QUESTION_STORE = os.environ.get('QUIZ_QUESTION_STORE', 'json').strip().lower()
+
+# SQLite database file name (inside the data directory)
+SQLITE_FILENAME = os.environ.get('QUIZ_SQLITE_FILENAME', 'quiz.db')
+
+# Number of entries kept in the persisted leaderboard (top-K by score)
+LEADERBOARD_SIZE = int(os.environ.get('QUIZ_LEADERBOARD_SIZE', '100'))
+
+# Audio backend for sound effects: 'auto', 'winsound', 'wav' or 'null'
+SOUND_BACKEND = os.environ.get('QUIZ_SOUND_BACKEND', 'auto').strip().lower()
+
+# Startup budget: time from launch to the login screen being painted
+STARTUP_TARGET_MS = int(os.environ.get('QUIZ_STARTUP_TARGET_MS', '800'))
+
+# Always print the measured startup time (otherwise only when over budget)
+REPORT_STARTUP = os.environ.get('QUIZ_REPORT_STARTUP', '') not in ('', '0')
+
+
+def use_sqlite():
+    """
+    Check whether the SQLite storage backend is selected
+    
+    Returns:
+        True if data should be read from and written to SQLite
+    """
+    return STORAGE_BACKEND == 'sqlite'
+
+
+def use_jsonl_questions():
+    """
+    Check whether the JSON Lines question bank is selected
+    
+    Returns:
+        True if questions should be read from questions.jsonl
+    """
+    return QUESTION_STORE == 'jsonl'
+
+
+def get_data_dir():
+    """
+    Get the data directory used by every get_*_path() helper
+    
+    Returns:
+        DATA_DIR if set, otherwise the data folder next to the utils package
+    """
+    if DATA_DIR:
+        return os.path.abspath(DATA_DIR)
+    app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(app_dir, 'data')
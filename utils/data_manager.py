@@ -2,43 +2,129 @@
 Data Manager Module
 Uses pandas for DataFrame operations, data storage, and analysis
 Manages quiz history and user data using CSV files
+(or the indexed SQLite backend when config.STORAGE_BACKEND is 'sqlite')
 """
 
 import pandas as pd
+import csv
 import os
 from datetime import datetime
+from utils import file_handler, config
+
+
+HISTORY_COLUMNS = [
+    'user_id', 'username', 'date', 'time', 'category',
+    'difficulty', 'total_questions', 'correct', 'wrong',
+    'score', 'percentage', 'time_taken', 'mode'
+]
 
 
 def get_data_path(filename):
     """Get full path to data file"""
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    data_dir = os.path.join(os.path.dirname(current_dir), 'data')
+    data_dir = config.get_data_dir()
     return os.path.join(data_dir, filename)
 
 
+class HistoryRepository:
+    """
+    In-memory cache of quiz_history.csv keyed by the file version (mtime, size)
+    
+    The CSV is parsed at most once per version. Attempts appended by this
+    process are queued and folded into the cached DataFrame on the next read,
+    so recording a quiz never forces a re-parse. Appends by other processes
+    change the file version and trigger a normal reload.
+    """
+    
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self._df = None
+        self._signature = None
+        self._pending = []
+    
+    def load(self):
+        """
+        Get the quiz history DataFrame (shared, treat as read-only)
+        
+        Returns:
+            DataFrame with quiz history or empty DataFrame
+        """
+        signature = file_handler.get_file_signature(self.filepath)
+        
+        if self._df is not None and signature is not None and signature == self._signature:
+            if self._pending:
+                appended = pd.DataFrame(self._pending, columns=HISTORY_COLUMNS)
+                self._df = appended if self._df.empty else pd.concat([self._df, appended], ignore_index=True)
+                self._pending = []
+            return self._df
+        
+        try:
+            # Read CSV into DataFrame
+            df = pd.read_csv(self.filepath)
+        except FileNotFoundError:
+            # Return empty DataFrame with correct columns
+            return pd.DataFrame(columns=HISTORY_COLUMNS)
+        except Exception as e:
+            print(f"Error loading quiz history: {e}")
+            return pd.DataFrame()
+        
+        self._df = df
+        self._signature = signature
+        self._pending = []
+        return df
+    
+    def record_append(self, attempt, signature_before, signature_after):
+        """
+        Update the cache for a row this process just appended
+        
+        Args:
+            attempt: Dictionary with the appended row
+            signature_before: File signature right before the append
+            signature_after: File signature right after the append
+        """
+        if self._df is not None and signature_before == self._signature:
+            self._pending.append(attempt)
+            self._signature = signature_after
+        else:
+            # Someone else changed the file since we cached it
+            self.invalidate()
+    
+    def invalidate(self):
+        """Drop the cached DataFrame"""
+        self._df = None
+        self._signature = None
+        self._pending = []
+
+
+_history_repository = None
+
+
+def get_history_repository():
+    """
+    Get the process-wide quiz history repository
+    
+    Returns:
+        HistoryRepository for the current history file
+    """
+    global _history_repository
+    filepath = get_data_path('quiz_history.csv')
+    if _history_repository is None or _history_repository.filepath != filepath:
+        _history_repository = HistoryRepository(filepath)
+    return _history_repository
+
+
 def load_quiz_history():
     """
     Load quiz history from CSV into pandas DataFrame
+    Served from the session cache; the file is only parsed when it changed
     
     Returns:
         DataFrame with quiz history or empty DataFrame
     """
-    filepath = get_data_path('quiz_history.csv')
+    if config.use_sqlite():
+        from utils import sqlite_store
+        return sqlite_store.load_history()
     
-    try:
-        # Read CSV into DataFrame
-        df = pd.read_csv(filepath)
-        return df
-    except FileNotFoundError:
-        # Return empty DataFrame with correct columns
-        return pd.DataFrame(columns=[
-            'user_id', 'username', 'date', 'time', 'category', 
-            'difficulty', 'total_questions', 'correct', 'wrong', 
-            'score', 'percentage', 'time_taken', 'mode'
-        ])
-    except Exception as e:
-        print(f"Error loading quiz history: {e}")
-        return pd.DataFrame()
+    return get_history_repository().load()
 
 
 def save_quiz_history(df):
@@ -54,17 +140,128 @@ def save_quiz_history(df):
     filepath = get_data_path('quiz_history.csv')
     
     try:
+        if config.use_sqlite():
+            from utils import sqlite_store
+            sqlite_store.replace_history(df)
+            return True
         df.to_csv(filepath, index=False)
+        get_history_repository().invalidate()
         return True
     except Exception as e:
         print(f"Error saving quiz history: {e}")
         return False
 
 
+def _scan_max_attempt_id(filepath):
+    """
+    Find the highest user_id in a history file without loading it into pandas
+    Only used once, to seed the attempt id counter for an existing history file
+    """
+    max_id = 0
+    try:
+        with open(filepath, 'r', encoding='utf-8', newline='') as file:
+            for row in csv.DictReader(file):
+                try:
+                    max_id = max(max_id, int(float(row.get('user_id') or 0)))
+                except ValueError:
+                    continue
+    except FileNotFoundError:
+        pass
+    return max_id
+
+
+def allocate_attempt_id():
+    """
+    Allocate the next attempt id from the persisted counter
+    Caller must hold the quiz history file lock
+    
+    Returns:
+        New monotonic attempt id (stored in the user_id column)
+    """
+    history_path = get_data_path('quiz_history.csv')
+    counter_path = get_data_path('quiz_history.seq')
+    
+    last_id = file_handler.read_counter(counter_path, default=None)
+    if last_id is None:
+        last_id = _scan_max_attempt_id(history_path)
+    
+    next_id = last_id + 1
+    file_handler.write_counter(counter_path, next_id)
+    return next_id
+
+
+def history_lock():
+    """
+    Lock held while an attempt is written and the aggregates derived from
+    history (user_stats, leaderboard) are brought up to date
+    
+    Not re-entrant: code running under it passes locked=True where offered.
+    
+    Returns:
+        Context manager holding the quiz history file lock
+    """
+    return file_handler.file_lock(get_data_path('quiz_history.csv'))
+
+
+def get_last_attempt_id(locked=False):
+    """
+    Get the id of the most recently recorded attempt
+    
+    Without the history lock an id may already be allocated to an attempt
+    that is still being written; under the lock every id up to it is written.
+    
+    Args:
+        locked: Caller already holds history_lock()
+    
+    Returns:
+        Last allocated attempt id (0 if no attempts recorded)
+    """
+    if config.use_sqlite():
+        from utils import sqlite_store
+        return sqlite_store.get_last_attempt_id()
+    
+    counter_path = get_data_path('quiz_history.seq')
+    last_id = file_handler.read_counter(counter_path, default=None)
+    if last_id is not None:
+        return last_id
+    
+    # No counter yet: seed it once so later reads stay O(1)
+    if not locked:
+        with history_lock():
+            return get_last_attempt_id(locked=True)
+    
+    last_id = _scan_max_attempt_id(get_data_path('quiz_history.csv'))
+    file_handler.write_counter(counter_path, last_id)
+    return last_id
+
+
+def load_attempts_after(last_id):
+    """
+    Load the attempts recorded after an attempt id, oldest first
+    Used to bring the aggregates up to date without rebuilding them
+    
+    Args:
+        last_id: Last attempt id already counted
+    
+    Returns:
+        DataFrame with the newer attempts
+    """
+    if config.use_sqlite():
+        from utils import sqlite_store
+        return sqlite_store.load_history_after(last_id)
+    
+    df = load_quiz_history()
+    if df.empty:
+        return df
+    ids = pd.to_numeric(df['user_id'], errors='coerce')
+    newer = ids > last_id
+    return df[newer].iloc[ids[newer].argsort(kind='stable')]
+
+
 def add_quiz_attempt(username, category, difficulty, total_questions, 
                      correct, wrong, score, percentage, time_taken, mode):
     """
-    Add a new quiz attempt to history using pandas
+    Append a new quiz attempt to history without rewriting the file
     
     Args:
         username: Username
@@ -81,15 +278,14 @@ def add_quiz_attempt(username, category, difficulty, total_questions,
     Returns:
         True if successful, False otherwise
     """
-    # Load existing data
-    df = load_quiz_history()
+    filepath = get_data_path('quiz_history.csv')
+    now = datetime.now()
     
     # Create new attempt data
     new_attempt = {
-        'user_id': len(df) + 1,
         'username': username,
-        'date': datetime.now().strftime('%Y-%m-%d'),
-        'time': datetime.now().strftime('%H:%M:%S'),
+        'date': now.strftime('%Y-%m-%d'),
+        'time': now.strftime('%H:%M:%S'),
         'category': category,
         'difficulty': difficulty,
         'total_questions': total_questions,
@@ -101,11 +297,38 @@ def add_quiz_attempt(username, category, difficulty, total_questions,
         'mode': mode
     }
     
-    # Append new attempt using pd.concat
-    df = pd.concat([df, pd.DataFrame([new_attempt])], ignore_index=True)
+    from utils import user_stats, leaderboard
+    
+    # Write the attempt and update the aggregates under one lock, so attempts
+    # reach the aggregates in id order and readers never see an unwritten id
+    with history_lock():
+        if config.use_sqlite():
+            from utils import sqlite_store
+            try:
+                new_attempt['user_id'] = sqlite_store.insert_attempt(new_attempt)
+                saved = True
+            except Exception as e:
+                print(f"Error saving quiz attempt: {e}")
+                saved = False
+        else:
+            new_attempt['user_id'] = allocate_attempt_id()
+            signature_before = file_handler.get_file_signature(filepath)
+            saved = file_handler.append_csv(filepath, new_attempt, HISTORY_COLUMNS)
+            
+            # Update the session cache in place instead of re-parsing the file
+            repository = get_history_repository()
+            if saved:
+                repository.record_append(new_attempt, signature_before,
+                                         file_handler.get_file_signature(filepath))
+            else:
+                repository.invalidate()
+        
+        if saved:
+            # Keep the materialized per-user statistics and leaderboard in step
+            user_stats.record_attempt(new_attempt)
+            leaderboard.record_attempt(new_attempt)
     
-    # Save updated DataFrame
-    return save_quiz_history(df)
+    return saved
 
 
 def get_user_history(username):
@@ -118,6 +341,10 @@ def get_user_history(username):
     Returns:
         DataFrame with user's quiz history
     """
+    if config.use_sqlite():
+        from utils import sqlite_store
+        return sqlite_store.load_history(username)
+    
     df = load_quiz_history()
     
     if df.empty:
@@ -138,15 +365,11 @@ def get_category_statistics(username=None):
     Returns:
         Series with average percentage by category
     """
-    df = load_quiz_history()
+    df = get_user_history(username) if username else load_quiz_history()
     
     if df.empty:
         return pd.Series()
     
-    # Filter by username if provided
-    if username:
-        df = df[df['username'] == username]
-    
     # Group by category and calculate mean percentage
     category_stats = df.groupby('category')['percentage'].mean()
     return category_stats
@@ -162,15 +385,11 @@ def get_difficulty_statistics(username=None):
     Returns:
         DataFrame with statistics by difficulty
     """
-    df = load_quiz_history()
+    df = get_user_history(username) if username else load_quiz_history()
     
     if df.empty:
         return pd.DataFrame()
     
-    # Filter by username if provided
-    if username:
-        df = df[df['username'] == username]
-    
     # Group by difficulty and calculate stats
     difficulty_stats = df.groupby('difficulty').agg({
         'percentage': ['mean', 'count'],
@@ -191,6 +410,18 @@ def get_top_scores(limit=10):
     Returns:
         DataFrame with top scores
     """
+    columns = ['username', 'category', 'score', 'percentage', 'date', 'difficulty']
+    
+    # Served from the persisted top-K leaderboard when it is big enough
+    if limit <= config.LEADERBOARD_SIZE:
+        from utils import leaderboard
+        entries = leaderboard.get_top_entries(limit)
+        return pd.DataFrame(entries, columns=columns)
+    
+    if config.use_sqlite():
+        from utils import sqlite_store
+        return sqlite_store.top_scores(limit)
+    
     df = load_quiz_history()
     
     if df.empty:
@@ -198,7 +429,7 @@ def get_top_scores(limit=10):
     
     # Sort by score descending and get top N
     top_scores = df.nlargest(limit, 'score')
-    return top_scores[['username', 'category', 'score', 'percentage', 'date', 'difficulty']]
+    return top_scores[columns]
 
 
 def get_user_stats_summary(username):
@@ -211,9 +442,13 @@ def get_user_stats_summary(username):
     Returns:
         Dictionary with various statistics
     """
-    df = get_user_history(username)
+    from utils import user_stats
     
-    if df.empty:
+    # Served from the materialized per-user aggregates, independent of history size
+    record = user_stats.get_user_stats(username)
+    total = record['total_quizzes']
+    
+    if total == 0:
         return {
             'total_quizzes': 0,
             'average_score': 0.0,
@@ -225,16 +460,15 @@ def get_user_stats_summary(username):
             'most_attempted_category': 'None'
         }
     
-    # Calculate statistics using pandas functions
     stats = {
-        'total_quizzes': len(df),
-        'average_score': df['score'].mean(),
-        'average_percentage': df['percentage'].mean(),
-        'best_score': df['score'].max(),
-        'best_percentage': df['percentage'].max(),
-        'total_correct': df['correct'].sum(),
-        'total_questions': df['total_questions'].sum(),
-        'most_attempted_category': df['category'].mode()[0] if not df['category'].mode().empty else 'None'
+        'total_quizzes': total,
+        'average_score': record['sum_score'] / total,
+        'average_percentage': record['sum_percentage'] / total,
+        'best_score': record['best_score'],
+        'best_percentage': record['best_percentage'],
+        'total_correct': record['total_correct'],
+        'total_questions': record['total_questions'],
+        'most_attempted_category': user_stats.most_common(record['by_category'])
     }
     
     return stats
@@ -368,6 +602,10 @@ def load_users():
     Returns:
         DataFrame with user data
     """
+    if config.use_sqlite():
+        from utils import sqlite_store
+        return sqlite_store.load_users()
+    
     filepath = get_data_path('users.csv')
     
     try:
@@ -393,6 +631,10 @@ def save_users(df):
     filepath = get_data_path('users.csv')
     
     try:
+        if config.use_sqlite():
+            from utils import sqlite_store
+            sqlite_store.replace_users(df)
+            return True
         df.to_csv(filepath, index=False)
         return True
     except Exception as e:
@@ -411,6 +653,10 @@ def add_user(username, password):
     Returns:
         True if successful, False if user exists
     """
+    if config.use_sqlite():
+        from utils import sqlite_store
+        return sqlite_store.insert_user(username, password, datetime.now().strftime('%Y-%m-%d'))
+    
     df = load_users()
     
     # Check if username already exists
@@ -442,6 +688,10 @@ def validate_user(username, password):
     Returns:
         True if valid, False otherwise
     """
+    if config.use_sqlite():
+        from utils import sqlite_store
+        return sqlite_store.validate_user(username, password)
+    
     df = load_users()
     
     if df.empty:
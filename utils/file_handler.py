@@ -7,7 +7,15 @@ with comprehensive error handling
 import json
 import csv
 import os
+from contextlib import contextmanager
 from datetime import datetime
+from utils import config
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
 
 
 def load_json(filepath):
@@ -55,6 +63,105 @@ def save_json(filepath, data):
         return False
 
 
+def save_json_atomic(filepath, data):
+    """
+    Save data to a JSON file by writing a temp file and renaming it
+    Readers never see a half-written file
+    
+    Args:
+        filepath: Path to the JSON file
+        data: Data to save (list or dict)
+        
+    Returns:
+        True if successful, False otherwise
+    """
+    tmp_path = filepath + '.tmp'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(data, file, ensure_ascii=False)
+        os.replace(tmp_path, filepath)
+        return True
+    except Exception as e:
+        print(f"Error saving to {filepath}: {e}")
+        return False
+
+
+def get_file_signature(filepath):
+    """
+    Cheap file version check used by in-memory caches
+    
+    The inode and ctime catch a file replaced with os.replace() by another
+    process within the same mtime tick at the same size.
+    
+    Args:
+        filepath: Path to the file (or the descriptor of an open file)
+        
+    Returns:
+        (mtime_ns, size, inode, ctime_ns) tuple, or None if the file doesn't exist
+    """
+    try:
+        stat = os.stat(filepath)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino, stat.st_ctime_ns)
+
+
+class JsonFileCache:
+    """
+    In-memory copies of JSON data files, reloaded only when a file changes
+    
+    Each file is keyed by its path and checked against its signature on
+    every load, so writes from other processes are picked up.
+    """
+    
+    def __init__(self, default_factory, is_valid=None):
+        """
+        Args:
+            default_factory: Returns the data to use when a file is missing or invalid
+            is_valid: Optional check applied to loaded data
+        """
+        self.default_factory = default_factory
+        self.is_valid = is_valid
+        self._entries = {}
+    
+    def load(self, filepath):
+        """
+        Load a JSON file, reusing the in-memory copy if unchanged
+        
+        Args:
+            filepath: Path to the JSON file
+            
+        Returns:
+            Parsed data, or default_factory() if the file is missing or invalid
+        """
+        signature = get_file_signature(filepath)
+        entry = self._entries.get(filepath)
+        if signature is not None and entry is not None and entry[0] == signature:
+            return entry[1]
+        
+        data = load_json(filepath) if signature is not None else None
+        if data is None or (self.is_valid is not None and not self.is_valid(data)):
+            data = self.default_factory()
+        
+        self._entries[filepath] = (signature, data)
+        return data
+    
+    def save(self, filepath, data):
+        """
+        Persist a JSON file atomically and refresh the in-memory copy
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        saved = save_json_atomic(filepath, data)
+        self._entries[filepath] = (get_file_signature(filepath) if saved else None, data)
+        return saved
+    
+    def invalidate(self):
+        """Force every file to be re-read on next access"""
+        self._entries.clear()
+
+
 def load_csv(filepath):
     """
     Load data from a CSV file
@@ -111,6 +218,21 @@ def append_csv(filepath, data, fieldnames):
         data: Dictionary representing one row
         fieldnames: List of field names (column headers)
         
+    Returns:
+        True if successful, False otherwise
+    """
+    return append_csv_rows(filepath, [data], fieldnames)
+
+
+def append_csv_rows(filepath, rows, fieldnames):
+    """
+    Append several rows to a CSV file in a single write
+    
+    Args:
+        filepath: Path to the CSV file
+        rows: List of dictionaries, one per row
+        fieldnames: List of field names (column headers)
+        
     Returns:
         True if successful, False otherwise
     """
@@ -118,17 +240,88 @@ def append_csv(filepath, data, fieldnames):
         # Check if file exists to determine if we need to write headers
         file_exists = os.path.exists(filepath) and os.path.getsize(filepath) > 0
         
+        # Guard against a previous writer leaving the last line unterminated
+        needs_newline = False
+        if file_exists:
+            with open(filepath, 'rb') as file:
+                file.seek(-1, os.SEEK_END)
+                needs_newline = file.read(1) not in (b'\n', b'\r')
+        
         with open(filepath, 'a', encoding='utf-8', newline='') as file:
+            if needs_newline:
+                file.write('\n')
             writer = csv.DictWriter(file, fieldnames=fieldnames)
             if not file_exists:
                 writer.writeheader()
-            writer.writerow(data)
+            writer.writerows(rows)
         return True
     except Exception as e:
         print(f"Error appending to {filepath}: {e}")
         return False
 
 
+@contextmanager
+def file_lock(filepath):
+    """
+    Hold an exclusive inter-process lock for a data file
+    
+    Uses a sidecar "<filepath>.lock" file so the data file itself can be
+    replaced or appended to while the lock is held.
+    
+    Args:
+        filepath: Path to the file being protected
+    """
+    lock_path = filepath + '.lock'
+    os.makedirs(os.path.dirname(lock_path) or '.', exist_ok=True)
+    
+    with open(lock_path, 'a+') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def read_counter(filepath, default=0):
+    """
+    Read an integer counter file
+    
+    Args:
+        filepath: Path to the counter file
+        default: Value returned if the file is missing or unreadable
+        
+    Returns:
+        Stored integer value
+    """
+    try:
+        with open(filepath, 'r', encoding='utf-8') as file:
+            return int(file.read().strip())
+    except (FileNotFoundError, ValueError):
+        return default
+
+
+def write_counter(filepath, value):
+    """
+    Atomically replace an integer counter file
+    
+    Args:
+        filepath: Path to the counter file
+        value: Integer value to store
+    """
+    tmp_path = filepath + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as file:
+        file.write(str(int(value)))
+    os.replace(tmp_path, filepath)
+
+
 def ensure_file_exists(filepath, default_content=""):
     """
     Ensure a file exists, create it with default content if it doesn't
@@ -162,10 +355,7 @@ def get_user_data_path(filename):
     Returns:
         Full path to the file in the data directory
     """
-    # Get the directory of this script
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    # Go up one level and into data directory
-    data_dir = os.path.join(os.path.dirname(current_dir), 'data')
+    data_dir = config.get_data_dir()
     return os.path.join(data_dir, filename)
 
 
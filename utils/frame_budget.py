@@ -0,0 +1,83 @@
+"""
+Frame Budget Module
+Frame-time measurement and adaptive pacing for after()-driven animations
+
+An animation calls begin_frame() at the start of each tick and end_frame()
+after its work. The budget tracks the measured FPS and dropped frames,
+lowers the frame rate while ticks arrive late, and reports how far the
+frame's work went over its time budget so the animation can shed load
+(e.g. fewer particles). Keeping each tick's work inside the budget bounds
+how long an animation can hold up other after() callbacks such as quiz timers.
+"""
+
+import time
+
+
+class FrameBudget:
+    def __init__(self, target_ms=30, work_budget_ms=8, max_interval_ms=100):
+        """
+        Args:
+            target_ms: Desired frame interval in milliseconds
+            work_budget_ms: Maximum time one frame's work should take
+            max_interval_ms: Slowest frame interval the budget will back off to
+        """
+        self.target_ms = target_ms
+        self.work_budget_ms = work_budget_ms
+        self.max_interval_ms = max_interval_ms
+        self.interval_ms = target_ms
+        
+        self.frames = 0
+        self.dropped_frames = 0
+        self.fps = 1000.0 / target_ms
+        self.last_work_ms = 0.0
+        
+        self._frame_start = None
+        self._late_streak = 0
+        self._on_time_streak = 0
+    
+    def begin_frame(self):
+        """
+        Mark the start of a frame
+        
+        Returns:
+            Milliseconds since the previous frame started (interval_ms for the first frame)
+        """
+        now = time.perf_counter()
+        if self._frame_start is None:
+            elapsed_ms = float(self.interval_ms)
+        else:
+            elapsed_ms = (now - self._frame_start) * 1000
+            
+            # Frames that should have been drawn in the gap
+            self.dropped_frames += max(0, int(elapsed_ms / self.interval_ms + 0.5) - 1)
+            self.fps = 0.8 * self.fps + 0.2 * (1000.0 / max(elapsed_ms, 1e-3))
+            self._adapt_interval(elapsed_ms)
+        
+        self._frame_start = now
+        self.frames += 1
+        return elapsed_ms
+    
+    def end_frame(self):
+        """
+        Mark the end of a frame's work
+        
+        Returns:
+            Load factor: work time divided by the work budget (above 1 means shed load)
+        """
+        self.last_work_ms = (time.perf_counter() - self._frame_start) * 1000
+        return self.last_work_ms / self.work_budget_ms
+    
+    def _adapt_interval(self, elapsed_ms):
+        """Slow down while ticks keep arriving late, speed back up once they are on time"""
+        if elapsed_ms > self.interval_ms * 1.5:
+            self._late_streak += 1
+            self._on_time_streak = 0
+            if self._late_streak >= 3:
+                self.interval_ms = min(self.max_interval_ms, int(self.interval_ms * 1.25) + 1)
+                self._late_streak = 0
+        else:
+            self._on_time_streak += 1
+            self._late_streak = 0
+            if self._on_time_streak >= 10 and self.interval_ms > self.target_ms:
+                self.interval_ms = max(self.target_ms, int(self.interval_ms * 0.9))
+                self._on_time_streak = 0
@@ -0,0 +1,196 @@
+"""
+Leaderboard Module
+Persisted top-K leaderboard (highest scores across all users)
+Kept as a bounded sorted list in data/leaderboard.json and updated per attempt
+
+Entries are ordered by score (descending), then by attempt id, so ties keep
+the order they were recorded in, the same as DataFrame.nlargest.
+
+Run "python -m utils.leaderboard rebuild" to rebuild it from history.
+"""
+
+import os
+import sys
+from bisect import bisect_right
+from utils import file_handler, config
+
+
+ENTRY_COLUMNS = ['user_id', 'username', 'category', 'score', 'percentage', 'date', 'difficulty']
+
+
+def _new_leaderboard():
+    return {'last_attempt_id': -1, 'size': 0, 'entries': []}
+
+
+# In-memory copy of the leaderboard file, reloaded when the file changes
+_cache = file_handler.JsonFileCache(_new_leaderboard, lambda data: isinstance(data, dict) and 'entries' in data)
+
+
+def get_leaderboard_path():
+    """Get path to the leaderboard JSON file"""
+    data_dir = config.get_data_dir()
+    return os.path.join(data_dir, 'leaderboard.json')
+
+
+def _sort_key(entry):
+    """Leaderboard order: highest score first, earlier attempts win ties"""
+    return (-entry['score'], entry['user_id'])
+
+
+def _make_entry(attempt):
+    """Keep only the columns the leaderboard displays"""
+    entry = {column: attempt.get(column) for column in ENTRY_COLUMNS}
+    entry['user_id'] = int(entry['user_id'] or 0)
+    entry['score'] = int(entry['score'])
+    entry['percentage'] = float(entry['percentage'])
+    return entry
+
+
+def insert_entry(entries, entry, size):
+    """
+    Insert an entry into a sorted, bounded entry list
+    
+    Args:
+        entries: Sorted list of entries (modified in place)
+        entry: Entry to insert
+        size: Maximum number of entries to keep
+    
+    Returns:
+        True if the entry made it onto the leaderboard
+    """
+    key = _sort_key(entry)
+    
+    # Full board and not better than the last entry: nothing to do
+    if len(entries) >= size and key >= _sort_key(entries[-1]):
+        return False
+    
+    keys = [_sort_key(e) for e in entries]
+    entries.insert(bisect_right(keys, key), entry)
+    del entries[size:]
+    return True
+
+
+def _load():
+    """Load the leaderboard file, reusing the in-memory copy if unchanged"""
+    return _cache.load(get_leaderboard_path())
+
+
+def _save(data):
+    """Persist the leaderboard file and refresh the in-memory copy"""
+    _cache.save(get_leaderboard_path(), data)
+
+
+def rebuild_leaderboard(size=None):
+    """
+    Rebuild the leaderboard from quiz history and persist it
+    
+    Args:
+        size: Number of entries to keep (defaults to config.LEADERBOARD_SIZE)
+    
+    Returns:
+        Number of entries on the rebuilt leaderboard
+    """
+    from utils import data_manager
+    
+    with data_manager.history_lock():
+        return _rebuild_locked(size or config.LEADERBOARD_SIZE)
+
+
+def _rebuild_locked(size):
+    """Rebuild the leaderboard from history (caller holds data_manager.history_lock())"""
+    from utils import data_manager
+    
+    last_id = data_manager.get_last_attempt_id(locked=True)
+    history = data_manager.load_quiz_history()
+    
+    entries = []
+    if not history.empty:
+        top = history.nlargest(size, 'score')
+        entries = [_make_entry(row) for row in top.to_dict('records')]
+        entries.sort(key=_sort_key)
+    
+    _save({'last_attempt_id': last_id, 'size': size, 'entries': entries})
+    return len(entries)
+
+
+def _catch_up_locked():
+    """
+    Bring the leaderboard up to date with history
+    
+    Only the attempts after the last one included are merged into the bounded
+    list. A full rebuild is left for a missing leaderboard, a changed size or
+    one ahead of history (history replaced).
+    Caller holds data_manager.history_lock(), so every id is fully written.
+    """
+    from utils import data_manager
+    
+    last_written = data_manager.get_last_attempt_id(locked=True)
+    data = _load()
+    last_id = data.get('last_attempt_id', -1)
+    if data.get('size') != config.LEADERBOARD_SIZE or last_id < 0 or last_id > last_written:
+        _rebuild_locked(config.LEADERBOARD_SIZE)
+        return
+    if last_id == last_written:
+        return
+    
+    for attempt in data_manager.load_attempts_after(last_id).to_dict('records'):
+        insert_entry(data['entries'], _make_entry(attempt), data['size'])
+    data['last_attempt_id'] = last_written
+    _save(data)
+
+
+def record_attempt(attempt):
+    """
+    Offer a newly recorded attempt to the leaderboard
+    Caller holds data_manager.history_lock() (see data_manager.add_quiz_attempt)
+    
+    Args:
+        attempt: Dictionary with quiz history columns, including its user_id
+    """
+    attempt_id = int(attempt['user_id'])
+    data = _load()
+    last_id = data.get('last_attempt_id', -1)
+    
+    if last_id >= attempt_id:
+        # Already included (e.g. by a rebuild)
+        return
+    
+    if last_id != attempt_id - 1 or data.get('size') != config.LEADERBOARD_SIZE:
+        # Earlier attempts were not included, or the size setting changed
+        _catch_up_locked()
+        return
+    
+    insert_entry(data['entries'], _make_entry(attempt), data['size'])
+    data['last_attempt_id'] = attempt_id
+    _save(data)
+
+
+def get_top_entries(limit=10):
+    """
+    Get the top leaderboard entries, catching up with history first if behind
+    Reads are O(limit) once the leaderboard is current
+    
+    Args:
+        limit: Number of entries to return (at most config.LEADERBOARD_SIZE)
+    
+    Returns:
+        List of entry dictionaries, best first
+    """
+    from utils import data_manager
+    
+    data = _load()
+    if (data.get('last_attempt_id') != data_manager.get_last_attempt_id()
+            or data.get('size') != config.LEADERBOARD_SIZE):
+        # Waits for an attempt still being written rather than treating it as missing
+        with data_manager.history_lock():
+            _catch_up_locked()
+        data = _load()
+    
+    return data['entries'][:limit]
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == 'rebuild':
+        print(f"Leaderboard rebuilt with {rebuild_leaderboard()} entries")
+    else:
+        print("Usage: python -m utils.leaderboard rebuild")
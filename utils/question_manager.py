@@ -5,26 +5,222 @@ Handles question loading, filtering, and randomization
 
 import random
 import os
-from utils.file_handler import load_json
+import threading
+from utils import config
+from utils.file_handler import load_json, get_file_signature
 
 
 def get_questions_path():
     """Get path to questions.json file"""
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    data_dir = os.path.join(os.path.dirname(current_dir), 'data')
+    data_dir = config.get_data_dir()
     return os.path.join(data_dir, 'questions.json')
 
 
+class StaleSnapshotError(Exception):
+    """The questions file changed on disk after a snapshot of it was taken"""
+
+
+class QuestionBankSnapshot:
+    """
+    One loaded version of the question bank
+    
+    Positions from positions() are only meaningful to select() on the same
+    snapshot, so callers take a snapshot once and use it for both.
+    """
+    
+    def __init__(self, questions, index):
+        self.questions = questions
+        self.index = index
+    
+    def positions(self, category=None, difficulty=None):
+        """
+        Get positions of questions matching the criteria
+        
+        Returns:
+            Shared list of indexes into questions (treat as read-only)
+        """
+        return self.index.get((category or None, difficulty or None), [])
+    
+    def select(self, positions):
+        """Get the questions at the given positions"""
+        return [self.questions[i] for i in positions]
+
+
+class QuestionBank:
+    """
+    In-memory copy of the question bank
+    Parses the JSON file once and re-parses only when the file changes
+    """
+    
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.questions = []
+        self.categories = []
+        self.index = {}
+        self._snapshot = QuestionBankSnapshot([], {})
+        self._signature = None
+        self._lock = threading.Lock()
+    
+    def _stat_signature(self):
+        """Cheap file version check (mtime, size and inode), None if file is missing"""
+        return get_file_signature(self.filepath)
+    
+    def refresh(self):
+        """Reload the file if it changed since the last load"""
+        signature = self._stat_signature()
+        if signature is not None and signature == self._signature:
+            return
+        
+        with self._lock:
+            # Another thread may have reloaded while we waited
+            if signature is not None and signature == self._signature:
+                return
+            questions = load_json(self.filepath) if signature is not None else []
+            self.questions = questions if questions else []
+            self._build_index()
+            self._signature = signature
+    
+    def _build_index(self):
+        """
+        Map (category, difficulty) selectors to lists of question positions
+        
+        None in a key acts as a wildcard, so (category, None), (None, difficulty),
+        (category, difficulty) and (None, None) are all answered by a lookup.
+        """
+        index = {(None, None): list(range(len(self.questions)))}
+        
+        for position, q in enumerate(self.questions):
+            category = q.get('category') or None
+            difficulty = q.get('difficulty') or None
+            keys = []
+            if category:
+                keys.append((category, None))
+            if difficulty:
+                keys.append((None, difficulty))
+            if category and difficulty:
+                keys.append((category, difficulty))
+            for key in keys:
+                index.setdefault(key, []).append(position)
+        
+        self.index = index
+        self.categories = sorted(key[0] for key in index if key[0] and key[1] is None)
+        self._snapshot = QuestionBankSnapshot(self.questions, index)
+    
+    def snapshot(self):
+        """
+        Get the current version of the bank, revalidating against the file first
+        
+        Returns:
+            QuestionBankSnapshot that later reloads leave unchanged
+        """
+        self.refresh()
+        return self._snapshot
+    
+    def get_questions(self):
+        """
+        Get all questions, revalidating against the file first
+        
+        Returns:
+            Shared list of question dictionaries (treat as read-only)
+        """
+        return self.snapshot().questions
+    
+    def positions(self, category=None, difficulty=None):
+        """
+        Get positions of questions matching the criteria (see snapshot())
+        
+        Returns:
+            Shared list of indexes into questions (treat as read-only)
+        """
+        return self.snapshot().positions(category, difficulty)
+    
+    def select(self, positions):
+        """Get the questions at the given positions of the current snapshot"""
+        return self._snapshot.select(positions)
+    
+    def invalidate(self):
+        """Force a reload on next access"""
+        self._signature = None
+
+
+_question_bank = None
+_warned_stale_jsonl = None
+
+
+def _warn_if_jsonl_stale(jsonl_path):
+    """Warn (once per edit) when questions.json was changed after questions.jsonl"""
+    global _warned_stale_jsonl
+    json_signature = get_file_signature(get_questions_path())
+    jsonl_signature = get_file_signature(jsonl_path)
+    if json_signature is None or jsonl_signature is None:
+        return
+    if json_signature[0] > jsonl_signature[0] and json_signature != _warned_stale_jsonl:
+        _warned_stale_jsonl = json_signature
+        print(f"Warning: questions.json is newer than {jsonl_path}; "
+              f"run 'python -m utils.question_store convert' to use the edits")
+
+
+def get_question_bank():
+    """
+    Get the process-wide question bank
+    
+    questions.json is used unless config.QUESTION_STORE selects 'jsonl', in
+    which case questions.jsonl (see utils.question_store) is indexed once and
+    questions are read on demand.
+    
+    Returns:
+        QuestionBank or JsonlQuestionBank for the current questions file
+    """
+    global _question_bank
+    
+    filepath = get_questions_path()
+    bank_class = QuestionBank
+    if config.use_jsonl_questions():
+        from utils import question_store
+        jsonl_path = question_store.get_jsonl_path()
+        if os.path.exists(jsonl_path):
+            _warn_if_jsonl_stale(jsonl_path)
+            filepath = jsonl_path
+            bank_class = question_store.JsonlQuestionBank
+        elif _question_bank is None or _question_bank.filepath != filepath:
+            print(f"Warning: {jsonl_path} not found, using questions.json")
+    
+    if _question_bank is None or _question_bank.filepath != filepath:
+        _question_bank = bank_class(filepath)
+    return _question_bank
+
+
+def _from_snapshot(pick):
+    """
+    Run pick(snapshot) on the current question bank
+    
+    The positions pick chooses and the questions it reads come from the same
+    snapshot. If the file is replaced before they are read (JSON Lines banks
+    read on demand), pick runs again on the reloaded bank.
+    
+    Args:
+        pick: Function taking a snapshot and returning the selected questions
+    
+    Returns:
+        Whatever pick returns
+    """
+    bank = get_question_bank()
+    for _ in range(2):
+        try:
+            return pick(bank.snapshot())
+        except StaleSnapshotError:
+            pass
+    return pick(bank.snapshot())
+
+
 def load_all_questions():
     """
-    Load all questions from JSON file
+    Load all questions from JSON file (served from the in-memory bank)
     
     Returns:
         List of question dictionaries
     """
-    filepath = get_questions_path()
-    questions = load_json(filepath)
-    return questions if questions else []
+    return get_question_bank().get_questions()
 
 
 def filter_questions(category=None, difficulty=None):
@@ -38,17 +234,7 @@ def filter_questions(category=None, difficulty=None):
     Returns:
         List of filtered questions
     """
-    all_questions = load_all_questions()
-    
-    filtered = all_questions
-    
-    if category:
-        filtered = [q for q in filtered if q.get('category') == category]
-    
-    if difficulty:
-        filtered = [q for q in filtered if q.get('difficulty') == difficulty]
-    
-    return filtered
+    return _from_snapshot(lambda snapshot: snapshot.select(snapshot.positions(category, difficulty)))
 
 
 def get_random_questions(category, difficulty, count):
@@ -63,14 +249,16 @@ def get_random_questions(category, difficulty, count):
     Returns:
         List of random questions (no duplicates)
     """
-    questions = filter_questions(category, difficulty)
-    
-    # If requested count exceeds available questions, return all available
-    if len(questions) <= count:
-        return random.sample(questions, len(questions))
+    def pick(snapshot):
+        positions = snapshot.positions(category, difficulty)
+        
+        # If requested count exceeds available questions, return all available
+        wanted = min(count, len(positions))
+        
+        # Sample positions without replacement, then materialize only those questions
+        return snapshot.select(random.sample(positions, wanted))
     
-    # Return random sample without replacement
-    return random.sample(questions, count)
+    return _from_snapshot(pick)
 
 
 def get_mixed_difficulty_questions(category, count):
@@ -90,25 +278,21 @@ def get_mixed_difficulty_questions(category, count):
     medium_count = int(count * 0.4)
     hard_count = count - easy_count - medium_count
     
-    questions = []
-    
-    # Get questions for each difficulty
-    easy_q = filter_questions(category, 'Easy')
-    medium_q = filter_questions(category, 'Medium')
-    hard_q = filter_questions(category, 'Hard')
-    
-    # Add random questions from each difficulty
-    if easy_q:
-        questions.extend(random.sample(easy_q, min(easy_count, len(easy_q))))
-    if medium_q:
-        questions.extend(random.sample(medium_q, min(medium_count, len(medium_q))))
-    if hard_q:
-        questions.extend(random.sample(hard_q, min(hard_count, len(hard_q))))
-    
-    # Shuffle the combined list
-    random.shuffle(questions)
+    def pick(snapshot):
+        positions = []
+        
+        # Add random questions from each difficulty using the index
+        for difficulty, wanted in [('Easy', easy_count), ('Medium', medium_count), ('Hard', hard_count)]:
+            available = snapshot.positions(category, difficulty)
+            if available:
+                positions.extend(random.sample(available, min(wanted, len(available))))
+        
+        # Shuffle the combined list
+        random.shuffle(positions)
+        
+        return snapshot.select(positions[:count])
     
-    return questions[:count]
+    return _from_snapshot(pick)
 
 
 def get_categories():
@@ -118,9 +302,9 @@ def get_categories():
     Returns:
         List of category names
     """
-    questions = load_all_questions()
-    categories = list(set(q.get('category') for q in questions if q.get('category')))
-    return sorted(categories)
+    bank = get_question_bank()
+    bank.refresh()
+    return list(bank.categories)
 
 
 def get_difficulties():
@@ -144,8 +328,7 @@ def count_questions(category=None, difficulty=None):
     Returns:
         Number of matching questions
     """
-    questions = filter_questions(category, difficulty)
-    return len(questions)
+    return len(get_question_bank().snapshot().positions(category, difficulty))
 
 
 def validate_question(question):
@@ -182,22 +365,21 @@ def get_question_stats():
     Returns:
         Dictionary with question statistics
     """
-    questions = load_all_questions()
+    # Counts come from the index, so questions are never loaded just to be counted
+    total = count_questions()
     
-    if not questions:
+    if not total:
         return {}
     
     stats = {
-        'total': len(questions),
+        'total': total,
         'by_category': {},
         'by_difficulty': {}
     }
     
-    # Count by category
     for category in get_categories():
         stats['by_category'][category] = count_questions(category=category)
     
-    # Count by difficulty
     for difficulty in get_difficulties():
         stats['by_difficulty'][difficulty] = count_questions(difficulty=difficulty)
     
@@ -0,0 +1,352 @@
+"""
+Question Store Module
+JSON Lines question bank with a byte-offset sidecar index
+
+questions.jsonl holds one question object per line. The sidecar index
+(questions.jsonl.idx) records, for every line, its start and end byte
+offsets and its category and difficulty codes, packed as binary arrays. Loading the bank
+reads only the index, so startup time and memory stay small as the bank
+grows: the selected questions are read on demand with seek().
+
+Convert the existing questions.json once, then select this store with
+QUIZ_QUESTION_STORE=jsonl (config.QUESTION_STORE):
+    python -m utils.question_store convert
+"""
+
+import os
+import sys
+import json
+import threading
+from array import array
+from utils import config
+from utils.file_handler import load_json, get_file_signature
+from utils.question_manager import StaleSnapshotError
+
+
+INDEX_MAGIC = b'QIDX2\n'
+
+
+def get_jsonl_path():
+    """Get path to the JSON Lines question bank"""
+    data_dir = config.get_data_dir()
+    return os.path.join(data_dir, 'questions.jsonl')
+
+
+def get_index_path(jsonl_path):
+    """Get path to the sidecar index for a JSON Lines question bank"""
+    return jsonl_path + '.idx'
+
+
+class QuestionIndex:
+    """
+    Per-record byte ranges plus category and difficulty codes
+    
+    Record i spans offsets[i] to ends[i]. Lines that were skipped (blank or
+    invalid) fall between records, so each record keeps its own end.
+    """
+    
+    def __init__(self, categories, difficulties, offsets, ends, category_codes, difficulty_codes, signature):
+        self.categories = categories
+        self.difficulties = difficulties
+        self.offsets = offsets
+        self.ends = ends
+        self.category_codes = category_codes
+        self.difficulty_codes = difficulty_codes
+        self.signature = signature
+    
+    def __len__(self):
+        return len(self.category_codes)
+    
+    @classmethod
+    def build(cls, jsonl_path):
+        """
+        Scan a JSON Lines file and build its index
+        
+        Args:
+            jsonl_path: Path to the JSON Lines file
+        
+        Returns:
+            QuestionIndex
+        """
+        categories, difficulties = [''], ['']  # code 0 means missing
+        category_lookup, difficulty_lookup = {'': 0}, {'': 0}
+        offsets = array('q')
+        ends = array('q')
+        category_codes = array('H')
+        difficulty_codes = array('B')
+        
+        position = 0
+        with open(jsonl_path, 'rb') as f:
+            for line in f:
+                start = position
+                position += len(line)
+                if not line.strip():
+                    continue
+                try:
+                    question = json.loads(line)
+                except json.JSONDecodeError as e:
+                    print(f"Skipping invalid line at byte {start} of {jsonl_path}: {e}")
+                    continue
+                if not isinstance(question, dict):
+                    print(f"Skipping non-object line at byte {start} of {jsonl_path}")
+                    continue
+                
+                category = question.get('category') or ''
+                difficulty = question.get('difficulty') or ''
+                if category not in category_lookup:
+                    category_lookup[category] = len(categories)
+                    categories.append(category)
+                if difficulty not in difficulty_lookup:
+                    difficulty_lookup[difficulty] = len(difficulties)
+                    difficulties.append(difficulty)
+                
+                offsets.append(start)
+                ends.append(position)
+                category_codes.append(category_lookup[category])
+                difficulty_codes.append(difficulty_lookup[difficulty])
+        
+        return cls(categories, difficulties, offsets, ends, category_codes, difficulty_codes,
+                   get_file_signature(jsonl_path))
+    
+    def save(self, index_path):
+        """Write the index (JSON header line followed by the packed arrays)"""
+        header = {
+            'count': len(self),
+            'categories': self.categories,
+            'difficulties': self.difficulties,
+            'signature': list(self.signature) if self.signature else None
+        }
+        tmp_path = index_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(INDEX_MAGIC)
+            f.write(json.dumps(header).encode('utf-8') + b'\n')
+            self.offsets.tofile(f)
+            self.ends.tofile(f)
+            self.category_codes.tofile(f)
+            self.difficulty_codes.tofile(f)
+        os.replace(tmp_path, index_path)
+    
+    @classmethod
+    def load(cls, index_path):
+        """
+        Read an index file
+        
+        Returns:
+            QuestionIndex, or None if the file is missing or unreadable
+        """
+        try:
+            with open(index_path, 'rb') as f:
+                if f.readline() != INDEX_MAGIC:
+                    return None
+                header = json.loads(f.readline())
+                count = header['count']
+                
+                offsets = array('q')
+                ends = array('q')
+                category_codes = array('H')
+                difficulty_codes = array('B')
+                offsets.fromfile(f, count)
+                ends.fromfile(f, count)
+                category_codes.fromfile(f, count)
+                difficulty_codes.fromfile(f, count)
+        except (OSError, EOFError, ValueError, KeyError):
+            return None
+        
+        signature = tuple(header['signature']) if header.get('signature') else None
+        return cls(header['categories'], header['difficulties'], offsets, ends, category_codes,
+                   difficulty_codes, signature)
+
+
+class JsonlSnapshot:
+    """
+    One loaded version of a JSON Lines question bank's index
+    
+    Positions are computed from the index codes (once per selector, then
+    cached) and select() reads records with the same index's byte ranges, so
+    a reload between the two calls cannot mix up records.
+    """
+    
+    def __init__(self, filepath, record_index):
+        self.filepath = filepath
+        self.record_index = record_index
+        self._positions = {}
+    
+    def positions(self, category=None, difficulty=None):
+        """
+        Get positions of questions matching the criteria
+        
+        Returns:
+            Shared sequence of record numbers (treat as read-only)
+        """
+        key = (category or None, difficulty or None)
+        cached = self._positions.get(key)
+        if cached is not None:
+            return cached
+        
+        record_index = self.record_index
+        if record_index is None:
+            return []
+        
+        if key == (None, None):
+            result = range(len(record_index))
+        else:
+            category_code = record_index.categories.index(key[0]) if key[0] in record_index.categories else -1
+            difficulty_code = record_index.difficulties.index(key[1]) if key[1] in record_index.difficulties else -1
+            if (key[0] and category_code <= 0) or (key[1] and difficulty_code <= 0):
+                result = array('I')
+            else:
+                categories = record_index.category_codes
+                difficulties = record_index.difficulty_codes
+                result = array('I', (
+                    i for i in range(len(record_index))
+                    if (not key[0] or categories[i] == category_code)
+                    and (not key[1] or difficulties[i] == difficulty_code)
+                ))
+        
+        self._positions[key] = result
+        return result
+    
+    def select(self, positions):
+        """
+        Read the questions at the given positions from disk
+        
+        Raises:
+            StaleSnapshotError: If the file no longer matches this snapshot's index
+        """
+        record_index = self.record_index
+        if record_index is None or not positions:
+            return []
+        
+        offsets = record_index.offsets
+        ends = record_index.ends
+        questions = []
+        with open(self.filepath, 'rb') as f:
+            if get_file_signature(f.fileno()) != record_index.signature:
+                raise StaleSnapshotError(f"{self.filepath} changed after its index was loaded")
+            for position in positions:
+                f.seek(offsets[position])
+                questions.append(json.loads(f.read(ends[position] - offsets[position])))
+        return questions
+
+
+class JsonlQuestionBank:
+    """
+    Question bank backed by a JSON Lines file and its sidecar index
+    
+    Offers the same interface as question_manager.QuestionBank; the work is
+    done by the JsonlSnapshot of the current index, and only the questions
+    passed to select() are read from disk.
+    """
+    
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.index_path = get_index_path(filepath)
+        self.record_index = None
+        self.categories = []
+        self._snapshot = JsonlSnapshot(filepath, None)
+        self._signature = None
+        self._lock = threading.Lock()
+    
+    def refresh(self):
+        """Reload the index if the JSON Lines file changed since the last load"""
+        signature = get_file_signature(self.filepath)
+        if signature is not None and signature == self._signature:
+            return
+        
+        with self._lock:
+            if signature is not None and signature == self._signature:
+                return
+            
+            record_index = None
+            if signature is not None:
+                record_index = QuestionIndex.load(self.index_path)
+                if record_index is None or record_index.signature != signature:
+                    # Missing or stale sidecar: rebuild it from the data file
+                    record_index = QuestionIndex.build(self.filepath)
+                    try:
+                        record_index.save(self.index_path)
+                    except OSError as e:
+                        print(f"Error saving question index {self.index_path}: {e}")
+            
+            self.record_index = record_index
+            self.categories = sorted(c for c in record_index.categories if c) if record_index else []
+            self._snapshot = JsonlSnapshot(self.filepath, record_index)
+            self._signature = signature
+    
+    def snapshot(self):
+        """
+        Get the current version of the index, revalidating against the file first
+        
+        Returns:
+            JsonlSnapshot that later reloads leave unchanged
+        """
+        self.refresh()
+        return self._snapshot
+    
+    def positions(self, category=None, difficulty=None):
+        """
+        Get positions of questions matching the criteria (see snapshot())
+        
+        Returns:
+            Shared sequence of record numbers (treat as read-only)
+        """
+        return self.snapshot().positions(category, difficulty)
+    
+    def select(self, positions):
+        """Read the questions at the given positions of the current snapshot"""
+        return self._snapshot.select(positions)
+    
+    def get_questions(self):
+        """
+        Get all questions (reads the whole file; prefer a snapshot's positions() and select())
+        
+        Returns:
+            List of question dictionaries
+        """
+        snapshot = self.snapshot()
+        return snapshot.select(snapshot.positions())
+    
+    def invalidate(self):
+        """Force a reload on next access"""
+        self._signature = None
+
+
+def convert_json_to_jsonl(json_path=None, jsonl_path=None):
+    """
+    Convert a questions.json array into JSON Lines and build its index
+    
+    Args:
+        json_path: Source questions.json (defaults to the data directory's)
+        jsonl_path: Destination questions.jsonl (defaults to the data directory's)
+    
+    Returns:
+        Number of questions written
+    """
+    from utils import question_manager
+    
+    json_path = json_path or question_manager.get_questions_path()
+    jsonl_path = jsonl_path or get_jsonl_path()
+    
+    questions = load_json(json_path)
+    invalid = sum(1 for q in questions if not question_manager.validate_question(q))
+    if invalid:
+        print(f"Warning: {invalid} question(s) in {json_path} fail validation")
+    
+    tmp_path = jsonl_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8', newline='\n') as f:
+        for question in questions:
+            f.write(json.dumps(question, ensure_ascii=False) + '\n')
+    os.replace(tmp_path, jsonl_path)
+    
+    QuestionIndex.build(jsonl_path).save(get_index_path(jsonl_path))
+    return len(questions)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == 'convert':
+        source = sys.argv[2] if len(sys.argv) > 2 else None
+        destination = sys.argv[3] if len(sys.argv) > 3 else None
+        count = convert_json_to_jsonl(source, destination)
+        print(f"{count} questions written to {destination or get_jsonl_path()}")
+    else:
+        print("Usage: python -m utils.question_store convert [questions.json] [questions.jsonl]")
@@ -0,0 +1,282 @@
+"""
+Quiz Session Module
+Headless quiz engine: question order, answering, hints, Timed/Survival rules
+and final scoring, with no tkinter dependency
+
+The GUI drives a QuizSession and only renders its state; scripts, tests and
+load generators can run the same logic without a display. Time is read from
+an injectable clock (time.monotonic by default) so runs can be simulated.
+"""
+
+import time
+import random
+from utils import question_manager
+
+
+# Seconds allowed per question in Timed mode
+QUESTION_TIME_LIMIT = 15
+
+# Wrong answers allowed before a Survival run ends
+SURVIVAL_LIVES = 3
+
+# 50/50 hints available per quiz
+HINTS_PER_QUIZ = 3
+
+# Correct answers in a row that activate the Survival streak bonus
+STREAK_BONUS_THRESHOLD = 5
+
+
+class QuizSession:
+    def __init__(self, questions, category, difficulty, mode, clock=time.monotonic, rng=None,
+                 time_limit=QUESTION_TIME_LIMIT):
+        """
+        Args:
+            questions: List of question dictionaries, in the order they are asked
+            category: Category name (as chosen by the user)
+            difficulty: Difficulty level
+            mode: 'Practice', 'Timed' or 'Survival'
+            clock: Function returning the current time in seconds
+            rng: random.Random used for hints (a new one if None)
+            time_limit: Seconds per question in Timed mode
+        """
+        self.questions = questions
+        self.category = category
+        self.difficulty = difficulty
+        self.mode = mode
+        self.clock = clock
+        self.rng = rng or random.Random()
+        self.time_limit = time_limit
+        
+        self.current_index = 0
+        self.correct = 0
+        self.wrong = 0
+        self.consecutive_correct = 0
+        self.total_time = 0.0
+        self.time_bonuses = []
+        self.answers = []
+        self.hints_remaining = HINTS_PER_QUIZ
+        self.hints_used = []
+        self.eliminated_options = []
+        
+        self.question_start_time = None
+        self.question_open = False
+        self.finished = False
+    
+    @classmethod
+    def from_question_bank(cls, category, difficulty, mode, count, **kwargs):
+        """
+        Start a session with random questions from the question bank
+        
+        Args:
+            category: Category name
+            difficulty: Difficulty level
+            mode: Quiz mode
+            count: Number of questions
+            **kwargs: Passed to QuizSession (clock, rng, time_limit)
+        
+        Returns:
+            QuizSession, or None if no questions match
+        """
+        questions = question_manager.get_random_questions(category, difficulty, count)
+        if not questions:
+            return None
+        return cls(questions, category, difficulty, mode, **kwargs)
+    
+    @property
+    def total_questions(self):
+        return len(self.questions)
+    
+    @property
+    def current_question(self):
+        return self.questions[self.current_index]
+    
+    @property
+    def lives_remaining(self):
+        """Survival lives left"""
+        return max(0, SURVIVAL_LIVES - self.wrong)
+    
+    @property
+    def is_timed(self):
+        return self.mode == 'Timed'
+    
+    @property
+    def deadline(self):
+        """Clock time when the current question expires (Timed mode), else None"""
+        if not self.is_timed or self.question_start_time is None:
+            return None
+        return self.question_start_time + self.time_limit
+    
+    @property
+    def streak_bonus_active(self):
+        """Survival streak multiplier is active"""
+        return self.mode == 'Survival' and self.consecutive_correct >= STREAK_BONUS_THRESHOLD
+    
+    @property
+    def last_time_bonus(self):
+        return self.time_bonuses[-1] if self.time_bonuses else 0
+    
+    def time_remaining(self):
+        """Seconds left on the current question (None outside Timed mode)"""
+        deadline = self.deadline
+        if deadline is None:
+            return None
+        return max(0.0, deadline - self.clock())
+    
+    def start_question(self):
+        """
+        Start the clock on the current question
+        
+        Returns:
+            The current question dictionary
+        """
+        self.question_start_time = self.clock()
+        self.question_open = True
+        self.eliminated_options = []
+        return self.current_question
+    
+    def use_hint(self):
+        """
+        Use a 50/50 hint on the current question
+        Further hints may be spent on the same question while any remain
+        
+        Returns:
+            List of option indices eliminated by this hint, or None if no hint can be used
+        """
+        if not self.question_open or self.hints_remaining <= 0:
+            return None
+        
+        question = self.current_question
+        wrong_indices = [i for i in range(len(question['options'])) if i != question['correct']]
+        
+        # Randomly eliminate 2 wrong answers; eliminated_options keeps every option greyed out so far
+        to_eliminate = self.rng.sample(wrong_indices, min(2, len(wrong_indices)))
+        self.eliminated_options.extend(i for i in to_eliminate if i not in self.eliminated_options)
+        self.hints_remaining -= 1
+        self.hints_used.append(self.current_index)
+        return to_eliminate
+    
+    def answer(self, selected):
+        """
+        Answer the current question
+        
+        Args:
+            selected: Chosen option index
+        
+        Returns:
+            Outcome dictionary (see _close_question), or None if the question
+            was already answered or expired
+        """
+        if not self.question_open:
+            return None
+        
+        time_taken = self.clock() - self.question_start_time
+        is_correct = selected == self.current_question['correct']
+        
+        bonus = 0
+        if is_correct and self.is_timed:
+            from utils import score_calculator
+            bonus = score_calculator.calculate_time_bonus(time_taken)
+            self.time_bonuses.append(bonus)
+        
+        return self._close_question(selected, is_correct, time_taken, bonus)
+    
+    def expire(self):
+        """
+        Time ran out on the current question; it counts as wrong
+        
+        Returns:
+            Outcome dictionary, or None if the question was already closed
+        """
+        if not self.question_open:
+            return None
+        return self._close_question(-1, False, float(self.time_limit), 0)
+    
+    def _close_question(self, selected, is_correct, time_taken, bonus):
+        """Record the outcome of the current question and apply the mode rules"""
+        self.question_open = False
+        self.total_time += time_taken
+        
+        if is_correct:
+            self.correct += 1
+            self.consecutive_correct += 1
+        else:
+            self.wrong += 1
+            self.consecutive_correct = 0
+        
+        question = self.current_question
+        self.answers.append({
+            'question': question,
+            'selected': selected,  # -1 indicates no answer (time expired)
+            'correct': is_correct,
+            'time_taken': time_taken
+        })
+        
+        # Survival ends at the last life; otherwise the quiz ends after the last question
+        game_over = self.mode == 'Survival' and self.wrong >= SURVIVAL_LIVES
+        if game_over or self.current_index + 1 >= self.total_questions:
+            self.finished = True
+        
+        return {
+            'question': question,
+            'selected': selected,
+            'correct': is_correct,
+            'time_taken': time_taken,
+            'time_bonus': bonus,
+            'game_over': game_over,
+            'finished': self.finished
+        }
+    
+    def advance(self):
+        """
+        Move to the next question
+        
+        Returns:
+            True if there is a next question, False if the quiz is over
+        """
+        if self.finished:
+            return False
+        self.current_index += 1
+        return True
+    
+    def get_results(self):
+        """
+        Score the session with score_calculator
+        
+        Returns:
+            Dictionary with total, correct, wrong, percentage, score, time_bonus,
+            time_taken (whole seconds) and grade_info
+        """
+        from utils import score_calculator
+        
+        percentage = score_calculator.calculate_percentage(self.correct, self.total_questions)
+        time_bonus = sum(self.time_bonuses)
+        return {
+            'total': self.total_questions,
+            'correct': self.correct,
+            'wrong': self.wrong,
+            'percentage': percentage,
+            'score': score_calculator.calculate_quiz_score(self.mode, self.correct, self.difficulty, time_bonus),
+            'time_bonus': time_bonus,
+            'time_taken': int(self.total_time),
+            'grade_info': score_calculator.get_grade_info(percentage)
+        }
+    
+    def save(self, username):
+        """
+        Score the session and record the attempt in quiz history
+        
+        Args:
+            username: User who took the quiz
+        
+        Returns:
+            Results dictionary from get_results()
+        """
+        from utils import data_manager
+        
+        results = self.get_results()
+        data_manager.add_quiz_attempt(
+            username, self.category, self.difficulty, results['total'],
+            results['correct'], results['wrong'], results['score'], results['percentage'],
+            results['time_taken'], self.mode
+        )
+        return results
@@ -0,0 +1,131 @@
+"""
+Scheduler Module
+One after() loop for every timer and animation in the application
+
+Deadlines are absolute time.monotonic() values, so a busy Tk loop delays a
+callback but never stretches the time it measures: a countdown computes its
+remaining time from the deadline instead of counting callbacks. One-shot
+callbacks are removed before they run, so each fires exactly once.
+"""
+
+import time
+import math
+import itertools
+
+
+class TickScheduler:
+    def __init__(self, root, clock=time.monotonic):
+        """
+        Args:
+            root: Tk widget used for after() calls
+            clock: Function returning the current time in seconds (monotonic)
+        """
+        self.root = root
+        self.clock = clock
+        
+        # handle -> [due time, repeat interval in seconds or None, callback]
+        self._entries = {}
+        self._handles = itertools.count(1)
+        self._after_id = None
+        self._armed_due = None
+    
+    def now(self):
+        """Current scheduler time in seconds"""
+        return self.clock()
+    
+    def call_at(self, deadline, callback):
+        """
+        Run callback once when the clock reaches deadline
+        
+        Args:
+            deadline: Absolute time from self.now()
+            callback: Function taking no arguments
+        
+        Returns:
+            Handle for cancel()
+        """
+        handle = next(self._handles)
+        self._entries[handle] = [deadline, None, callback]
+        self._arm()
+        return handle
+    
+    def call_later(self, delay, callback):
+        """Run callback once after delay seconds (see call_at)"""
+        return self.call_at(self.now() + delay, callback)
+    
+    def call_every(self, interval_ms, callback, first_delay_ms=0):
+        """
+        Run callback repeatedly
+        
+        The callback's return value controls the repetition: False stops it,
+        a number sets the next interval in milliseconds, anything else keeps
+        the current interval.
+        
+        Args:
+            interval_ms: Interval between calls in milliseconds
+            callback: Function taking no arguments
+            first_delay_ms: Delay before the first call
+        
+        Returns:
+            Handle for cancel()
+        """
+        handle = next(self._handles)
+        self._entries[handle] = [self.now() + first_delay_ms / 1000, interval_ms / 1000, callback]
+        self._arm()
+        return handle
+    
+    def cancel(self, handle):
+        """Cancel a scheduled callback (ignores unknown or already-run handles)"""
+        if handle is not None:
+            self._entries.pop(handle, None)
+    
+    def is_scheduled(self, handle):
+        """Check whether a callback is still waiting to run"""
+        return handle in self._entries
+    
+    def _arm(self):
+        """Make sure the after() loop wakes up for the earliest entry"""
+        if not self._entries:
+            return
+        
+        due = min(entry[0] for entry in self._entries.values())
+        if self._after_id is not None:
+            if self._armed_due <= due:
+                return
+            self.root.after_cancel(self._after_id)
+        
+        delay_ms = max(0, math.ceil((due - self.now()) * 1000))
+        self._after_id = self.root.after(delay_ms, self._run)
+        self._armed_due = due
+    
+    def _run(self):
+        """Run every entry that is due, then re-arm for the next one"""
+        self._after_id = None
+        self._armed_due = None
+        now = self.now()
+        
+        due_handles = sorted((entry[0], handle) for handle, entry in self._entries.items() if entry[0] <= now)
+        for _, handle in due_handles:
+            entry = self._entries.get(handle)
+            if entry is None:
+                continue  # cancelled by an earlier callback
+            
+            due, interval, callback = entry
+            if interval is None:
+                del self._entries[handle]
+            
+            try:
+                result = callback()
+            except Exception as e:
+                print(f"Scheduled callback failed: {e}")
+                result = False if interval is not None else None
+            
+            if interval is not None and handle in self._entries:
+                if result is False:
+                    del self._entries[handle]
+                else:
+                    if isinstance(result, (int, float)) and not isinstance(result, bool):
+                        interval = entry[1] = result / 1000
+                    entry[0] = self.now() + interval
+        
+        self._arm()
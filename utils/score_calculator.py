@@ -1,7 +1,12 @@
 """
 Score Calculator Module
-Uses NumPy for all score calculations, statistics, and analysis
+Uses NumPy for batch score calculations, statistics, and analysis
 Provides weighted scoring based on difficulty levels
+
+Single-quiz helpers (calculate_percentage, calculate_base_score, ...) use
+plain Python arithmetic; wrapping one number in an ndarray only adds
+overhead. The *_scores / *_percentages variants take arrays (or lists,
+or DataFrame columns) and score a whole history in one call.
 """
 
 import numpy as np
@@ -24,10 +29,18 @@ BONUS_POINTS_MODERATE = 3
 SURVIVAL_COMBO_MULTIPLIER = 1.5
 SURVIVAL_COMBO_THRESHOLD = 5
 
+# Grade bands: (minimum percentage, grade, color, message), best first
+GRADE_BANDS = [
+    (90, 'Excellent', '#28a745', 'Outstanding performance!'),  # Green
+    (70, 'Good', '#007bff', 'Well done!'),  # Blue
+    (50, 'Average', '#ffc107', 'Keep practicing!'),  # Orange
+    (0, 'Needs Improvement', '#dc3545', 'More practice recommended')  # Red
+]
+
 
 def calculate_percentage(correct, total):
     """
-    Calculate percentage score using NumPy
+    Calculate percentage score
     
     Args:
         correct: Number of correct answers
@@ -39,14 +52,8 @@ def calculate_percentage(correct, total):
     if total == 0:
         return 0.0
     
-    # Use NumPy arrays for calculation
-    correct_array = np.array([correct], dtype=np.float64)
-    total_array = np.array([total], dtype=np.float64)
-    
     # Calculate percentage: (correct/total) * 100
-    percentage = (correct_array / total_array) * 100
-    
-    return float(percentage[0])
+    return (float(correct) / float(total)) * 100
 
 
 def calculate_base_score(correct_count, difficulty):
@@ -62,13 +69,7 @@ def calculate_base_score(correct_count, difficulty):
     """
     points = DIFFICULTY_POINTS.get(difficulty, 10)
     
-    # Use NumPy for calculation
-    correct_array = np.array([correct_count], dtype=np.int32)
-    points_array = np.array([points], dtype=np.int32)
-    
-    score = np.multiply(correct_array, points_array)
-    
-    return int(score[0])
+    return int(correct_count) * points
 
 
 def calculate_weighted_score(easy_correct, medium_correct, hard_correct):
@@ -135,11 +136,8 @@ def calculate_timed_score(correct_count, difficulty, time_data):
     base_score = calculate_base_score(correct_count, difficulty)
     
     # Calculate total bonus from time data
-    if time_data and len(time_data) > 0:
-        time_array = np.array(time_data, dtype=np.float64)
-        # Calculate bonus for each answer time
-        bonuses = np.array([calculate_time_bonus(t) for t in time_array])
-        total_bonus = int(np.sum(bonuses))
+    if time_data is not None and len(time_data) > 0:
+        total_bonus = int(np.sum(calculate_time_bonuses(time_data)))
     else:
         total_bonus = 0
     
@@ -161,14 +159,146 @@ def calculate_survival_score(correct_streak, difficulty):
     
     # Apply multiplier if streak threshold is met
     if correct_streak >= SURVIVAL_COMBO_THRESHOLD:
-        score_array = np.array([base_score], dtype=np.float64)
-        multiplier_array = np.array([SURVIVAL_COMBO_MULTIPLIER], dtype=np.float64)
-        final_score = np.multiply(score_array, multiplier_array)
-        return int(final_score[0])
+        return int(base_score * SURVIVAL_COMBO_MULTIPLIER)
     
     return base_score
 
 
+def calculate_quiz_score(mode, correct_count, difficulty, time_bonus=0):
+    """
+    Calculate the final score of a single finished quiz
+    Pure-Python fast path used by the results screen
+    
+    Args:
+        mode: Quiz mode ('Practice', 'Timed', 'Survival')
+        correct_count: Number of correct answers
+        difficulty: Difficulty level
+        time_bonus: Total time bonus earned (Timed mode only)
+        
+    Returns:
+        Final score (integer)
+    """
+    if mode == 'Timed':
+        return calculate_base_score(correct_count, difficulty) + int(time_bonus)
+    if mode == 'Survival':
+        return calculate_survival_score(correct_count, difficulty)
+    return calculate_base_score(correct_count, difficulty)
+
+
+# ---------- Batch (array-in/array-out) scoring ----------
+
+def _difficulty_points_array(difficulties, size):
+    """Map a difficulty (or array of difficulties) to an array of point values"""
+    if isinstance(difficulties, str):
+        return np.full(size, DIFFICULTY_POINTS.get(difficulties, 10), dtype=np.int64)
+    
+    difficulties = np.asarray(difficulties)
+    points = np.full(difficulties.shape, 10, dtype=np.int64)
+    for level, level_points in DIFFICULTY_POINTS.items():
+        points[difficulties == level] = level_points
+    return points
+
+
+def calculate_percentages(correct, total):
+    """
+    Calculate percentage scores for many attempts at once
+    
+    Args:
+        correct: Array-like of correct answer counts
+        total: Array-like of question counts (or a single count)
+        
+    Returns:
+        NumPy float array of percentages (0.0 where total is 0)
+    """
+    correct_array = np.asarray(correct, dtype=np.float64)
+    total_array = np.broadcast_to(np.asarray(total, dtype=np.float64), correct_array.shape)
+    
+    percentages = np.zeros(correct_array.shape, dtype=np.float64)
+    np.divide(correct_array, total_array, out=percentages, where=total_array != 0)
+    return percentages * 100
+
+
+def calculate_base_scores(correct_counts, difficulties):
+    """
+    Calculate base scores for many attempts at once
+    
+    Args:
+        correct_counts: Array-like of correct answer counts
+        difficulties: Array-like of difficulty levels (or a single level)
+        
+    Returns:
+        NumPy integer array of base scores
+    """
+    correct_array = np.asarray(correct_counts, dtype=np.int64)
+    return correct_array * _difficulty_points_array(difficulties, correct_array.shape)
+
+
+def calculate_time_bonuses(times):
+    """
+    Calculate the time bonus for many answer times at once
+    
+    Args:
+        times: Array-like of answer times in seconds
+        
+    Returns:
+        NumPy integer array of bonus points (0, 3, or 5)
+    """
+    time_array = np.asarray(times, dtype=np.float64)
+    return np.where(
+        time_array <= TIME_BONUS_FAST, BONUS_POINTS_FAST,
+        np.where(time_array <= TIME_BONUS_MODERATE, BONUS_POINTS_MODERATE, 0)
+    ).astype(np.int64)
+
+
+def calculate_timed_scores(correct_counts, difficulties, time_bonuses):
+    """
+    Calculate Timed mode scores for many attempts at once
+    
+    Args:
+        correct_counts: Array-like of correct answer counts
+        difficulties: Array-like of difficulty levels (or a single level)
+        time_bonuses: Array-like of total time bonus per attempt
+        
+    Returns:
+        NumPy integer array of scores including bonuses
+    """
+    base_scores = calculate_base_scores(correct_counts, difficulties)
+    return base_scores + np.asarray(time_bonuses, dtype=np.int64)
+
+
+def calculate_survival_scores(correct_streaks, difficulties):
+    """
+    Calculate Survival mode scores for many attempts at once
+    
+    Args:
+        correct_streaks: Array-like of consecutive correct answer counts
+        difficulties: Array-like of difficulty levels (or a single level)
+        
+    Returns:
+        NumPy integer array of scores with the combo multiplier applied
+    """
+    streak_array = np.asarray(correct_streaks, dtype=np.int64)
+    base_scores = calculate_base_scores(streak_array, difficulties)
+    boosted = (base_scores * SURVIVAL_COMBO_MULTIPLIER).astype(np.int64)
+    return np.where(streak_array >= SURVIVAL_COMBO_THRESHOLD, boosted, base_scores)
+
+
+def assign_grades(percentages):
+    """
+    Assign grade names for many percentages at once
+    
+    Args:
+        percentages: Array-like of percentage scores
+        
+    Returns:
+        NumPy array of grade names (see GRADE_BANDS)
+    """
+    percentage_array = np.asarray(percentages, dtype=np.float64)
+    conditions = [percentage_array >= minimum for minimum, _, _, _ in GRADE_BANDS[:-1]]
+    grades = [grade for _, grade, _, _ in GRADE_BANDS[:-1]]
+    return np.select(conditions, grades, default=GRADE_BANDS[-1][1])
+
+
 def calculate_statistics(scores):
     """
     Calculate comprehensive statistics using NumPy
@@ -208,7 +338,7 @@ def calculate_statistics(scores):
 def calculate_improvement_rate(scores):
     """
     Calculate improvement trend using linear regression
-    Uses NumPy polyfit to find the slope of score progression
+    Fits the slope of score progression from the regression sums
     
     Args:
         scores: List of scores in chronological order
@@ -216,19 +346,14 @@ def calculate_improvement_rate(scores):
     Returns:
         Improvement rate (slope) and trend direction
     """
-    if not scores or len(scores) < 2:
+    fit = linear_trend_from_sums(**regression_sums(scores))
+    if fit is None:
         return {
             'rate': 0.0,
             'trend': 'insufficient_data'
         }
     
-    # Create arrays for x (attempt numbers) and y (scores)
-    attempts = np.arange(len(scores), dtype=np.float64)
-    scores_array = np.array(scores, dtype=np.float64)
-    
-    # Calculate linear trend: polyfit returns [slope, intercept]
-    coefficients = np.polyfit(attempts, scores_array, 1)
-    slope = float(coefficients[0])
+    slope = fit[0]
     
     # Determine trend direction
     if slope > 0.5:
@@ -244,6 +369,93 @@ def calculate_improvement_rate(scores):
     }
 
 
+def regression_sums(scores):
+    """
+    Compute least-squares sums for scores against attempt number (1, 2, ...)
+    The same sums are kept incrementally per user in utils.user_stats
+    
+    Args:
+        scores: Scores in chronological order
+        
+    Returns:
+        Dictionary with n, sum_x, sum_y, sum_xx and sum_xy
+    """
+    y = np.asarray(scores, dtype=np.float64)
+    x = np.arange(1, len(y) + 1, dtype=np.float64)
+    return {
+        'n': len(y),
+        'sum_x': float(x.sum()),
+        'sum_y': float(y.sum()),
+        'sum_xx': float(np.dot(x, x)),
+        'sum_xy': float(np.dot(x, y))
+    }
+
+
+def linear_trend_from_sums(n, sum_x, sum_y, sum_xx, sum_xy):
+    """
+    Fit y = slope * x + intercept from running regression sums in O(1)
+    
+    Args:
+        n: Number of points
+        sum_x, sum_y, sum_xx, sum_xy: Running sums over the points
+        
+    Returns:
+        (slope, intercept) tuple, or None with fewer than 2 distinct x values
+    """
+    denominator = n * sum_xx - sum_x * sum_x
+    if n < 2 or denominator == 0:
+        return None
+    
+    slope = (n * sum_xy - sum_x * sum_y) / denominator
+    intercept = (sum_y - slope * sum_x) / n
+    return float(slope), float(intercept)
+
+
+def downsample_lttb(x, y, threshold):
+    """
+    Reduce a series to at most threshold points with Largest-Triangle-Three-Buckets
+    Keeps the first and last points and, per bucket, the point forming the
+    largest triangle with the previous pick and the next bucket's average,
+    so peaks and dips survive downsampling
+    
+    Args:
+        x: X values in increasing order
+        y: Y values
+        threshold: Maximum number of points to keep (e.g. the plot width in pixels)
+        
+    Returns:
+        Tuple of (x, y) NumPy arrays
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return x, y
+    
+    bucket_size = (n - 2) / (threshold - 2)
+    picked = np.empty(threshold, dtype=np.intp)
+    picked[0] = 0
+    picked[-1] = n - 1
+    
+    a = 0
+    for i in range(threshold - 2):
+        # Average of the next bucket (the last point for the final bucket)
+        next_start = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        
+        # Point in this bucket with the largest triangle area
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        areas = np.abs((x[a] - avg_x) * (y[start:end] - y[a])
+                       - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(areas))
+        picked[i + 1] = a
+    
+    return x[picked], y[picked]
+
+
 def calculate_accuracy_by_difficulty(easy_correct, easy_total, 
                                      medium_correct, medium_total,
                                      hard_correct, hard_total):
@@ -284,30 +496,15 @@ def get_grade_info(percentage):
     Returns:
         Dictionary with grade, color, and message
     """
-    if percentage >= 90:
-        return {
-            'grade': 'Excellent',
-            'color': '#28a745',  # Green
-            'message': 'Outstanding performance!'
-        }
-    elif percentage >= 70:
-        return {
-            'grade': 'Good',
-            'color': '#007bff',  # Blue
-            'message': 'Well done!'
-        }
-    elif percentage >= 50:
-        return {
-            'grade': 'Average',
-            'color': '#ffc107',  # Orange
-            'message': 'Keep practicing!'
-        }
-    else:
-        return {
-            'grade': 'Needs Improvement',
-            'color': '#dc3545',  # Red
-            'message': 'More practice recommended'
-        }
+    # Lowest band catches everything below the other thresholds
+    band = next((b for b in GRADE_BANDS[:-1] if percentage >= b[0]), GRADE_BANDS[-1])
+    _, grade, color, message = band
+    
+    return {
+        'grade': grade,
+        'color': color,
+        'message': message
+    }
 
 
 def calculate_percentile(score, all_scores):
@@ -0,0 +1,167 @@
+"""
+Screen Data Module
+The data each screen loads, with no tkinter dependency
+
+main.py and the screens call these functions to fetch what they display, and
+benchmarks.scenarios calls the same functions to time a visit headlessly, so
+the benchmarks follow the app's real code path. Heavy modules are imported
+inside the functions to keep them off the login screen's startup path.
+"""
+
+from utils.quiz_session import QuizSession
+
+
+def get_screen_version(username, include_settings=False):
+    """
+    Get the data version cached screens for a user depend on
+    
+    Args:
+        username: Username
+        include_settings: Also depend on user settings (e.g. the streak shown on the dashboard)
+    
+    Returns:
+        Tuple that changes whenever the underlying data changes
+    """
+    from utils import user_stats, achievements
+    
+    version = (user_stats.get_user_stats(username)['last_attempt_id'],)
+    if include_settings:
+        version += (achievements.get_settings_version(),)
+    return version
+
+
+def load_dashboard(username):
+    """
+    Load the dashboard's quick stats
+    
+    Args:
+        username: Username
+    
+    Returns:
+        Dictionary with the stats summary and the current day streak
+    """
+    from utils import data_manager, achievements
+    
+    return {
+        'stats': data_manager.get_user_stats_summary(username),
+        'streak': achievements.get_user_settings(username).get('streak_count', 0)
+    }
+
+
+def start_quiz(username, category, difficulty, mode, count, **session_options):
+    """
+    Pick the questions for a quiz and update the user's streak
+    
+    Args:
+        username: Username
+        category: Category to draw questions from
+        difficulty: Difficulty level
+        mode: Quiz mode (Practice/Timed/Survival)
+        count: Number of questions
+        **session_options: Passed to QuizSession (clock, rng, time_limit)
+    
+    Returns:
+        QuizSession, or None if no questions match (the streak is then left unchanged)
+    """
+    from utils import achievements
+    
+    session = QuizSession.from_question_bank(category, difficulty, mode, count, **session_options)
+    if session is None:
+        return None
+    
+    achievements.update_streak(username)
+    return session
+
+
+def finish_quiz(username, session):
+    """
+    Save a finished quiz and unlock any achievements it earned
+    
+    Args:
+        username: Username
+        session: Finished QuizSession
+    
+    Returns:
+        (results, new_achievements) tuple: QuizSession.get_results() and the newly unlocked achievements
+    """
+    from utils import achievements
+    
+    results = session.save(username)
+    new_achievements = achievements.check_and_unlock_achievements(username)
+    return results, new_achievements
+
+
+def load_analytics(username):
+    """
+    Load the analytics screen's history, summary statistics and chart inputs
+    
+    Args:
+        username: Username
+    
+    Returns:
+        Dictionary with history (DataFrame), statistics and improvement (None
+        without history), the user_stats record and the chart cache version
+    """
+    from utils import data_manager, score_calculator, user_stats
+    
+    history = data_manager.get_user_history(username)
+    statistics = improvement = None
+    if not history.empty:
+        percentages = history['percentage'].tolist()
+        statistics = score_calculator.calculate_statistics(percentages)
+        improvement = score_calculator.calculate_improvement_rate(percentages)
+    
+    stats = user_stats.get_user_stats(username)
+    return {
+        'history': history,
+        'statistics': statistics,
+        'improvement': improvement,
+        'stats': stats,
+        'version': stats['last_attempt_id']
+    }
+
+
+def load_cached_charts(username, version, chart_ids):
+    """
+    Read the chart images already rendered for this version of the history
+    
+    Args:
+        username: Username
+        version: Chart cache version from load_analytics
+        chart_ids: Chart ids to look up
+    
+    Returns:
+        (cached, missing) tuple: chart id -> PNG bytes, and the ids still to render
+    """
+    from utils import chart_renderer
+    
+    cached = {}
+    missing = []
+    for chart_id in chart_ids:
+        png = chart_renderer.load_cached_chart(username, chart_id, version)
+        if png is None:
+            missing.append(chart_id)
+        else:
+            cached[chart_id] = png
+    return cached, missing
+
+
+def load_history(username, columns):
+    """
+    Load a user's history, newest first, with the table's column values
+    
+    Args:
+        username: Username
+        columns: History DataFrame columns the table displays, in order
+    
+    Returns:
+        (history, row_data) tuple: sorted DataFrame and one value list per column
+    """
+    from utils import data_manager
+    
+    history = data_manager.get_user_history(username)
+    if history.empty:
+        return history, []
+    
+    history = history.sort_values(['date', 'time'], ascending=False).reset_index(drop=True)
+    return history, [history[column].tolist() for column in columns]
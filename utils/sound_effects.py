@@ -1,18 +1,191 @@
 """
 Sound Effects Module
-Provides audio feedback using winsound (Windows built-in library)
-Handles correct/wrong answers, achievements, and other game events
+Provides audio feedback for correct/wrong answers, achievements, and other game events
+
+All sounds are played by one long-lived worker thread fed by a small bounded
+queue. Each sound is synthesized once into a cached 16-bit PCM WAV buffer and
+handed to a pluggable backend:
+    winsound - Windows built-in library (plays the cached buffer from memory)
+    wav      - writes each sound once as a .wav file and plays it with
+               aplay (ALSA), paplay or afplay
+    null     - discards sounds
+The backend is chosen with config.SOUND_BACKEND ('auto' picks the first that works).
+
+Under load, a sound already waiting in the queue is not queued again, the
+oldest waiting sound is dropped when the queue is full, and sounds that have
+waited too long are skipped instead of playing late.
 """
 
-import winsound
+import io
+import atexit
+import os
+import math
+import time
+import wave
+import queue
+import shutil
+import tempfile
 import threading
+import subprocess
+from array import array
+from utils import config
+
+
+SAMPLE_RATE = 22050
+VOLUME = 0.4
+
+# Fade in/out at each tone edge so tones do not click
+FADE_MS = 5
+
+# Sounds waiting longer than this are dropped instead of played late
+MAX_SOUND_LATENCY = 0.5
+
+# Sounds that may wait in the queue at once
+QUEUE_SIZE = 4
+
+# Sound name -> sequence of (frequency in Hz, duration in ms)
+SOUNDS = {
+    'correct': [(800, 200)],  # High pleasant tone
+    'wrong': [(300, 300)],  # Low error tone
+    'achievement': [(523, 150), (659, 150), (784, 200)],  # C5 E5 G5
+    'level_up': [(440, 150), (523, 150), (659, 150), (880, 250)],  # A4 C5 E5 A5
+    'perfect_score': [(523, 100), (659, 100), (784, 100), (1047, 300)],  # Triumphant fanfare
+    'streak': [(700, 150), (900, 150)],
+    'time_warning': [(600, 100)],
+    'time_expired': [(400, 150), (350, 150), (300, 200)]
+}
+
+
+def synthesize_wav(tones, sample_rate=SAMPLE_RATE):
+    """
+    Synthesize a tone sequence into an in-memory WAV file
+    
+    Args:
+        tones: Sequence of (frequency in Hz, duration in ms)
+        sample_rate: Samples per second
+    
+    Returns:
+        WAV file contents (16-bit mono PCM) as bytes
+    """
+    samples = array('h')
+    amplitude = VOLUME * 32767
+    fade = max(1, sample_rate * FADE_MS // 1000)
+    
+    for frequency, duration in tones:
+        count = sample_rate * duration // 1000
+        step = 2 * math.pi * frequency / sample_rate
+        for i in range(count):
+            envelope = min(1.0, i / fade, (count - i) / fade)
+            samples.append(int(amplitude * envelope * math.sin(step * i)))
+    
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(samples.tobytes())
+    return buffer.getvalue()
+
+
+class NullBackend:
+    """Discards every sound"""
+    
+    name = 'null'
+    
+    def play(self, sound_name, wav_bytes):
+        pass
+
+
+class WinsoundBackend:
+    """Plays cached WAV buffers from memory with winsound (Windows only)"""
+    
+    name = 'winsound'
+    
+    def __init__(self):
+        import winsound  # raises ImportError off Windows
+        self.winsound = winsound
+    
+    def play(self, sound_name, wav_bytes):
+        self.winsound.PlaySound(wav_bytes, self.winsound.SND_MEMORY)
+
+
+class WavFileBackend:
+    """Writes each sound once as a .wav file and plays it with a command-line player"""
+    
+    name = 'wav'
+    PLAYERS = [['aplay', '-q'], ['paplay'], ['afplay']]
+    
+    def __init__(self, directory=None):
+        # None: a private temp directory is created on first use and removed at exit
+        self.directory = directory
+        self.command = next((cmd for cmd in self.PLAYERS if shutil.which(cmd[0])), None)
+        if self.command is None:
+            raise RuntimeError("No WAV player (aplay, paplay or afplay) found")
+        self.files = {}
+    
+    def get_file(self, sound_name, wav_bytes):
+        """Write the sound's WAV file on first use and return its path"""
+        path = self.files.get(sound_name)
+        if path is None:
+            if self.directory is None:
+                self.directory = tempfile.mkdtemp(prefix='quiz_app_sounds_')
+                atexit.register(shutil.rmtree, self.directory, True)
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory, f"{sound_name}.wav")
+            with open(path, 'wb') as f:
+                f.write(wav_bytes)
+            self.files[sound_name] = path
+        return path
+    
+    def play(self, sound_name, wav_bytes):
+        subprocess.run(self.command + [self.get_file(sound_name, wav_bytes)],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+
+
+BACKENDS = {
+    'winsound': WinsoundBackend,
+    'wav': WavFileBackend,
+    'null': NullBackend
+}
+
+
+def create_backend(name=None):
+    """
+    Create the configured audio backend, falling back to null if it is unavailable
+    
+    Args:
+        name: Backend name, 'auto' or None for config.SOUND_BACKEND
+    
+    Returns:
+        Backend instance
+    """
+    name = name or config.SOUND_BACKEND
+    candidates = ['winsound', 'wav', 'null'] if name == 'auto' else [name]
+    
+    for candidate in candidates:
+        try:
+            return BACKENDS[candidate]()
+        except KeyError:
+            print(f"Unknown sound backend '{candidate}'")
+        except Exception:
+            continue
+    return NullBackend()
 
 
 class SoundManager:
     """Manages all sound effects for the quiz application"""
     
-    def __init__(self):
+    def __init__(self, backend=None):
         self.enabled = True
+        self.backend = backend
+        self.buffers = {}
+        self.tones = dict(SOUNDS)
+        self.dropped = 0
+        
+        self._queue = queue.Queue(maxsize=QUEUE_SIZE)
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._worker = None
     
     def enable(self):
         """Enable sound effects"""
@@ -22,109 +195,105 @@ class SoundManager:
         """Disable sound effects"""
         self.enabled = False
     
-    def play_in_thread(self, frequency, duration):
-        """Play sound in separate thread to avoid blocking UI"""
+    def get_buffer(self, sound_name):
+        """Get the cached WAV buffer for a sound, synthesizing it on first use"""
+        wav_bytes = self.buffers.get(sound_name)
+        if wav_bytes is None:
+            wav_bytes = synthesize_wav(self.tones[sound_name])
+            self.buffers[sound_name] = wav_bytes
+        return wav_bytes
+    
+    def play(self, sound_name):
+        """
+        Queue a sound for the audio worker (never blocks the caller)
+        
+        Args:
+            sound_name: Key in SOUNDS (or a tone registered by play_in_thread)
+        """
         if not self.enabled:
             return
         
-        def play():
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, daemon=True)
+                self._worker.start()
+            
+            # Coalesce: the same sound is already waiting to play
+            if sound_name in self._pending:
+                return
+            
+            # Full queue: drop the oldest waiting sound to make room
+            if self._queue.full():
+                try:
+                    stale_name, _ = self._queue.get_nowait()
+                    self._pending.discard(stale_name)
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+            
+            self._pending.add(sound_name)
+            self._queue.put_nowait((sound_name, time.monotonic()))
+    
+    def _run(self):
+        """Audio worker: play queued sounds one at a time"""
+        if self.backend is None:
+            self.backend = create_backend()
+        
+        # Synthesize every known sound up front so later plays only copy a buffer
+        for sound_name in SOUNDS:
+            self.get_buffer(sound_name)
+        
+        while True:
+            sound_name, queued_at = self._queue.get()
+            with self._lock:
+                self._pending.discard(sound_name)
+            
+            if time.monotonic() - queued_at > MAX_SOUND_LATENCY:
+                self.dropped += 1
+                continue
+            
             try:
-                winsound.Beep(frequency, duration)
-            except:
+                self.backend.play(sound_name, self.get_buffer(sound_name))
+            except Exception:
                 pass  # Silently fail if sound cannot be played
-        
-        thread = threading.Thread(target=play, daemon=True)
-        thread.start()
+    
+    def play_in_thread(self, frequency, duration):
+        """Play a single tone on the audio worker (kept for existing callers)"""
+        sound_name = f"tone_{frequency}_{duration}"
+        self.tones.setdefault(sound_name, [(frequency, duration)])
+        self.play(sound_name)
     
     def play_correct(self):
         """Play sound for correct answer"""
-        self.play_in_thread(800, 200)  # High pleasant tone
+        self.play('correct')
     
     def play_wrong(self):
         """Play sound for wrong answer"""
-        self.play_in_thread(300, 300)  # Low error tone
+        self.play('wrong')
     
     def play_achievement(self):
         """Play sound for achievement unlocked"""
-        if not self.enabled:
-            return
-        # Play ascending tones for achievement
-        def play_sequence():
-            try:
-                winsound.Beep(523, 150)  # C5
-                winsound.Beep(659, 150)  # E5
-                winsound.Beep(784, 200)  # G5
-            except:
-                pass
-        
-        thread = threading.Thread(target=play_sequence, daemon=True)
-        thread.start()
+        self.play('achievement')
     
     def play_level_up(self):
         """Play sound for level up or milestone"""
-        if not self.enabled:
-            return
-        def play_sequence():
-            try:
-                winsound.Beep(440, 150)  # A4
-                winsound.Beep(523, 150)  # C5
-                winsound.Beep(659, 150)  # E5
-                winsound.Beep(880, 250)  # A5
-            except:
-                pass
-        
-        thread = threading.Thread(target=play_sequence, daemon=True)
-        thread.start()
+        self.play('level_up')
     
     def play_perfect_score(self):
         """Play special sound for perfect score"""
-        if not self.enabled:
-            return
-        def play_sequence():
-            try:
-                # Triumphant fanfare
-                winsound.Beep(523, 100)
-                winsound.Beep(659, 100)
-                winsound.Beep(784, 100)
-                winsound.Beep(1047, 300)
-            except:
-                pass
-        
-        thread = threading.Thread(target=play_sequence, daemon=True)
-        thread.start()
+        self.play('perfect_score')
     
     def play_streak(self):
         """Play sound for streak milestone"""
-        if not self.enabled:
-            return
-        def play_sequence():
-            try:
-                winsound.Beep(700, 150)
-                winsound.Beep(900, 150)
-            except:
-                pass
-        
-        thread = threading.Thread(target=play_sequence, daemon=True)
-        thread.start()
+        self.play('streak')
     
     def play_time_warning(self):
         """Play warning sound when time is running out"""
-        self.play_in_thread(600, 100)
+        self.play('time_warning')
     
     def play_time_expired(self):
         """Play sound when time expires"""
-        if not self.enabled:
-            return
-        def play_sequence():
-            try:
-                winsound.Beep(400, 150)
-                winsound.Beep(350, 150)
-                winsound.Beep(300, 200)
-            except:
-                pass
-        
-        thread = threading.Thread(target=play_sequence, daemon=True)
-        thread.start()
+        self.play('time_expired')
 
 
 # Global sound manager instance
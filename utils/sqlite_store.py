@@ -0,0 +1,450 @@
+"""
+SQLite Storage Module
+Optional indexed storage backend for quiz history, users, achievements and settings
+Selected with config.STORAGE_BACKEND = 'sqlite' (env QUIZ_STORAGE_BACKEND=sqlite)
+
+Run "python -m utils.sqlite_store migrate" to import the existing CSV files.
+"""
+
+import sqlite3
+import threading
+import os
+import sys
+import pandas as pd
+from utils import config
+
+
+HISTORY_COLUMNS = [
+    'user_id', 'username', 'date', 'time', 'category',
+    'difficulty', 'total_questions', 'correct', 'wrong',
+    'score', 'percentage', 'time_taken', 'mode'
+]
+
+USER_COLUMNS = ['username', 'password', 'created_date']
+
+SETTINGS_COLUMNS = [
+    'username', 'streak_count', 'last_played_date',
+    'daily_challenge_date', 'theme', 'sound_enabled'
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS quiz_history (
+    user_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT NOT NULL,
+    date TEXT NOT NULL,
+    time TEXT NOT NULL,
+    category TEXT,
+    difficulty TEXT,
+    total_questions INTEGER,
+    correct INTEGER,
+    wrong INTEGER,
+    score INTEGER,
+    percentage REAL,
+    time_taken INTEGER,
+    mode TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_history_username ON quiz_history (username, date, time);
+CREATE INDEX IF NOT EXISTS idx_history_category ON quiz_history (category);
+CREATE INDEX IF NOT EXISTS idx_history_difficulty ON quiz_history (difficulty);
+CREATE INDEX IF NOT EXISTS idx_history_date ON quiz_history (date, time);
+CREATE INDEX IF NOT EXISTS idx_history_score ON quiz_history (score DESC, user_id);
+
+CREATE TABLE IF NOT EXISTS users (
+    username TEXT PRIMARY KEY,
+    password TEXT NOT NULL,
+    created_date TEXT
+);
+
+CREATE TABLE IF NOT EXISTS achievements (
+    username TEXT NOT NULL,
+    achievement_id TEXT NOT NULL,
+    unlocked_date TEXT,
+    unlocked_time TEXT,
+    PRIMARY KEY (username, achievement_id)
+);
+
+CREATE TABLE IF NOT EXISTS user_settings (
+    username TEXT PRIMARY KEY,
+    streak_count INTEGER DEFAULT 0,
+    last_played_date TEXT,
+    daily_challenge_date TEXT,
+    theme TEXT DEFAULT 'light',
+    sound_enabled INTEGER DEFAULT 1
+);
+"""
+
+# One connection per thread (sqlite3 connections are not shared across threads)
+_local = threading.local()
+
+
+def get_db_path():
+    """Get path to the SQLite database file"""
+    data_dir = config.get_data_dir()
+    return os.path.join(data_dir, config.SQLITE_FILENAME)
+
+
+def get_connection():
+    """
+    Get this thread's connection, creating the schema on first use
+    
+    Returns:
+        sqlite3.Connection
+    """
+    db_path = get_db_path()
+    conn = getattr(_local, 'conn', None)
+    
+    if conn is None or getattr(_local, 'path', None) != db_path:
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        conn = sqlite3.connect(db_path, timeout=30)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.executescript(SCHEMA)
+        _local.conn = conn
+        _local.path = db_path
+    
+    return conn
+
+
+def query_df(sql, params=()):
+    """
+    Run a SELECT and return the result as a DataFrame
+    
+    Args:
+        sql: SQL query
+        params: Query parameters
+    
+    Returns:
+        pandas DataFrame
+    """
+    return pd.read_sql_query(sql, get_connection(), params=params)
+
+
+# ---------- Quiz history ----------
+
+def load_history(username=None):
+    """
+    Load quiz history, optionally for one user (uses the username index)
+    
+    Returns:
+        DataFrame with quiz history in insertion order
+    """
+    columns = ', '.join(HISTORY_COLUMNS)
+    if username is None:
+        return query_df(f"SELECT {columns} FROM quiz_history ORDER BY user_id")
+    return query_df(
+        f"SELECT {columns} FROM quiz_history WHERE username = ? ORDER BY user_id",
+        (username,)
+    )
+
+
+def load_history_after(last_id):
+    """
+    Load the attempts recorded after an attempt id (uses the primary key)
+    
+    Returns:
+        DataFrame with those attempts in insertion order
+    """
+    columns = ', '.join(HISTORY_COLUMNS)
+    return query_df(
+        f"SELECT {columns} FROM quiz_history WHERE user_id > ? ORDER BY user_id",
+        (int(last_id),)
+    )
+
+
+def _missing_to_none(df):
+    """Rows of a DataFrame as lists, with NaN/None cells as None (SQL NULL)"""
+    return df.astype(object).where(df.notna(), None).values.tolist()
+
+
+def _insert_or_replace(conn, table, columns, rows):
+    """
+    INSERT OR REPLACE rows into a table and report any rows they replaced
+    
+    A replaced row is an existing row with the same key, or an earlier row
+    of the same batch with a duplicate key.
+    
+    Returns:
+        Number of rows replaced
+    """
+    if not rows:
+        return 0
+    
+    before = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    conn.executemany(
+        f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+        rows
+    )
+    after = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    
+    replaced = len(rows) - (after - before)
+    if replaced:
+        print(f"Warning: {replaced} row(s) written to {table} replaced rows with the same key")
+    return replaced
+
+
+def replace_history(df):
+    """
+    Replace the whole quiz history table with a DataFrame
+    
+    Args:
+        df: pandas DataFrame with quiz history
+    """
+    conn = get_connection()
+    with conn:
+        conn.execute("DELETE FROM quiz_history")
+        _insert_history_rows(conn, df)
+
+
+def _insert_history_rows(conn, df):
+    """
+    Insert DataFrame rows, keeping user_id where present
+    
+    Returns:
+        Number of rows that replaced one with the same user_id
+    """
+    if df.empty:
+        return 0
+    
+    columns = [c for c in HISTORY_COLUMNS if c in df.columns]
+    return _insert_or_replace(conn, 'quiz_history', columns, _missing_to_none(df[columns]))
+
+
+def insert_attempt(attempt):
+    """
+    Insert one quiz attempt
+    
+    Args:
+        attempt: Dictionary with history columns (user_id is assigned here)
+    
+    Returns:
+        The new attempt id
+    """
+    columns = [c for c in HISTORY_COLUMNS if c != 'user_id']
+    placeholders = ', '.join('?' for _ in columns)
+    conn = get_connection()
+    with conn:
+        cursor = conn.execute(
+            f"INSERT INTO quiz_history ({', '.join(columns)}) VALUES ({placeholders})",
+            [attempt[c] for c in columns]
+        )
+    return cursor.lastrowid
+
+
+def get_last_attempt_id():
+    """
+    Get the highest attempt id (primary key lookup)
+    
+    Returns:
+        Last attempt id, 0 if history is empty
+    """
+    row = get_connection().execute("SELECT MAX(user_id) FROM quiz_history").fetchone()
+    return row[0] or 0
+
+
+def top_scores(limit):
+    """
+    Get the highest scoring attempts (uses the score index)
+    Ties keep insertion order, matching DataFrame.nlargest
+    
+    Returns:
+        DataFrame with top scores
+    """
+    return query_df(
+        "SELECT username, category, score, percentage, date, difficulty "
+        "FROM quiz_history ORDER BY score DESC, user_id ASC LIMIT ?",
+        (int(limit),)
+    )
+
+
+# ---------- Users ----------
+
+def load_users():
+    """Load all users as a DataFrame"""
+    return query_df("SELECT username, password, created_date FROM users ORDER BY rowid")
+
+
+def _user_rows(df):
+    """
+    Users DataFrame rows as [username, password, created_date] text values
+    Missing values stay missing: no password becomes '', no date becomes NULL
+    """
+    rows = _missing_to_none(df[USER_COLUMNS])
+    for row in rows:
+        row[1] = '' if row[1] is None else row[1]
+        for i, value in enumerate(row):
+            if value is not None:
+                row[i] = str(value)
+    return rows
+
+
+def replace_users(df):
+    """Replace the users table with a DataFrame"""
+    conn = get_connection()
+    with conn:
+        conn.execute("DELETE FROM users")
+        if not df.empty:
+            _insert_or_replace(conn, 'users', USER_COLUMNS, _user_rows(df))
+
+
+def insert_user(username, password, created_date):
+    """
+    Insert a new user
+    
+    Returns:
+        True if created, False if the username already exists
+    """
+    conn = get_connection()
+    try:
+        with conn:
+            conn.execute(
+                "INSERT INTO users (username, password, created_date) VALUES (?, ?, ?)",
+                (username, password, created_date)
+            )
+        return True
+    except sqlite3.IntegrityError:
+        return False
+
+
+def validate_user(username, password):
+    """Check credentials with a primary key lookup"""
+    row = get_connection().execute(
+        "SELECT 1 FROM users WHERE username = ? AND password = ?",
+        (username, password)
+    ).fetchone()
+    return row is not None
+
+
+# ---------- Achievements ----------
+
+def load_achievement_ids(username):
+    """Get the achievement ids a user has unlocked"""
+    rows = get_connection().execute(
+        "SELECT achievement_id FROM achievements WHERE username = ? ORDER BY rowid",
+        (username,)
+    ).fetchall()
+    return [row[0] for row in rows]
+
+
+def insert_achievements(rows):
+    """
+    Insert unlocked achievements in one transaction
+    
+    Args:
+        rows: List of dicts with username, achievement_id, unlocked_date, unlocked_time
+    
+    Returns:
+        Number of rows actually inserted (already unlocked ones are skipped)
+    """
+    conn = get_connection()
+    with conn:
+        before = conn.total_changes
+        conn.executemany(
+            "INSERT OR IGNORE INTO achievements "
+            "(username, achievement_id, unlocked_date, unlocked_time) VALUES (?, ?, ?, ?)",
+            [(r['username'], r['achievement_id'], r['unlocked_date'], r['unlocked_time']) for r in rows]
+        )
+        return conn.total_changes - before
+
+
+# ---------- User settings ----------
+
+def load_settings(username):
+    """
+    Get a user's settings row
+    
+    Returns:
+        Dict of settings, or None if the user has no row yet
+    """
+    cursor = get_connection().execute(
+        f"SELECT {', '.join(SETTINGS_COLUMNS)} FROM user_settings WHERE username = ?",
+        (username,)
+    )
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    
+    settings = dict(zip(SETTINGS_COLUMNS, row))
+    settings['sound_enabled'] = bool(settings['sound_enabled'])
+    return settings
+
+
+def save_settings(settings):
+    """Insert or replace a user's settings row"""
+    values = [settings.get(c) for c in SETTINGS_COLUMNS]
+    values[SETTINGS_COLUMNS.index('sound_enabled')] = int(bool(settings.get('sound_enabled', True)))
+    conn = get_connection()
+    with conn:
+        conn.execute(
+            f"INSERT OR REPLACE INTO user_settings ({', '.join(SETTINGS_COLUMNS)}) "
+            f"VALUES ({', '.join('?' for _ in SETTINGS_COLUMNS)})",
+            values
+        )
+
+
+# ---------- Migration ----------
+
+def _read_csv_if_exists(filepath, dtype=None):
+    """Read a CSV into a DataFrame, None if missing or empty"""
+    if not os.path.exists(filepath) or os.path.getsize(filepath) == 0:
+        return None
+    df = pd.read_csv(filepath, dtype=dtype)
+    return df if not df.empty else None
+
+
+def migrate_from_csv(data_dir=None):
+    """
+    Import quiz_history.csv, users.csv, achievements.csv and user_settings.csv
+    Existing rows with the same key are replaced, so running it twice is safe;
+    replaced rows (existing ones, or duplicate keys in a CSV) are counted and reported
+    
+    Args:
+        data_dir: Directory holding the CSV files (defaults to the app data dir)
+    
+    Returns:
+        Dictionary of table -> {'imported': rows read, 'replaced': rows replaced}
+    """
+    if data_dir is None:
+        data_dir = os.path.dirname(get_db_path())
+    
+    conn = get_connection()
+    counts = {table: {'imported': 0, 'replaced': 0}
+              for table in ('quiz_history', 'users', 'achievements', 'user_settings')}
+    
+    with conn:
+        history = _read_csv_if_exists(os.path.join(data_dir, 'quiz_history.csv'))
+        if history is not None:
+            counts['quiz_history'] = {'imported': len(history), 'replaced': _insert_history_rows(conn, history)}
+        
+        # Read as text so passwords such as "1234" keep their exact characters
+        users = _read_csv_if_exists(os.path.join(data_dir, 'users.csv'), dtype=str)
+        if users is not None:
+            counts['users'] = {'imported': len(users),
+                               'replaced': _insert_or_replace(conn, 'users', USER_COLUMNS, _user_rows(users))}
+        
+        unlocked = _read_csv_if_exists(os.path.join(data_dir, 'achievements.csv'))
+        if unlocked is not None:
+            columns = ['username', 'achievement_id', 'unlocked_date', 'unlocked_time']
+            counts['achievements'] = {'imported': len(unlocked),
+                                      'replaced': _insert_or_replace(conn, 'achievements', columns,
+                                                                     _missing_to_none(unlocked[columns]))}
+        
+        settings = _read_csv_if_exists(os.path.join(data_dir, 'user_settings.csv'))
+        if settings is not None:
+            settings = settings.reindex(columns=SETTINGS_COLUMNS)
+            settings['streak_count'] = settings['streak_count'].fillna(0).astype(int)
+            settings['sound_enabled'] = settings['sound_enabled'].fillna(True).astype(bool).astype(int)
+            counts['user_settings'] = {'imported': len(settings),
+                                       'replaced': _insert_or_replace(conn, 'user_settings', SETTINGS_COLUMNS,
+                                                                      _missing_to_none(settings))}
+    
+    return counts
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == 'migrate':
+        imported = migrate_from_csv()
+        for table, count in imported.items():
+            print(f"{table}: {count['imported']} rows imported, {count['replaced']} replaced rows with the same key")
+        print(f"Database: {get_db_path()}")
+    else:
+        print("Usage: python -m utils.sqlite_store migrate")
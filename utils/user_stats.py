@@ -0,0 +1,317 @@
+"""
+User Statistics Module
+Materialized per-user aggregates (counts, sums, bests, per-category/mode/difficulty counts)
+Updated in O(1) for every recorded attempt and persisted under data/user_stats/
+
+Each user's aggregates live in their own small JSON file, so recording an
+attempt rewrites one record rather than every user's. state.json holds the
+id of the last attempt counted. Attempts are counted under the history lock,
+in id order; when state.json falls behind (another process crashed
+mid-update) only the attempts after it are applied, and the aggregates are
+rebuilt from history only when state.json is missing or ahead of the history
+(files deleted, history replaced).
+
+Run "python -m utils.user_stats rebuild" to rebuild them explicitly.
+"""
+
+import os
+import sys
+import hashlib
+from utils import file_handler, config
+
+
+# Bump when the record layout changes; older files are rebuilt from history
+STATS_FORMAT = 3
+
+STATE_FILENAME = 'state.json'
+
+
+def _new_state():
+    return {'format': STATS_FORMAT, 'last_attempt_id': -1}
+
+
+def _is_valid_state(data):
+    return isinstance(data, dict) and data.get('format') == STATS_FORMAT
+
+
+# In-memory copies of the state file and of each user's record, reloaded when a file changes
+_cache = file_handler.JsonFileCache(_new_state, _is_valid_state)
+_record_cache = file_handler.JsonFileCache(lambda: new_record(),
+                                           lambda data: isinstance(data, dict) and 'total_quizzes' in data)
+
+
+def get_user_stats_dir():
+    """Get path to the directory holding the user statistics files"""
+    data_dir = config.get_data_dir()
+    return os.path.join(data_dir, 'user_stats')
+
+
+def get_state_path():
+    """Get path to the file recording the last attempt counted"""
+    return os.path.join(get_user_stats_dir(), STATE_FILENAME)
+
+
+def get_record_path(username):
+    """
+    Get path to a user's aggregate record
+    File names are hashes of the username, so any username is a safe file name
+    """
+    digest = hashlib.sha1(username.encode('utf-8')).hexdigest()
+    return os.path.join(get_user_stats_dir(), f"{digest}.json")
+
+
+def new_record():
+    """
+    Create an empty aggregate record for a user
+    
+    Returns:
+        Dictionary of zeroed aggregates
+    """
+    return {
+        'total_quizzes': 0,
+        'sum_score': 0,
+        'sum_percentage': 0.0,
+        'best_score': 0,
+        'best_percentage': 0.0,
+        'total_correct': 0,
+        'total_questions': 0,
+        'by_category': {},
+        'by_mode': {},
+        'by_difficulty': {},
+        'sum_x': 0,
+        'sum_xx': 0,
+        'sum_xy': 0.0,
+        'last_attempt_id': 0
+    }
+
+
+def apply_attempt(record, attempt):
+    """
+    Fold one attempt into a user's aggregate record (O(1))
+    
+    Args:
+        record: Aggregate record from new_record()
+        attempt: Dictionary with quiz history columns
+    """
+    first = record['total_quizzes'] == 0
+    score = int(attempt['score'])
+    percentage = float(attempt['percentage'])
+    
+    record['total_quizzes'] += 1
+    record['sum_score'] += score
+    record['sum_percentage'] += percentage
+    record['best_score'] = score if first else max(record['best_score'], score)
+    record['best_percentage'] = percentage if first else max(record['best_percentage'], percentage)
+    record['total_correct'] += int(attempt['correct'])
+    record['total_questions'] += int(attempt['total_questions'])
+    
+    # Regression sums of percentage against attempt number (sum_y is sum_percentage)
+    x = record['total_quizzes']
+    record['sum_x'] += x
+    record['sum_xx'] += x * x
+    record['sum_xy'] += x * percentage
+    
+    for key, column in [('by_category', 'category'), ('by_mode', 'mode'), ('by_difficulty', 'difficulty')]:
+        value = attempt.get(column)
+        if isinstance(value, str) and value:
+            record[key][value] = record[key].get(value, 0) + 1
+    
+    record['last_attempt_id'] = max(record['last_attempt_id'], int(attempt.get('user_id') or 0))
+
+
+def build_from_history(df):
+    """
+    Compute aggregate records for every user from a history DataFrame
+    
+    Args:
+        df: DataFrame with quiz history
+    
+    Returns:
+        Dictionary mapping username to aggregate record
+    """
+    users = {}
+    if df is None or df.empty:
+        return users
+    
+    for attempt in df.to_dict('records'):
+        username = attempt.get('username')
+        if not isinstance(username, str):
+            continue
+        if username not in users:
+            users[username] = new_record()
+        apply_attempt(users[username], attempt)
+    
+    return users
+
+
+def rebuild_user_stats():
+    """
+    Rebuild all aggregates from quiz history and persist them
+    
+    Returns:
+        Number of users rebuilt
+    """
+    from utils import data_manager
+    
+    with data_manager.history_lock():
+        return _rebuild_locked()
+
+
+def _rebuild_locked():
+    """Rebuild every record from history (caller holds data_manager.history_lock())"""
+    from utils import data_manager
+    
+    stats_dir = get_user_stats_dir()
+    os.makedirs(stats_dir, exist_ok=True)
+    
+    last_id = data_manager.get_last_attempt_id(locked=True)
+    users = build_from_history(data_manager.load_quiz_history())
+    
+    # Records first, state last: a crash part-way leaves the state stale
+    paths = set()
+    for username, record in users.items():
+        path = get_record_path(username)
+        file_handler.save_json_atomic(path, record)
+        paths.add(path)
+    for name in os.listdir(stats_dir):
+        path = os.path.join(stats_dir, name)
+        if name.endswith('.json') and name != STATE_FILENAME and path not in paths:
+            os.remove(path)
+    
+    _record_cache.invalidate()
+    _save_state(last_id)
+    return len(users)
+
+
+def _save_state(last_id):
+    """Record the id of the last attempt counted"""
+    _cache.save(get_state_path(), {'format': STATS_FORMAT, 'last_attempt_id': last_id})
+
+
+def _load_record(username):
+    """Load a user's aggregate record (zeroed record if the user has none)"""
+    return _record_cache.load(get_record_path(username))
+
+
+def _catch_up_locked():
+    """
+    Bring the aggregates up to date with history
+    
+    Only the attempts after the last one counted are applied. A full rebuild
+    is left for a missing state or one ahead of history (history replaced).
+    Caller holds data_manager.history_lock(), so every id is fully written.
+    """
+    from utils import data_manager
+    
+    last_written = data_manager.get_last_attempt_id(locked=True)
+    last_id = _cache.load(get_state_path()).get('last_attempt_id', -1)
+    if last_id == last_written:
+        return
+    if last_id < 0 or last_id > last_written:
+        _rebuild_locked()
+        return
+    
+    os.makedirs(get_user_stats_dir(), exist_ok=True)
+    records = {}
+    for attempt in data_manager.load_attempts_after(last_id).to_dict('records'):
+        username = attempt.get('username')
+        if not isinstance(username, str):
+            continue
+        if username not in records:
+            records[username] = _load_record(username)
+        apply_attempt(records[username], attempt)
+    
+    for username, record in records.items():
+        _record_cache.save(get_record_path(username), record)
+    _save_state(last_written)
+
+
+def record_attempt(attempt):
+    """
+    Update the aggregates for a newly recorded attempt
+    Rewrites only that user's record and the small state file
+    Caller holds data_manager.history_lock() (see data_manager.add_quiz_attempt)
+    
+    Args:
+        attempt: Dictionary with quiz history columns, including its user_id
+    """
+    attempt_id = int(attempt['user_id'])
+    last_id = _cache.load(get_state_path()).get('last_attempt_id', -1)
+    
+    if last_id >= attempt_id:
+        # Already counted (e.g. by a rebuild)
+        return
+    
+    if last_id != attempt_id - 1:
+        # Earlier attempts were not counted (e.g. a process died mid-update)
+        _catch_up_locked()
+        return
+    
+    os.makedirs(get_user_stats_dir(), exist_ok=True)
+    username = attempt['username']
+    record = _load_record(username)
+    apply_attempt(record, attempt)
+    _record_cache.save(get_record_path(username), record)
+    _save_state(attempt_id)
+
+
+def get_user_stats(username):
+    """
+    Get a user's aggregate record, catching up with history first if behind
+    
+    Args:
+        username: Username
+    
+    Returns:
+        Aggregate record (zeroed record if the user has no attempts)
+    """
+    from utils import data_manager
+    
+    state = _cache.load(get_state_path())
+    if state.get('last_attempt_id') != data_manager.get_last_attempt_id():
+        # Waits for an attempt still being written rather than treating it as missing
+        with data_manager.history_lock():
+            _catch_up_locked()
+    
+    return _load_record(username)
+
+
+def get_trend_sums(record):
+    """
+    Get the regression sums of a record in the form score_calculator expects
+    
+    Args:
+        record: Aggregate record
+    
+    Returns:
+        Dictionary with n, sum_x, sum_y, sum_xx and sum_xy
+    """
+    return {
+        'n': record['total_quizzes'],
+        'sum_x': record['sum_x'],
+        'sum_y': record['sum_percentage'],
+        'sum_xx': record['sum_xx'],
+        'sum_xy': record['sum_xy']
+    }
+
+
+def most_common(counts):
+    """
+    Get the most frequent key, breaking ties alphabetically (like pandas mode)
+    
+    Args:
+        counts: Dictionary mapping value to count
+    
+    Returns:
+        Most common key, or 'None' if counts is empty
+    """
+    if not counts:
+        return 'None'
+    return min(counts, key=lambda key: (-counts[key], key))
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == 'rebuild':
+        print(f"Rebuilt statistics for {rebuild_user_stats()} users")
+    else:
+        print("Usage: python -m utils.user_stats rebuild")